@@ -0,0 +1,248 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from Benchmarks.synthetic_gifs import make_gif
+from GifParser.gif_frames_exporter import GifFramesExporter
+from GifParser.gif_parser import GifParser
+from GifParser.gif_writer import GifWriter
+from GifParser.lzw_decompressor import DEFAULT_BACKEND, Decompressor
+
+SYNTHETIC_CASES = [
+    # (название, ширина, высота, кадры, цвета)
+    ("synthetic_64x64_10f_2c", 64, 64, 10, 2),
+    ("synthetic_320x240_10f_16c", 320, 240, 10, 16),
+    ("synthetic_320x240_10f_256c", 320, 240, 10, 256),
+    ("synthetic_800x600_3f_256c", 800, 600, 3, 256),
+    ("synthetic_160x120_100f_64c", 160, 120, 100, 64),
+]
+QUICK_CASES = SYNTHETIC_CASES[:2]
+STAGES = ("parse", "lzw", "encode", "export", "render")
+DEFAULT_IMAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Test", "Images")
+
+
+def load_cases(quick=False, images_dir=DEFAULT_IMAGES_DIR):
+    """
+    Подготовка входных данных: синтетические GIF и файлы из папки с изображениями.
+    :param quick: Использовать только небольшие синтетические файлы.
+    :param images_dir: Папка с GIF-файлами или None.
+    :return: Список пар (название, содержимое файла).
+    """
+    cases = [(name, make_gif(width, height, frames, colors))
+             for name, width, height, frames, colors in (QUICK_CASES if quick else SYNTHETIC_CASES)]
+    if images_dir and os.path.isdir(images_dir):
+        for name in sorted(os.listdir(images_dir)):
+            if name.lower().endswith(".gif"):
+                with open(os.path.join(images_dir, name), 'rb') as f:
+                    cases.append((name, f.read()))
+    return cases
+
+
+def measure_time(func, repeat):
+    """
+    Лучшее время выполнения функции из нескольких запусков.
+    :param func: Функция без аргументов.
+    :param repeat: Количество запусков.
+    :return: Время в секундах.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure_peak_memory(func):
+    """
+    Пиковый объём памяти, выделенной при выполнении функции (по tracemalloc).
+    :param func: Функция без аргументов.
+    :return: Пиковый объём в байтах.
+    """
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_parse(data):
+    def run():
+        gif_parser = GifParser(data)
+        gif_parser.parse()
+        return gif_parser
+    return run
+
+
+def bench_lzw(streams):
+    def run():
+        for min_code_size, compressed, pixel_count in streams:
+            Decompressor(min_code_size, compressed, pixel_count).decode()
+    return run
+
+
+def bench_encode(gif_parser):
+    writer = GifWriter.from_parser(gif_parser)
+
+    def run():
+        writer.to_bytes()
+    return run
+
+
+def bench_export(gif_parser, mode, output_dir):
+    exporter = GifFramesExporter(gif_parser, mode, output_dir)
+
+    def run():
+        exporter.compositor = None
+        for frame_number, frame in enumerate(gif_parser.frames, start=1):
+            exporter.export_frame(frame, frame_number)
+    return run
+
+
+def bench_render(gif_parser, root, use_compositor=False):
+    from GifParser.gif_viewer import GifViewer
+    viewer = GifViewer(root, gif_parser, use_compositor)
+
+    def run():
+        viewer.compositor.reset()
+        for idx, frame in enumerate(gif_parser.frames):
+            viewer.current_frame_idx = idx
+            if use_compositor:
+                viewer._apply_composited_frame(frame)
+            else:
+                viewer._process_disposal()
+                viewer._apply_frame(frame)
+                viewer._update_photo()
+    return run
+
+
+def create_tk_root():
+    """
+    Создание скрытого окна tkinter для замера отрисовки.
+    :return: Окно или None, если дисплей недоступен.
+    """
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        return root
+    except Exception as e:
+        logging.warning(f"Замер отрисовки пропущен: {e}")
+        return None
+
+
+def make_result(case, stage, seconds, peak_memory, data_bytes, frames, pixels):
+    return {
+        "case": case,
+        "stage": stage,
+        "seconds": seconds,
+        "peak_memory_bytes": peak_memory,
+        "bytes": data_bytes,
+        "frames": frames,
+        "pixels": pixels,
+        "mb_per_s": data_bytes / seconds / 1e6 if seconds else None,
+        "frames_per_s": frames / seconds if seconds else None,
+        "megapixels_per_s": pixels / seconds / 1e6 if seconds else None,
+    }
+
+
+def run_benchmarks(cases, stages=STAGES, repeat=3):
+    """
+    Запуск замеров.
+    :param cases: Список пар (название, содержимое GIF-файла).
+    :param stages: Этапы для замера: parse, lzw, encode, export, render.
+    :param repeat: Количество повторов (берётся лучшее время).
+    :return: Список результатов.
+    """
+    results = []
+    root = create_tk_root() if "render" in stages else None
+    with tempfile.TemporaryDirectory() as output_dir:
+        for name, data in cases:
+            gif_parser = bench_parse(data)()
+            frames = len(gif_parser.frames)
+            pixels = sum(f.image_descriptor.width * f.image_descriptor.height for f in gif_parser.frames)
+            screen = gif_parser.logical_screen_descriptor
+            jobs = []
+
+            if "parse" in stages:
+                jobs.append(("parse", bench_parse(data), len(data), pixels))
+            if "lzw" in stages:
+                streams = GifParser.extract_lzw_streams(data)
+                compressed_size = sum(len(stream[1]) for stream in streams)
+                jobs.append(("lzw", bench_lzw(streams), compressed_size, pixels))
+            if "encode" in stages:
+                jobs.append(("encode", bench_encode(gif_parser), pixels, pixels))
+            if "export" in stages:
+                for mode in GifFramesExporter.MODES:
+                    run = bench_export(gif_parser, mode, os.path.join(output_dir, name, mode))
+                    export_pixels = screen.width * screen.height * frames if mode == "composited" else pixels
+                    jobs.append((f"export_{mode}", run, export_pixels * 4, export_pixels))
+            if "render" in stages and root is not None:
+                screen_pixels = screen.width * screen.height * frames
+                jobs.append(("render", bench_render(gif_parser, root), screen_pixels * 3, screen_pixels))
+                jobs.append(("render_ppm", bench_render(gif_parser, root, use_compositor=True),
+                             screen_pixels * 3, screen_pixels))
+
+            for stage, run, data_bytes, stage_pixels in jobs:
+                seconds = measure_time(run, repeat)
+                peak_memory = measure_peak_memory(run)
+                result = make_result(name, stage, seconds, peak_memory, data_bytes, frames, stage_pixels)
+                results.append(result)
+                logging.info(format_result(result))
+
+    if root is not None:
+        root.destroy()
+    return results
+
+
+def format_result(result):
+    return (f"{result['case']:<32} {result['stage']:<18} {result['seconds'] * 1000:10.2f} мс "
+            f"{result['mb_per_s'] or 0:9.2f} МБ/с {result['frames_per_s'] or 0:10.1f} кадр/с "
+            f"{result['peak_memory_bytes'] / 2 ** 20:8.2f} МБ пик")
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="Замеры производительности GIF-парсера")
+    parser.add_argument("--stages", default=",".join(STAGES),
+                        help=f"Этапы через запятую (по умолчанию {','.join(STAGES)})")
+    parser.add_argument("--repeat", "-r", type=int, default=3, help="Количество повторов каждого замера")
+    parser.add_argument("--quick", "-q", action="store_true", help="Только небольшие синтетические файлы")
+    parser.add_argument("--images-dir", default=DEFAULT_IMAGES_DIR,
+                        help="Папка с GIF-файлами для замеров (пустая строка - не использовать)")
+    parser.add_argument("--json", "-j", help="Путь к JSON-файлу с результатами ('-' - вывод в stdout)")
+    args = parser.parse_args(argv)
+
+    stages = [stage for stage in args.stages.split(",") if stage]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"Неизвестные этапы: {', '.join(sorted(unknown))}")
+
+    images_dir = None if args.quick else args.images_dir
+    results = run_benchmarks(load_cases(args.quick, images_dir), stages, args.repeat)
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "lzw_backend": DEFAULT_BACKEND,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "repeat": args.repeat,
+        "results": results,
+    }
+
+    if args.json == "-":
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+    elif args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
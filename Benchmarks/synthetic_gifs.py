@@ -0,0 +1,62 @@
+import random
+import struct
+
+from GifParser.gif_writer import GifWriter
+from GifParser.lzw_compressor import LZWCompressor
+
+
+def make_frame_indices(width, height, colors, frame_number, rng):
+    """
+    Индексы кадра: сдвигающиеся полосы с долей случайного шума,
+    чтобы степень сжатия была похожа на реальные анимации.
+    :param width: Ширина кадра.
+    :param height: Высота кадра.
+    :param colors: Количество цветов.
+    :param frame_number: Номер кадра (сдвиг полос).
+    :param rng: Генератор случайных чисел.
+    :return: Индексы цветов кадра.
+    """
+    indices = bytearray(width * height)
+    for y in range(height):
+        base = (y // 4 + frame_number) % colors
+        row = bytes((base + x // 8) % colors for x in range(width))
+        indices[y * width:(y + 1) * width] = row
+    for _ in range(width * height // 16):
+        indices[rng.randrange(width * height)] = rng.randrange(colors)
+    return indices
+
+
+def make_gif(width, height, frame_count=1, colors=256, seed=0, interlaced=False):
+    """
+    Создание синтетического GIF-файла.
+    :param width: Ширина.
+    :param height: Высота.
+    :param frame_count: Количество кадров.
+    :param colors: Количество цветов в глобальной таблице (степень двойки от 2 до 256).
+    :param seed: Начальное значение генератора случайных чисел.
+    :param interlaced: Записать изображения с чересстрочной развёрткой.
+    :return: Содержимое GIF-файла.
+    """
+    rng = random.Random(seed)
+    table_bits = max(1, (colors - 1).bit_length())
+    min_code_size = max(2, table_bits)
+
+    data = bytearray(b'GIF89a')
+    data += struct.pack('<HHBBB', width, height, 0x80 | (table_bits - 1), 0, 0)
+    for i in range(1 << table_bits):
+        data += bytes((i * 37 % 256, i * 91 % 256, i * 173 % 256))
+    if frame_count > 1:
+        data += b'\x21\xFF\x0BNETSCAPE2.0\x03\x01\x00\x00\x00'
+
+    for frame_number in range(frame_count):
+        disposal = 2 if frame_number % 2 else 1
+        data += b'\x21\xF9\x04' + struct.pack('<BHB', disposal << 2, 4, 0) + b'\x00'
+        data += b'\x2C' + struct.pack('<HHHHB', 0, 0, width, height, 0x40 if interlaced else 0)
+        indices = make_frame_indices(width, height, colors, frame_number, rng)
+        if interlaced:
+            indices = GifWriter.interlace(indices, width, height)
+        data.append(min_code_size)
+        data += GifWriter.get_sub_blocks_data(LZWCompressor(min_code_size, indices).compress())
+
+    data.append(0x3B)
+    return bytes(data)
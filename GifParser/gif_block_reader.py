@@ -0,0 +1,85 @@
+import mmap
+import os
+
+
+class GifBlockReader:
+    def __init__(self, buffer, position=0):
+        self._mmap = buffer if isinstance(buffer, mmap.mmap) else None
+        self.buffer = memoryview(buffer).cast('B')
+        self.size = len(self.buffer)
+        self.position = position
+
+    @classmethod
+    def from_file(cls, filename):
+        """
+        Открытие файла через mmap без копирования его содержимого в память.
+        :param filename: Путь к файлу.
+        :return: Читатель блоков.
+        """
+        with open(filename, 'rb') as f:
+            try:
+                return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            except (ValueError, OSError):
+                return cls(f.read())
+
+    def close(self):
+        """
+        Освобождение буфера (и mmap, если файл был отображён в память).
+        """
+        self.buffer.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self.position
+        elif whence == os.SEEK_END:
+            offset += self.size
+        self.position = max(0, min(offset, self.size))
+        return self.position
+
+    def read(self, size=-1):
+        """
+        Чтение байтов с текущей позиции.
+        :param size: Количество байтов (-1 - до конца буфера).
+        :return: Прочитанные байты.
+        """
+        start = self.position
+        end = self.size if size < 0 else min(start + size, self.size)
+        self.position = end
+        return bytes(self.buffer[start:end])
+
+    def read_sub_blocks(self):
+        """
+        Сборка блока данных из подблоков: размеры читаются по смещению,
+        содержимое подблоков склеивается одним копированием.
+        :return: Блок данных о составляющей GIF файла.
+        """
+        buffer, size, position = self.buffer, self.size, self.position
+        chunks = []
+        while position < size:
+            block_size = buffer[position]
+            position += 1
+            if block_size == 0:
+                break
+            chunks.append(buffer[position:position + block_size])
+            position += block_size
+        self.position = min(position, size)
+        return b''.join(chunks)
+
+    def skip_sub_blocks(self):
+        """
+        Пропуск блока данных: читаются только размеры подблоков.
+        """
+        buffer, size, position = self.buffer, self.size, self.position
+        while position < size:
+            block_size = buffer[position]
+            position += 1
+            if block_size == 0:
+                break
+            position += block_size
+        self.position = min(position, size)
@@ -0,0 +1,268 @@
+from GifParser.gif_profiler import profile_count, profile_stage
+
+
+class GifCompositor:
+    def __init__(self, logical_screen_descriptor, global_color_table=None):
+        self.width = logical_screen_descriptor.width
+        self.height = logical_screen_descriptor.height
+        self.global_color_table = global_color_table
+        self.canvas = bytearray(self.width * self.height * 4)
+        self.frame_count = 0
+        self._pending_disposal = None
+        self._saved_region = None
+        self._rgba_tables = {}
+        self.dirty_region = (0, 0, self.width, self.height)
+        self._full_redraw = True
+
+    def reset(self):
+        """
+        Очистка холста и возврат к состоянию до первого кадра.
+        """
+        self.canvas = bytearray(self.width * self.height * 4)
+        self.frame_count = 0
+        self._pending_disposal = None
+        self._saved_region = None
+        self._full_redraw = True
+
+    def invalidate(self):
+        """
+        Отметка всего холста изменённым при следующем наложении кадра (например, после
+        того как на холст были наложены кадры, которые не отрисовывались).
+        """
+        self._full_redraw = True
+
+    def save_state(self):
+        """
+        Снимок состояния: холст, отложенный метод обработки последнего кадра и сохранённая для него область.
+        :return: Состояние для restore_state.
+        """
+        saved_region = list(self._saved_region) if self._saved_region is not None else None
+        return bytes(self.canvas), self._pending_disposal, saved_region, self.frame_count
+
+    def restore_state(self, state):
+        """
+        Возврат к состоянию из снимка save_state.
+        :param state: Состояние.
+        """
+        canvas, self._pending_disposal, saved_region, self.frame_count = state
+        self.canvas = bytearray(canvas)
+        self._saved_region = list(saved_region) if saved_region is not None else None
+        self._full_redraw = True
+
+    def iter_frames(self, frames):
+        """
+        Последовательное наложение кадров.
+        :param frames: Кадры анимации (список или генератор).
+        :return: Генератор полностью собранных кадров размером с логический экран в формате RGBA.
+        """
+        for frame in frames:
+            yield bytes(self.apply_frame(frame))
+
+    def apply_frame(self, frame):
+        """
+        Применение метода обработки предыдущего кадра и наложение нового кадра на холст.
+        :param frame: Кадр анимации.
+        :return: Холст (bytearray RGBA размером с логический экран). Изменяется следующими вызовами.
+                 Изменённая область холста сохраняется в self.dirty_region.
+        """
+        with profile_stage("composite"):
+            disposed_region = self._dispose_previous()
+
+            region = self.get_frame_region(frame.image_descriptor)
+            gce = frame.graphic_control_extension
+            disposal = gce.disposal_method if gce else 0
+            if disposal == 3:
+                self._saved_region = self._copy_region(region)
+            self._pending_disposal = (disposal, region)
+
+            self._draw_frame(frame, region)
+            self.frame_count += 1
+        profile_count("frames_composited")
+
+        if self._full_redraw:
+            self.dirty_region = (0, 0, self.width, self.height)
+            self._full_redraw = False
+        else:
+            self.dirty_region = self.get_union_region(region, disposed_region)
+        return self.canvas
+
+    @staticmethod
+    def get_union_region(region, other):
+        """
+        Наименьшая область, содержащая обе области.
+        :param region: Координаты (x0, y0, x1, y1).
+        :param other: Координаты (x0, y0, x1, y1) или None.
+        :return: Координаты (x0, y0, x1, y1).
+        """
+        if other is None or other[2] <= other[0] or other[3] <= other[1]:
+            return region
+        if region[2] <= region[0] or region[3] <= region[1]:
+            return other
+        return (min(region[0], other[0]), min(region[1], other[1]),
+                max(region[2], other[2]), max(region[3], other[3]))
+
+    def get_frame_chain(self, frame_index, frame_number):
+        """
+        Минимальная последовательность кадров, которую нужно наложить на чистый холст,
+        чтобы получить кадр frame_number. Кадры с методом обработки 3 не меняют холст для
+        следующих кадров и пропускаются. Цепочка начинается после кадра с методом 2,
+        закрывающего весь экран, или с непрозрачного кадра на весь экран с методом 0 или 1.
+        :param frame_index: Индекс кадров (список GifFrameInfo).
+        :param frame_number: Номер кадра (начиная с 1).
+        :return: Номера кадров по возрастанию, последний - frame_number.
+        """
+        chain = [frame_number]
+        for frame_info in reversed(frame_index[:frame_number - 1]):
+            disposal = frame_info.disposal_method
+            if disposal == 3:
+                continue
+            covers_screen = (frame_info.left == 0 and frame_info.top == 0 and
+                             frame_info.width >= self.width and frame_info.height >= self.height)
+            if disposal == 2 and covers_screen:
+                break
+            chain.append(frame_info.number)
+            if disposal != 2 and covers_screen and frame_info.transparent_color_index is None:
+                break
+        return chain[::-1]
+
+    def get_frame_region(self, descriptor):
+        """
+        Область кадра, обрезанная по границам логического экрана.
+        :param descriptor: Дескриптор изображения.
+        :return: Координаты (x0, y0, x1, y1).
+        """
+        x0 = min(descriptor.left, self.width)
+        y0 = min(descriptor.top, self.height)
+        x1 = min(descriptor.left + descriptor.width, self.width)
+        y1 = min(descriptor.top + descriptor.height, self.height)
+        return x0, y0, x1, y1
+
+    def _dispose_previous(self):
+        """
+        Применение метода обработки предыдущего кадра: 2 - очистка области до прозрачного фона,
+        3 - восстановление области, сохранённой перед наложением кадра. 0 и 1 оставляют холст без изменений.
+        :return: Изменённая область холста или None.
+        """
+        if self._pending_disposal is None:
+            return None
+        disposal, region = self._pending_disposal
+        changed_region = None
+        if disposal == 2:
+            x0, y0, x1, y1 = region
+            row_size = (x1 - x0) * 4
+            blank = bytes(row_size)
+            for y in range(y0, y1):
+                start = (y * self.width + x0) * 4
+                self.canvas[start:start + row_size] = blank
+            changed_region = region
+        elif disposal == 3 and self._saved_region is not None:
+            self._paste_region(region, self._saved_region)
+            self._saved_region = None
+            changed_region = region
+        self._pending_disposal = None
+        return changed_region
+
+    def _copy_region(self, region):
+        x0, y0, x1, y1 = region
+        row_size = (x1 - x0) * 4
+        rows = []
+        for y in range(y0, y1):
+            start = (y * self.width + x0) * 4
+            rows.append(self.canvas[start:start + row_size])
+        return rows
+
+    def _paste_region(self, region, rows):
+        x0, y0, x1, y1 = region
+        row_size = (x1 - x0) * 4
+        for y, row in zip(range(y0, y1), rows):
+            start = (y * self.width + x0) * 4
+            self.canvas[start:start + row_size] = row
+
+    def _draw_frame(self, frame, region):
+        """
+        Наложение пикселей кадра на холст построчным копированием срезов.
+        Прозрачные пиксели пропускаются с помощью битовой маски на всю строку.
+        :param frame: Кадр анимации.
+        :param region: Область кадра на холсте.
+        """
+        x0, y0, x1, y1 = region
+        if x1 <= x0 or y1 <= y0:
+            return
+
+        descriptor = frame.image_descriptor
+        color_table = frame.local_color_table or self.global_color_table
+        gce = frame.graphic_control_extension
+        transparent_index = gce.transparent_color_index if gce and gce.transparency_flag else None
+
+        frame_width = descriptor.width
+        rgba_table = self.get_cached_rgba_table(color_table, transparent_index)
+        rgba = self.indices_to_rgba(frame.image_data, frame_width * descriptor.height, rgba_table)
+        mask = None
+        if transparent_index is not None:
+            alpha = rgba[3::4]
+            mask = bytearray(len(rgba))
+            for channel in range(4):
+                mask[channel::4] = alpha
+
+        canvas = self.canvas
+        row_size = (x1 - x0) * 4
+        for y in range(y0, y1):
+            src = ((y - descriptor.top) * frame_width + (x0 - descriptor.left)) * 4
+            dst = (y * self.width + x0) * 4
+            if mask is None:
+                canvas[dst:dst + row_size] = rgba[src:src + row_size]
+                continue
+            row_mask = int.from_bytes(mask[src:src + row_size], 'little')
+            row_src = int.from_bytes(rgba[src:src + row_size], 'little')
+            row_dst = int.from_bytes(canvas[dst:dst + row_size], 'little')
+            row = (row_dst & ~row_mask) | (row_src & row_mask)
+            canvas[dst:dst + row_size] = row.to_bytes(row_size, 'little')
+
+    def get_cached_rgba_table(self, color_table, transparent_index=None):
+        """
+        Таблицы перекодировки RGBA, построенные один раз для каждой таблицы цветов.
+        :param color_table: Таблица цветов.
+        :param transparent_index: Индекс прозрачного цвета или None.
+        :return: Таблицы перекодировки из get_rgba_table.
+        """
+        key = (id(color_table), transparent_index)
+        cached = self._rgba_tables.get(key)
+        if cached is None or cached[0] is not color_table:
+            cached = (color_table, self.get_rgba_table(color_table, transparent_index))
+            self._rgba_tables[key] = cached
+        return cached[1]
+
+    @staticmethod
+    def get_rgba_table(color_table, transparent_index=None):
+        """
+        Построение таблиц перекодировки индекса цвета в каждый из каналов RGBA.
+        :param color_table: Таблица цветов (если None, все цвета чёрные).
+        :param transparent_index: Индекс прозрачного цвета или None.
+        :return: Четыре таблицы по 256 байт (R, G, B, A) для bytes.translate.
+        """
+        red, green, blue = bytearray(256), bytearray(256), bytearray(256)
+        alpha = bytearray(b'\xff' * 256)
+        colors = color_table.colors[:256] if color_table else []
+        for i, (r, g, b) in enumerate(colors):
+            red[i], green[i], blue[i] = r, g, b
+        if transparent_index is not None:
+            alpha[transparent_index] = 0
+        return bytes(red), bytes(green), bytes(blue), bytes(alpha)
+
+    @staticmethod
+    def indices_to_rgba(indices, pixel_count, rgba_table):
+        """
+        Преобразование всех индексов кадра в RGBA за четыре прохода bytes.translate.
+        :param indices: Индексы цветов.
+        :param pixel_count: Количество пикселей (лишние индексы отбрасываются, недостающие - нулевые).
+        :param rgba_table: Таблицы перекодировки из get_rgba_table.
+        :return: Пиксели RGBA подряд в виде bytearray.
+        """
+        indices = bytes(indices[:pixel_count])
+        if len(indices) < pixel_count:
+            indices += bytes(pixel_count - len(indices))
+
+        rgba = bytearray(pixel_count * 4)
+        for channel, table in enumerate(rgba_table):
+            rgba[channel::4] = indices.translate(table)
+        return rgba
@@ -0,0 +1,194 @@
+from GifParser.gif_block_reader import GifBlockReader
+from GifParser.gif_parser import GifParser
+from GifParser.lzw_decompressor import LZWStreamDecoder
+from GifStructs.gif_frame import GifFrame
+
+HEADER = "header"
+SCREEN = "screen"
+GLOBAL_COLOR_TABLE = "global_color_table"
+BLOCK = "block"
+EXTENSION_LABEL = "extension_label"
+EXTENSION_DATA = "extension_data"
+SKIP_DATA = "skip_data"
+IMAGE_DESCRIPTOR = "image_descriptor"
+LOCAL_COLOR_TABLE = "local_color_table"
+LZW_MIN_CODE_SIZE = "lzw_min_code_size"
+IMAGE_DATA = "image_data"
+TRAILER = "trailer"
+ERROR = "error"
+
+
+class GifFeedParser:
+    def __init__(self):
+        self.state = HEADER
+        self.header = None
+        self.logical_screen_descriptor = None
+        self.global_color_table = None
+        self.frame_index = []
+        self.position = 0
+        self._buffer = bytearray()
+        self._extensions = (None, None, None, None)
+        self._extension_data = bytearray()
+        self._sub_block_left = 0
+        self._block_offset = 0
+        self._image_descriptor = None
+        self._local_color_table = None
+        self._data_offset = 0
+        self._decoder = None
+
+    @property
+    def complete(self):
+        return self.state == TRAILER
+
+    def feed(self, chunk):
+        """
+        Разбор очередной части файла. Части могут разбивать блоки в любом месте: незавершённый
+        блок запоминается в состоянии парсера, а сжатые данные изображения сразу передаются
+        в декодер LZW, который продолжает декодирование со следующей частью. В памяти хранятся
+        только незавершённые заголовки блоков и декодированные индексы текущего кадра.
+        :param chunk: Очередные байты файла.
+        :return: Список блоков, завершённых этой частью, в порядке файла: заголовок, дескриптор экрана,
+                 глобальная таблица цветов (если есть), расширения и кадры (GifFrame).
+        """
+        self._buffer += chunk
+        blocks = []
+        pos = 0
+        buffer = self._buffer
+        while self.state not in (TRAILER, ERROR):
+            consumed = self._step(buffer, pos, blocks)
+            if consumed is None:
+                break
+            pos += consumed
+            self.position += consumed
+        del buffer[:pos]
+        return blocks
+
+    def _step(self, buffer, pos, blocks):
+        """
+        Один переход конечного автомата.
+        :param buffer: Непрочитанные байты.
+        :param pos: Позиция в буфере.
+        :param blocks: Список завершённых блоков (дополняется).
+        :return: Количество прочитанных байтов или None, если для перехода не хватает данных.
+        """
+        available = len(buffer) - pos
+        state = self.state
+
+        if state in (EXTENSION_DATA, SKIP_DATA, IMAGE_DATA):
+            return self._read_sub_block(buffer, pos, available, blocks)
+
+        size = self._get_field_size()
+        if available < size:
+            return None
+        data = bytes(buffer[pos:pos + size])
+
+        if state == HEADER:
+            self.header = GifParser.parse_header(data)
+            if self.header is None:
+                self.state = ERROR
+                return size
+            blocks.append(self.header)
+            self.state = SCREEN
+        elif state == SCREEN:
+            self.logical_screen_descriptor = GifParser.parse_logical_screen_descriptor(data)
+            blocks.append(self.logical_screen_descriptor)
+            self.state = GLOBAL_COLOR_TABLE
+        elif state == GLOBAL_COLOR_TABLE:
+            self.global_color_table = GifParser.parse_global_color_table(self.logical_screen_descriptor, data)
+            if self.global_color_table is not None:
+                blocks.append(self.global_color_table)
+            self._block_offset = self.position + size
+            self.state = BLOCK
+        elif state == BLOCK:
+            block_id = data[0]
+            if block_id == 0x3B:
+                self.state = TRAILER
+            elif block_id == 0x21:
+                self.state = EXTENSION_LABEL
+            elif block_id == 0x2C:
+                self.state = IMAGE_DESCRIPTOR
+            else:
+                self.state = SKIP_DATA
+        elif state == EXTENSION_LABEL:
+            self._extension_data = bytearray(data)
+            self.state = EXTENSION_DATA
+        elif state == IMAGE_DESCRIPTOR:
+            self._image_descriptor = GifParser.parse_image_descriptor(GifBlockReader(data))
+            self.state = LOCAL_COLOR_TABLE
+        elif state == LOCAL_COLOR_TABLE:
+            self._local_color_table = GifParser.parse_local_color_table(GifBlockReader(data), self._image_descriptor)
+            self._data_offset = self.position + size
+            self.state = LZW_MIN_CODE_SIZE
+        elif state == LZW_MIN_CODE_SIZE:
+            descriptor = self._image_descriptor
+            self._decoder = LZWStreamDecoder(data[0], descriptor.width * descriptor.height)
+            self.state = IMAGE_DATA
+        return size
+
+    def _get_field_size(self):
+        """
+        Размер следующего блока фиксированного размера для текущего состояния.
+        """
+        if self.state == HEADER:
+            return 6
+        if self.state == SCREEN:
+            return 7
+        if self.state == GLOBAL_COLOR_TABLE:
+            return GifParser.get_global_color_table_length(self.logical_screen_descriptor)
+        if self.state == IMAGE_DESCRIPTOR:
+            return 9
+        if self.state == LOCAL_COLOR_TABLE:
+            return self._image_descriptor.local_color_table_size * 3
+        return 1
+
+    def _read_sub_block(self, buffer, pos, available, blocks):
+        """
+        Чтение подблоков по частям: размер подблока, затем его данные (возможно, в несколько приёмов).
+        :return: Количество прочитанных байтов или None, если данных нет.
+        """
+        if available == 0:
+            return None
+        state = self.state
+        if self._sub_block_left == 0:
+            size = buffer[pos]
+            if state == EXTENSION_DATA:
+                self._extension_data.append(size)
+            if size == 0:
+                self._end_sub_blocks(blocks)
+            self._sub_block_left = size
+            return 1
+
+        size = min(self._sub_block_left, available)
+        if state == EXTENSION_DATA:
+            self._extension_data += buffer[pos:pos + size]
+        elif state == IMAGE_DATA:
+            self._decoder.feed(buffer[pos:pos + size])
+        self._sub_block_left -= size
+        return size
+
+    def _end_sub_blocks(self, blocks):
+        """
+        Завершение блока подблоков: разбор расширения или сборка кадра.
+        """
+        if self.state == EXTENSION_DATA:
+            self._extensions = GifParser.parse_extension(GifBlockReader(bytes(self._extension_data)))
+            self._extension_data = bytearray()
+            blocks.extend(extension for extension in self._extensions if extension is not None)
+        elif self.state == IMAGE_DATA:
+            blocks.append(self._make_frame())
+            self._block_offset = self.position + 1
+        self.state = BLOCK
+
+    def _make_frame(self):
+        descriptor = self._image_descriptor
+        indices = self._decoder.finish()
+        if descriptor.interlace_flag:
+            indices = GifParser.deinterlace(indices, descriptor.width, descriptor.height)
+        graphic_control_ext, plain_text_ext, application_ext, comment_ext = self._extensions
+        frame = GifFrame(descriptor, self._local_color_table, graphic_control_ext, plain_text_ext,
+                         application_ext, comment_ext, indices,
+                         self._data_offset, self.position + 1 - self._data_offset)
+        self.frame_index.append(GifParser.get_frame_info(len(self.frame_index) + 1, self._block_offset, frame))
+        self._extensions = (None, None, None, None)
+        self._decoder = None
+        return frame
@@ -0,0 +1,85 @@
+from collections import OrderedDict
+
+
+class GifFrameCache:
+    POLICIES = ("keep", "lru")
+
+    def __init__(self, max_memory=64 * 1024 * 1024, policy="keep"):
+        """
+        :param max_memory: Максимальный суммарный размер кадров в кэше в байтах.
+        :param policy: Что делать с новым кадром, если кэш заполнен: keep (по умолчанию) - не сохранять,
+                       оставив уже сохранённые кадры; lru - удалять давно использованные кадры.
+                       При циклическом воспроизведении анимации, которая не помещается в кэш целиком,
+                       lru удаляет каждый кадр перед его повторным показом и не даёт попаданий,
+                       а keep сохраняет постоянные попадания для первых кадров.
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Неизвестная политика кэша: {policy}")
+        self.max_memory = max_memory
+        self.policy = policy
+        self.memory = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._frames = OrderedDict()
+
+    def get(self, key):
+        """
+        Получение кадра из кэша.
+        :param key: Ключ кадра (например, индекс кадра).
+        :return: Кадр или None, если его нет в кэше.
+        """
+        entry = self._frames.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._frames.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, frame, size):
+        """
+        Сохранение кадра. Если кадр не помещается в max_memory, в режиме keep он не сохраняется,
+        а в режиме lru удаляются давно использованные кадры. Кадр больше max_memory не сохраняется.
+        :param key: Ключ кадра.
+        :param frame: Кадр (например, PhotoImage или байты изображения).
+        :param size: Размер кадра в байтах.
+        """
+        self.remove(key)
+        if not self.can_store(size):
+            return
+        self._frames[key] = (frame, size)
+        self.memory += size
+        while self.memory > self.max_memory:
+            _, (_, evicted_size) = self._frames.popitem(last=False)
+            self.memory -= evicted_size
+            self.evictions += 1
+
+    def can_store(self, size):
+        """
+        Проверка, будет ли сохранён новый кадр такого размера (с учётом политики), - чтобы
+        не готовить кадр для кэша впустую.
+        :param size: Размер кадра в байтах.
+        :return: True, если put сохранит кадр.
+        """
+        if size > self.max_memory:
+            return False
+        return self.policy != "keep" or self.memory + size <= self.max_memory
+
+    def remove(self, key):
+        entry = self._frames.pop(key, None)
+        if entry is not None:
+            self.memory -= entry[1]
+
+    def clear(self):
+        """
+        Удаление всех кадров.
+        """
+        self._frames.clear()
+        self.memory = 0
+
+    def __contains__(self, key):
+        return key in self._frames
+
+    def __len__(self):
+        return len(self._frames)
@@ -2,12 +2,31 @@ import os
 import logging
 import zlib
 import struct
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 
+from GifParser.gif_compositor import GifCompositor
+from GifParser.gif_profiler import profile_count, profile_stage
+from GifParser.gif_seek_index import GifSeekIndex
+
 class GifFramesExporter:
-    def __init__(self, gif_parser):
+    MODES = ("rgba", "palette", "composited")
+    EXECUTORS = {"process": ProcessPoolExecutor, "thread": ThreadPoolExecutor}
+
+    def __init__(self, gif_parser, mode="rgba", output_dir=None):
+        if mode not in self.MODES:
+            raise ValueError(f"Неизвестный режим экспорта: {mode}")
         self.gif_parser = gif_parser
-        self.output_dir = self.create_output_directory()
+        self.mode = mode
+        if output_dir is None:
+            self.output_dir = self.create_output_directory()
+        else:
+            os.makedirs(output_dir, exist_ok=True)
+            self.output_dir = output_dir
+        self.compositor = None
+        self._composited_frame_number = 0
+        self.seek_index = None
 
     @staticmethod
     def create_output_directory():
@@ -21,51 +40,167 @@ class GifFramesExporter:
         os.makedirs(path)
         return path
 
-    def export_all_frames(self):
+    def export_all_frames(self, frames=None, workers=1, executor="process"):
         """
         Экспорт всех кадров в PNG-файлы.
+        :param frames: Кадры для экспорта (список или генератор, например GifParser.iter_frames()).
+                       По умолчанию - все разобранные кадры парсера.
+        :param workers: Количество параллельных обработчиков (1 - последовательный экспорт).
+        :param executor: Тип пула обработчиков: "process" или "thread".
         """
-        for idx, frame in enumerate(self.gif_parser.frames, start=1):
-            self.export_frame(frame, idx)
+        if frames is None:
+            frames = self.gif_parser.frames
+        numbered_frames = enumerate(frames, start=1)
+        if workers > 1:
+            self.export_frames_parallel(numbered_frames, workers, executor)
+        else:
+            for idx, frame in numbered_frames:
+                self.export_frame(frame, idx)
         logging.info(f"Кадры экспортированы в {self.output_dir}")
 
-    def export_selected_frames(self, frame_numbers):
+    def export_selected_frames(self, frame_numbers, workers=1, executor="process"):
         """
         Экспорт выбранных кадров в PNG-файлы.
         :param frame_numbers: Список номеров кадров.
+        :param workers: Количество параллельных обработчиков (1 - последовательный экспорт).
+        :param executor: Тип пула обработчиков: "process" или "thread".
         """
+        numbered_frames = []
         for frame_number in frame_numbers:
-            if 1 <= frame_number <= len(self.gif_parser.frames):
-                frame = self.gif_parser.frames[frame_number - 1]
-                self.export_frame(frame, frame_number)
+            frame = self.gif_parser.get_frame(frame_number)
+            if frame is not None:
+                numbered_frames.append((frame_number, frame))
             else:
                 logging.warning(f"Кадр {frame_number} не существует и будет пропущен.")
+
+        if workers > 1:
+            self.export_frames_parallel(numbered_frames, workers, executor)
+        else:
+            for frame_number, frame in numbered_frames:
+                self.export_frame(frame, frame_number)
         logging.info(f"Кадры экспортированы в {self.output_dir}")
 
+    def export_frames_parallel(self, numbered_frames, workers, executor="process"):
+        """
+        Параллельный экспорт кадров: индексы декодируются в текущем процессе,
+        преобразование в PNG и сжатие выполняются в пуле обработчиков.
+        Имена файлов определяются номерами кадров, поэтому результат совпадает с последовательным экспортом.
+        :param numbered_frames: Пары (номер кадра, кадр).
+        :param workers: Количество обработчиков.
+        :param executor: Тип пула обработчиков: "process" или "thread".
+        """
+        if executor not in self.EXECUTORS:
+            raise ValueError(f"Неизвестный тип пула обработчиков: {executor}")
+
+        with self.EXECUTORS[executor](max_workers=workers) as pool:
+            pending = deque()
+            for frame_number, frame in numbered_frames:
+                args = self.get_frame_export_args(frame, frame_number)
+                pending.append(pool.submit(self.write_png_file, *args))
+                if len(pending) >= workers * 2:
+                    pending.popleft().result()
+            for future in pending:
+                future.result()
+
     def export_frame(self, frame, frame_number):
         """
         Экспорт кадра в PNG-файл.
         :param frame: Кадр анимации.
         :param frame_number: Номер кадра.
         """
+        filename, mode, indices, width, height, color_table, transparent_index = \
+            self.get_frame_export_args(frame, frame_number)
+        rgba_table = None
+        if mode == "rgba":
+            rgba_table = self.get_compositor().get_cached_rgba_table(color_table, transparent_index)
+        self.write_png_file(filename, mode, indices, width, height, color_table, transparent_index, rgba_table)
+
+    def get_frame_export_args(self, frame, frame_number):
+        """
+        Подготовка данных кадра для записи в PNG-файл.
+        :param frame: Кадр анимации.
+        :param frame_number: Номер кадра.
+        :return: Аргументы для write_png_file.
+        """
+        filename = os.path.join(self.output_dir, f"{frame_number}.png")
+        if self.mode == "composited":
+            canvas = self.get_composited_frame(frame, frame_number)
+            return filename, self.mode, canvas, self.compositor.width, self.compositor.height, None, None
+
         width = frame.image_descriptor.width
         height = frame.image_descriptor.height
         indices = frame.image_data
         color_table = frame.local_color_table if frame.local_color_table else self.gif_parser.global_color_table
-        transparency = None
+        transparent_index = None
         if frame.graphic_control_extension and frame.graphic_control_extension.transparency_flag:
-            transparency_index = frame.graphic_control_extension.transparent_color_index
-            transparency = color_table.colors[transparency_index]
+            transparent_index = frame.graphic_control_extension.transparent_color_index
 
-        pixels = self.transform_pixels(frame, width, height, indices, color_table, transparency)
-        png_data = self.get_png_data(pixels, width, height)
+        return filename, self.mode, indices, width, height, color_table, transparent_index
 
-        filename = os.path.join(self.output_dir, f"{frame_number}.png")
-        with open(filename, 'wb') as png_file:
-            png_file.write(png_data)
+    def get_composited_frame(self, frame, frame_number):
+        """
+        Сборка кадра целиком с учётом методов обработки предыдущих кадров.
+        Кадры, экспортируемые по порядку, накладываются по одному; при пропуске состояние
+        холста перед кадром берётся из индекса перехода (GifSeekIndex).
+        :param frame: Кадр анимации.
+        :param frame_number: Номер кадра.
+        :return: Пиксели логического экрана в формате RGBA.
+        """
+        compositor = self.get_compositor()
+        if frame_number != self._composited_frame_number + 1:
+            if self.seek_index is None:
+                self.seek_index = GifSeekIndex(self.gif_parser)
+            compositor.restore_state(self.seek_index.get_state(frame_number - 1))
+        self._composited_frame_number = frame_number
+        return bytes(compositor.apply_frame(frame))
+
+    def get_compositor(self):
+        """
+        Компоновщик экспорта: собирает кадры в режиме composited и хранит таблицы перекодировки RGBA
+        (GifCompositor.get_cached_rgba_table) для режима rgba.
+        :return: GifCompositor.
+        """
+        if self.compositor is None:
+            self.compositor = GifCompositor(self.gif_parser.logical_screen_descriptor,
+                                            self.gif_parser.global_color_table)
+        return self.compositor
+
+    @staticmethod
+    def write_png_file(filename, mode, indices, width, height, color_table, transparent_index, rgba_table=None):
+        """
+        Преобразование индексов кадра в PNG и запись в файл.
+        :param filename: Путь к PNG-файлу.
+        :param mode: Режим экспорта ("rgba", "palette" или "composited").
+        :param indices: Индексы цветов (в режиме composited - готовые пиксели RGBA).
+        :param width: Ширина изображения.
+        :param height: Высота изображения.
+        :param color_table: Таблица цветов.
+        :param transparent_index: Индекс прозрачного цвета или None.
+        :param rgba_table: Готовые таблицы перекодировки для режима rgba.
+        """
+        if mode == "palette":
+            png_data = GifFramesExporter.get_palette_png_data(indices, width, height, color_table, transparent_index)
+        elif mode == "composited":
+            with profile_stage("transform_pixels"):
+                row_size = width * 4
+                pixels = [b'\x00' + indices[y * row_size:(y + 1) * row_size] for y in range(height)]
+            png_data = GifFramesExporter.get_png_data(pixels, width, height)
+        else:
+            with profile_stage("transform_pixels"):
+                if rgba_table is None:
+                    rgba_table = GifCompositor.get_rgba_table(color_table, transparent_index)
+                pixels = GifFramesExporter.transform_pixels(None, width, height, indices, color_table,
+                                                            transparent_index is not None, rgba_table)
+            png_data = GifFramesExporter.get_png_data(pixels, width, height)
+
+        with profile_stage("write_png"):
+            with open(filename, 'wb') as png_file:
+                png_file.write(png_data)
+        profile_count("png_bytes_written", len(png_data))
+        profile_count("frames_exported")
 
     @staticmethod
-    def transform_pixels(frame, width, height, indices, color_table, transparency):
+    def transform_pixels(frame, width, height, indices, color_table, transparency, rgba_table=None):
         """
         Преобразование индексов цветов в RGBA пиксели.
         :param frame: Кадр анимации.
@@ -74,38 +209,76 @@ class GifFramesExporter:
         :param indices: Индексы цветов.
         :param color_table: Таблица цветов.
         :param transparency: Индекс прозрачности.
+        :param rgba_table: Готовые таблицы перекодировки (если None, строятся по color_table и кадру).
         :return: Пиксели в формате RGBA.
         """
-        pixels = []
-        for i in range(height):
-            row = []
-            for j in range(width):
-                idx = i * width + j
-                color_idx = indices[idx]
-                r, g, b = color_table.colors[color_idx]
-                a = 255
-                if transparency and color_idx == frame.graphic_control_extension.transparent_color_index:
-                    a = 0
-                row.extend([r, g, b, a])
-            pixels.append(b'\x00' + bytes(row))
+        if rgba_table is None:
+            transparent_index = frame.graphic_control_extension.transparent_color_index if transparency else None
+            rgba_table = GifCompositor.get_rgba_table(color_table, transparent_index)
+        rgba = GifCompositor.indices_to_rgba(indices, width * height, rgba_table)
 
-        return pixels
+        row_size = width * 4
+        return [b'\x00' + rgba[y * row_size:(y + 1) * row_size] for y in range(height)]
 
-    def get_png_data(self, pixels, width, height):
+    @staticmethod
+    def get_palette_png_data(indices, width, height, color_table, transparent_index=None):
+        """
+        Инициализация структуры PNG-файла с палитрой (тип цветности 3):
+        индексы кадра сжимаются напрямую, цвета записываются в чанки PLTE и tRNS.
+        :param indices: Индексы цветов.
+        :param width: Ширина изображения.
+        :param height: Высота изображения.
+        :param color_table: Таблица цветов (если None, все цвета чёрные, как в GifCompositor.get_rgba_table).
+        :param transparent_index: Индекс прозрачного цвета или None.
+        :return: Структура PNG-файла в байтах.
+        """
+        pixel_count = width * height
+        indices = bytes(indices[:pixel_count])
+        if len(indices) < pixel_count:
+            indices += bytes(pixel_count - len(indices))
+
+        colors = color_table.colors[:256] if color_table else []
+        palette_size = max(len(colors), max(indices, default=0) + 1, 1)
+        if transparent_index is not None:
+            palette_size = max(palette_size, transparent_index + 1)
+        palette = bytearray(palette_size * 3)
+        for i, color in enumerate(colors):
+            palette[i * 3:i * 3 + 3] = bytes(color)
+
+        transparency = None
+        if transparent_index is not None:
+            transparency = b'\xff' * transparent_index + b'\x00'
+
+        with profile_stage("transform_pixels"):
+            pixels = [b'\x00' + indices[y * width:(y + 1) * width] for y in range(height)]
+        return GifFramesExporter.get_png_data(pixels, width, height, color_type=3,
+                                 palette=bytes(palette), transparency=transparency)
+
+    @staticmethod
+    def get_png_data(pixels, width, height, color_type=6, palette=None, transparency=None):
         """
         Инициализация структуры PNG-файла.
-        :param pixels: Пиксели в формате RGBA.
+        :param pixels: Строки пикселей (в формате RGBA или индексы палитры) с байтом фильтра.
         :param width: Ширина изображения.
         :param height: Высота изображения.
+        :param color_type: Тип цветности (6 - RGBA, 3 - палитра).
+        :param palette: Данные чанка PLTE или None.
+        :param transparency: Данные чанка tRNS или None.
         :return: Структура PNG-файла в байтах.
         """
         image_data = b''.join(pixels)
-        compressed_data = zlib.compress(image_data)
+        with profile_stage("zlib_compress"):
+            compressed_data = zlib.compress(image_data)
 
         png_data = b'\x89PNG\r\n\x1a\n'
-        png_data += self.get_png_chunk(b'IHDR', self.get_idhr_chunk(width, height))
-        png_data += self.get_png_chunk(b'IDAT', compressed_data)
-        png_data += self.get_png_chunk(b'IEND', b'')
+        png_data += GifFramesExporter.get_png_chunk(
+            b'IHDR', GifFramesExporter.get_idhr_chunk(width, height, color_type=color_type))
+        if palette is not None:
+            png_data += GifFramesExporter.get_png_chunk(b'PLTE', palette)
+        if transparency is not None:
+            png_data += GifFramesExporter.get_png_chunk(b'tRNS', transparency)
+        png_data += GifFramesExporter.get_png_chunk(b'IDAT', compressed_data)
+        png_data += GifFramesExporter.get_png_chunk(b'IEND', b'')
 
         return png_data
 
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import logging
+import os
+
+from GifStructs.gif_frame_info import GifFrameInfo
+from GifStructs.gif_header import GifHeader
+from GifStructs.global_color_table import GifGlobalColorTable
+from GifStructs.logical_screen_descriptor import GifLogicalScreenDescriptor
+
+CACHE_VERSION = 1
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+FRAME_INFO_FIELDS = ("number", "block_offset", "data_offset", "data_length", "left", "top", "width", "height",
+                     "interlaced", "local_color_table_size", "delay_time", "disposal_method",
+                     "transparent_color_index")
+
+
+class GifIndexCache:
+    def __init__(self, cache_dir=None, max_size=DEFAULT_MAX_SIZE, use_content_hash=False):
+        """
+        :param cache_dir: Папка кэша (по умолчанию GIF_PARSER_CACHE_DIR или ~/.cache/gif_parser).
+        :param max_size: Максимальный суммарный размер файлов кэша в байтах.
+        :param use_content_hash: Определять файл по хэшу содержимого, а не по пути, размеру и времени изменения.
+        """
+        if cache_dir is None:
+            cache_dir = os.environ.get("GIF_PARSER_CACHE_DIR",
+                                       os.path.join(os.path.expanduser("~"), ".cache", "gif_parser"))
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.use_content_hash = use_content_hash
+
+    def get_key(self, filename):
+        """
+        Ключ файла в кэше.
+        :param filename: Путь к GIF файлу.
+        :return: Ключ (шестнадцатеричная строка).
+        """
+        if self.use_content_hash:
+            digest = hashlib.sha256()
+            with open(filename, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+            return digest.hexdigest()
+
+        stat = os.stat(filename)
+        source = f"{os.path.abspath(filename)}|{stat.st_size}|{stat.st_mtime_ns}"
+        return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+    def get_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def load(self, gif_parser):
+        """
+        Загрузка индекса файла из кэша в парсер: заголовок, дескриптор экрана,
+        глобальная таблица цветов и индекс кадров.
+        :param gif_parser: Парсер, открытый для файла.
+        :return: True, если индекс найден в кэше.
+        """
+        path = self.get_path(self.get_key(gif_parser.filename))
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != CACHE_VERSION:
+            return False
+
+        try:
+            self.restore_index(gif_parser, data)
+        except (KeyError, TypeError, ValueError) as e:
+            logging.warning(f"Повреждённая запись кэша {path}: {e}")
+            return False
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return True
+
+    def store(self, gif_parser):
+        """
+        Сохранение индекса файла в кэш с последующим удалением давно использованных записей.
+        :param gif_parser: Парсер с разобранным индексом кадров.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.get_path(self.get_key(gif_parser.filename))
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.dump_index(gif_parser), f)
+        os.replace(temp_path, path)
+        self.evict()
+
+    def evict(self):
+        """
+        Удаление записей, которые дольше всего не использовались, пока размер кэша превышает max_size.
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+                total_size -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        """
+        Удаление всех записей кэша.
+        """
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.cache_dir, name))
+
+    @staticmethod
+    def dump_index(gif_parser):
+        """
+        Преобразование индекса файла в словарь для JSON.
+        :param gif_parser: Парсер с разобранным индексом кадров.
+        :return: Словарь.
+        """
+        screen = gif_parser.logical_screen_descriptor
+        return {
+            "version": CACHE_VERSION,
+            "header": [gif_parser.header.signature, gif_parser.header.version],
+            "screen": [screen.width, screen.height, screen.packed, screen.bg_color_index, screen.pixel_aspect_ratio],
+            "global_color_table": gif_parser.global_color_table.colors if gif_parser.global_color_table else None,
+            "frames": [[getattr(frame_info, field) for field in FRAME_INFO_FIELDS]
+                       for frame_info in gif_parser.frame_index],
+        }
+
+    @staticmethod
+    def restore_index(gif_parser, data):
+        """
+        Заполнение парсера индексом из словаря.
+        :param gif_parser: Парсер.
+        :param data: Словарь из dump_index.
+        """
+        header = GifHeader(*data["header"])
+        screen = GifLogicalScreenDescriptor(*data["screen"])
+        colors = data["global_color_table"]
+        global_color_table = GifGlobalColorTable([tuple(color) for color in colors]) if colors is not None else None
+        frame_index = [GifFrameInfo(*values) for values in data["frames"]]
+
+        gif_parser.header = header
+        gif_parser.logical_screen_descriptor = screen
+        gif_parser.global_color_table = global_color_table
+        gif_parser.frame_index = frame_index
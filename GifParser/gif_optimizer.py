@@ -0,0 +1,343 @@
+import sys
+import time
+
+from GifParser.gif_compositor import GifCompositor
+from GifParser.gif_parser import GifParser
+from GifParser.gif_writer import GifWriter
+from GifParser.lzw_compressor import LZWCompressor
+from GifStructs.GifExtensions.graphic_control_extension import GifGraphicControlExtension
+from GifStructs.gif_frame import GifFrame
+from GifStructs.gif_header import GifHeader
+from GifStructs.image_descriptor import GifImageDescriptor
+
+OPAQUE = int.from_bytes(b'\x00\x00\x00\xff', sys.byteorder)
+
+
+class GifOptimizer:
+    def __init__(self, gif_parser):
+        """
+        :param gif_parser: Парсер с разобранными кадрами.
+        """
+        self.gif_parser = gif_parser
+        self.width = gif_parser.logical_screen_descriptor.width
+        self.height = gif_parser.logical_screen_descriptor.height
+        self.frames = []
+        self.optimized = False
+        self._color_maps = {}
+
+    def optimize(self):
+        """
+        Оптимизация кадров: каждый кадр накладывается на холст, и вместо исходного изображения
+        записывается только наименьшая область, отличающаяся от холста перед кадром.
+        Неизменившиеся пиксели внутри области заменяются прозрачным индексом (исходным индексом
+        прозрачности кадра или неиспользуемым индексом таблицы цветов). Для предыдущего кадра
+        выбирается метод обработки 1 или 2 - тот, при котором сжатые данные кадра меньше.
+        Собранные кадры совпадают с исходными. Если кадр нельзя выразить через изменения
+        (нужного цвета нет в таблице кадра), кадры остаются исходными.
+        :return: Список кадров (GifFrame).
+        """
+        compositor = GifCompositor(self.gif_parser.logical_screen_descriptor, self.gif_parser.global_color_table)
+        blank = bytes(self.width * self.height * 4)
+        frames = []
+        previous = None
+        for frame in self.gif_parser.frames:
+            target = bytes(compositor.apply_frame(frame))
+            if previous is None:
+                candidate = self.encode_frame(frame, blank, target)
+                if candidate is None:
+                    return self._keep_original_frames()
+                frames.append(self.make_frame(frame, candidate))
+                previous = (frame, blank, target, candidate)
+                continue
+
+            previous_frame, previous_prior, previous_target, previous_candidate = previous
+            options = []
+            candidate = self.encode_frame(frame, previous_target, target)
+            if candidate is not None:
+                options.append((candidate, 1, previous_candidate))
+
+            # Если кадр выражается без очистки, пикселей, ставших прозрачными, нет.
+            clear_region = self.get_clear_region(previous_target, target) if candidate is None else None
+            region = GifCompositor.get_union_region(previous_candidate[0], clear_region)
+            if region != previous_candidate[0]:
+                expanded = self.encode_frame(previous_frame, previous_prior, previous_target, region)
+            else:
+                expanded = previous_candidate
+            if expanded is not None:
+                prior = self.clear_region(previous_target, expanded[0])
+                candidate = self.encode_frame(frame, prior, target)
+                if candidate is not None:
+                    options.append((candidate, 2, expanded))
+
+            if not options:
+                return self._keep_original_frames()
+            candidate, disposal, previous_candidate = min(options, key=lambda option: self.get_compressed_size(
+                frame, option[0]))
+            frames[-1] = self.make_frame(previous_frame, previous_candidate, disposal)
+            frames.append(self.make_frame(frame, candidate))
+            previous = (frame, previous_target if disposal == 1 else self.clear_region(previous_target,
+                                                                                        previous_candidate[0]),
+                        target, candidate)
+
+        self.frames = frames
+        self.optimized = True
+        return frames
+
+    def _keep_original_frames(self):
+        self.frames = list(self.gif_parser.frames)
+        self.optimized = False
+        return self.frames
+
+    def to_bytes(self):
+        """
+        Запись оптимизированного файла (optimize вызывается, если кадров ещё нет).
+        :return: Содержимое GIF файла.
+        """
+        if not self.frames:
+            self.optimize()
+        header = self.gif_parser.header
+        if self.optimized:
+            header = GifHeader(header.signature, "89a")
+        return GifWriter(header, self.gif_parser.logical_screen_descriptor,
+                         self.gif_parser.global_color_table, self.frames).to_bytes()
+
+    def get_color_table(self, frame):
+        return frame.local_color_table or self.gif_parser.global_color_table
+
+    def get_color_map(self, color_table):
+        """
+        Соответствие непрозрачного пикселя холста первому индексу с его цветом в таблице.
+        :param color_table: Таблица цветов или None.
+        :return: Словарь: пиксель RGBA как число (см. get_pixels) -> индекс.
+        """
+        cached = self._color_maps.get(id(color_table))
+        if cached is None or cached[0] is not color_table:
+            color_map = {}
+            for i, (r, g, b) in enumerate(color_table.colors[:256] if color_table else []):
+                color_map.setdefault(int.from_bytes(bytes((r, g, b, 255)), sys.byteorder), i)
+            cached = (color_table, color_map)
+            self._color_maps[id(color_table)] = cached
+        return cached[1]
+
+    def encode_frame(self, frame, prior, target, region=None):
+        """
+        Построение кадра, который переводит холст prior в target.
+        :param frame: Исходный кадр (определяет таблицу цветов и индекс прозрачности).
+        :param prior: Холст RGBA перед кадром.
+        :param target: Холст RGBA после кадра.
+        :param region: Область, которую кадр должен покрыть, или None (только изменившиеся пиксели).
+        :return: Кортеж (область, индексы, индекс прозрачности или None)
+                 или None, если изменения нельзя выразить цветами таблицы кадра.
+        """
+        changed_region = self.get_changed_region(prior, target)
+        if region is None:
+            region = changed_region or (0, 0, min(1, self.width), min(1, self.height))
+        else:
+            region = GifCompositor.get_union_region(region, changed_region)
+        x0, y0, x1, y1 = region
+        color_table = self.get_color_table(frame)
+        color_map = self.get_color_map(color_table)
+
+        prior_pixels = self.get_pixels(prior)
+        target_pixels = self.get_pixels(target)
+        width = x1 - x0
+        rows = []
+        used = set()
+        for y in range(y0, y1):
+            start = y * self.width + x0
+            old_row = prior_pixels[start:start + width]
+            new_row = target_pixels[start:start + width]
+            if old_row == new_row:
+                rows.append(None)
+                continue
+            row = [-1 if old == new else color_map.get(new) for old, new in zip(old_row.tolist(), new_row.tolist())]
+            if None in row:
+                return None
+            used.update(row)
+            rows.append(row)
+        used.discard(-1)
+
+        transparent_index = self.get_transparent_index(frame, color_table, used)
+        indices = bytearray()
+        for y, row in zip(range(y0, y1), rows):
+            if transparent_index is None and (row is None or -1 in row):
+                # Свободного индекса нет: неизменившиеся пиксели рисуются своими цветами.
+                start = y * self.width + x0
+                row = [color_map.get(pixel) for pixel in target_pixels[start:start + width].tolist()]
+                if None in row:
+                    return None
+            if row is None:
+                indices += bytes((transparent_index,)) * width
+            elif -1 in row:
+                indices += bytes([transparent_index if index < 0 else index for index in row])
+            else:
+                indices += bytes(row)
+        return region, bytes(indices), transparent_index
+
+    def get_compressed_size(self, frame, candidate):
+        """
+        Размер сжатых данных кадра из encode_frame.
+        :param frame: Исходный кадр.
+        :param candidate: Результат encode_frame.
+        :return: Размер в байтах.
+        """
+        indices = candidate[1]
+        min_code_size = GifWriter.get_min_code_size(self.get_color_table(frame), indices)
+        return len(LZWCompressor(min_code_size, indices).compress())
+
+    @staticmethod
+    def get_transparent_index(frame, color_table, used):
+        """
+        Индекс прозрачности: исходный индекс кадра или первый индекс таблицы, не занятый нужными цветами.
+        :param frame: Исходный кадр.
+        :param color_table: Таблица цветов кадра.
+        :param used: Индексы, которыми рисуются изменившиеся пиксели.
+        :return: Индекс или None, если свободных индексов нет.
+        """
+        gce = frame.graphic_control_extension
+        if gce and gce.transparency_flag and gce.transparent_color_index not in used:
+            return gce.transparent_color_index
+        size = len(color_table.colors) if color_table else 0
+        for index in range(min(size, 256)):
+            if index not in used:
+                return index
+        return None
+
+    @staticmethod
+    def get_pixels(canvas):
+        """
+        Пиксели холста RGBA как 32-битные числа (в порядке байтов платформы) для сравнения целыми пикселями.
+        :param canvas: Холст RGBA.
+        :return: memoryview с форматом 'I'.
+        """
+        return memoryview(canvas).cast('I')
+
+    def get_changed_region(self, prior, target):
+        """
+        Наименьшая область, вне которой холсты совпадают.
+        :param prior: Холст RGBA.
+        :param target: Холст RGBA.
+        :return: Координаты (x0, y0, x1, y1) или None, если холсты совпадают.
+        """
+        prior_pixels = self.get_pixels(prior)
+        target_pixels = self.get_pixels(target)
+        region = None
+        for y in range(self.height):
+            start = y * self.width
+            old_row = prior_pixels[start:start + self.width]
+            new_row = target_pixels[start:start + self.width]
+            if old_row == new_row:
+                continue
+            x0 = self.get_common_prefix_length(old_row, new_row)
+            x1 = self.width - self.get_common_prefix_length(old_row[::-1], new_row[::-1])
+            region = GifCompositor.get_union_region((x0, y, x1, y + 1), region)
+        return region
+
+    @staticmethod
+    def get_common_prefix_length(old, new):
+        """
+        Длина общего начала двух строк пикселей: двоичный поиск со сравнением срезов memoryview.
+        :param old: Строка пикселей.
+        :param new: Строка пикселей той же длины.
+        :return: Количество совпадающих пикселей в начале.
+        """
+        low, high = 0, len(old)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if old[:middle] == new[:middle]:
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    def get_clear_region(self, prior, target):
+        """
+        Область пикселей, которые были непрозрачными и стали прозрачными. Их нельзя изменить
+        наложением кадра, только методом обработки 2 предыдущего кадра.
+        :param prior: Холст RGBA.
+        :param target: Холст RGBA.
+        :return: Координаты (x0, y0, x1, y1) или None.
+        """
+        prior_pixels = self.get_pixels(prior)
+        target_pixels = self.get_pixels(target)
+        region = None
+        for y in range(self.height):
+            start = y * self.width
+            old_row = prior_pixels[start:start + self.width]
+            new_row = target_pixels[start:start + self.width]
+            if old_row == new_row:
+                continue
+            xs = [x for x, (old, new) in enumerate(zip(old_row.tolist(), new_row.tolist()))
+                  if old & OPAQUE and not new & OPAQUE]
+            if xs:
+                region = GifCompositor.get_union_region((xs[0], y, xs[-1] + 1, y + 1), region)
+        return region
+
+    def clear_region(self, canvas, region):
+        """
+        Холст после метода обработки 2 для области.
+        :param canvas: Холст RGBA.
+        :param region: Координаты (x0, y0, x1, y1).
+        :return: Новый холст.
+        """
+        x0, y0, x1, y1 = region
+        result = bytearray(canvas)
+        blank = bytes((x1 - x0) * 4)
+        for y in range(y0, y1):
+            start = (y * self.width + x0) * 4
+            result[start:start + len(blank)] = blank
+        return bytes(result)
+
+    @staticmethod
+    def make_frame(frame, candidate, disposal=1):
+        """
+        Кадр из результата encode_frame с расширениями исходного кадра.
+        :param frame: Исходный кадр.
+        :param candidate: Результат encode_frame.
+        :param disposal: Метод обработки кадра.
+        :return: Кадр (GifFrame) без чересстрочной развёртки.
+        """
+        (x0, y0, x1, y1), indices, transparent_index = candidate
+        gce = frame.graphic_control_extension
+        graphic_control_ext = GifGraphicControlExtension(
+            disposal, gce.user_input_flag if gce else 0, int(transparent_index is not None),
+            gce.delay_time if gce else 0, transparent_index or 0)
+        descriptor = GifImageDescriptor(x0, y0, x1 - x0, y1 - y0, frame.image_descriptor.packed & ~0x40)
+        return GifFrame(descriptor, frame.local_color_table, graphic_control_ext, frame.plain_text_ext,
+                        frame.application_ext, frame.comment_ext, bytearray(indices))
+
+    @staticmethod
+    def measure_decode_time(data, repeat=3):
+        """
+        Лучшее время полного разбора файла с декодированием кадров.
+        :param data: Содержимое GIF файла.
+        :param repeat: Количество повторов.
+        :return: Время в секундах.
+        """
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            GifParser(data).parse()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    @staticmethod
+    def get_report(original_data, optimized_data, repeat=3):
+        """
+        Сравнение размера и времени декодирования исходного и оптимизированного файлов.
+        :param original_data: Содержимое исходного файла.
+        :param optimized_data: Содержимое оптимизированного файла.
+        :param repeat: Количество повторов замера декодирования.
+        :return: Словарь с размерами, временем декодирования и экономией в процентах.
+        """
+        original_seconds = GifOptimizer.measure_decode_time(original_data, repeat)
+        optimized_seconds = GifOptimizer.measure_decode_time(optimized_data, repeat)
+        return {
+            "original_bytes": len(original_data),
+            "optimized_bytes": len(optimized_data),
+            "size_saving_percent": (1 - len(optimized_data) / len(original_data)) * 100,
+            "original_decode_ms": original_seconds * 1000,
+            "optimized_decode_ms": optimized_seconds * 1000,
+            "decode_saving_percent": (1 - optimized_seconds / original_seconds) * 100 if original_seconds else 0.0,
+        }
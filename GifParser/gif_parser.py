@@ -1,43 +1,220 @@
 import logging
 import os
+from functools import lru_cache
 
 from GifStructs.GifExtensions.application_extension import GifApplicationExtension
 from GifStructs.GifExtensions.comment_extension import GifCommentExtension
 from GifStructs.GifExtensions.graphic_control_extension import GifGraphicControlExtension
 from GifStructs.GifExtensions.plain_text_extension import GifPlainTextExtension
 from GifStructs.gif_frame import GifFrame
+from GifStructs.gif_frame_info import GifFrameInfo
 from GifStructs.image_descriptor import GifImageDescriptor
 from GifStructs.logical_screen_descriptor import GifLogicalScreenDescriptor
 from GifStructs.global_color_table import GifGlobalColorTable
 from GifStructs.gif_header import GifHeader
 from GifStructs.local_color_table import GifLocalColorTable
-from GifParser.lzw_decompressor import LZWDecompressor
+from GifParser.gif_block_reader import GifBlockReader
+from GifParser.gif_profiler import profile_count, profile_stage
+from GifParser.lzw_decompressor import Decompressor
 
 
 class GifParser:
-    def __init__(self, filename):
-        self.filename = filename
+    def __init__(self, source, lazy=False, index_cache=None):
+        """
+        :param source: Путь к GIF файлу или его содержимое (bytes, bytearray, memoryview).
+        :param lazy: Декодировать индексы кадров только при первом обращении.
+        :param index_cache: Кэш индексов кадров на диске (GifIndexCache) или None.
+        """
+        self.source = source
+        self.filename = None if isinstance(source, (bytes, bytearray, memoryview)) else source
+        self.lazy = lazy
+        self.index_cache = index_cache if self.filename is not None else None
         self.header = None
         self.logical_screen_descriptor = None
         self.global_color_table = None
         self.frames = []
+        self.frame_index = []
+        self._reader = None
 
     def parse(self):
         """
         Парсинг GIF файла.
         """
-        if not os.path.exists(self.filename):
-            logging.error(f"Файл {self.filename} не найден.")
+        self.frames.extend(self.iter_frames())
+
+    def iter_frames(self):
+        """
+        Потоковый парсинг GIF файла: кадры возвращаются по одному по мере разбора блоков
+        и не сохраняются в self.frames. Заголовок, дескриптор экрана и глобальная таблица
+        цветов заполняются до первого кадра. Если индекс файла есть в кэше, кадры читаются
+        по сохранённым смещениям, иначе индекс строится при разборе и сохраняется в кэш.
+        :return: Генератор кадров.
+        """
+        f = self.open_reader()
+        if f is None:
             return
 
-        with open(self.filename, 'rb') as f:
-            header_data = f.read(6)
-            self.header = self.parse_header(header_data)
-            log_desc_data = f.read(7)
-            self.logical_screen_descriptor = self.parse_logical_screen_descriptor(log_desc_data)
-            data = f.read(self.logical_screen_descriptor.global_color_table_size * 3)
-            self.global_color_table = self.parse_global_color_table(self.logical_screen_descriptor, data)
-            self.parse_blocks(f)
+        try:
+            if self.load_cached_index():
+                for frame_info in self.frame_index:
+                    yield self.read_frame(frame_info)
+            else:
+                self.parse_screen(f)
+                yield from self.iter_indexed_blocks(f)
+                self.store_cached_index()
+        finally:
+            if not self.lazy:
+                self.close()
+
+    def scan(self):
+        """
+        Быстрый просмотр структуры файла: разбираются заголовок, дескриптор экрана, расширения
+        и дескрипторы изображений, а данные изображений пропускаются по размерам подблоков
+        без копирования и декодирования.
+        :return: Индекс кадров (список GifFrameInfo), также сохраняется в self.frame_index.
+        """
+        f = self.open_reader()
+        if f is None:
+            return []
+
+        try:
+            if not self.load_cached_index():
+                self.parse_screen(f)
+                for _ in self.iter_indexed_blocks(f, lazy=True):
+                    pass
+                self.store_cached_index()
+        finally:
+            if not self.lazy:
+                self.close()
+        return self.frame_index
+
+    def iter_indexed_blocks(self, f, lazy=None):
+        """
+        Парсинг блоков с построением индекса кадров. Индекс сохраняется в self.frame_index
+        после разбора последнего блока.
+        :param f: Читатель блоков GIF файла, установленный на первый блок после глобальной таблицы цветов.
+        :param lazy: Не декодировать индексы кадров (по умолчанию - как задано в self.lazy).
+        :return: Генератор кадров.
+        """
+        frame_index = []
+        block_offset = f.tell()
+        for frame in self.iter_blocks(f, lazy):
+            frame_index.append(self.get_frame_info(len(frame_index) + 1, block_offset, frame))
+            yield frame
+            block_offset = f.tell()
+        self.frame_index = frame_index
+
+    def get_frame(self, frame_number):
+        """
+        Произвольный доступ к кадру по номеру. Кадр находится по индексу кадров (если индекса нет,
+        файл сканируется без декодирования), декодируются только данные этого кадра.
+        :param frame_number: Номер кадра (начиная с 1).
+        :return: Кадр или None, если кадра с таким номером нет.
+        """
+        if not self.frame_index:
+            self.scan()
+        if not 1 <= frame_number <= len(self.frame_index):
+            return None
+        if len(self.frames) == len(self.frame_index):
+            return self.frames[frame_number - 1]
+        return self.read_frame(self.frame_index[frame_number - 1])
+
+    def read_frame(self, frame_info, lazy=None):
+        """
+        Чтение кадра по записи индекса без разбора предшествующих блоков.
+        :param frame_info: Запись индекса кадров.
+        :param lazy: Не декодировать индексы кадра (по умолчанию - как задано в self.lazy).
+        :return: Кадр или None, если по смещению нет изображения или файл не найден.
+        """
+        opened = self._reader is None
+        if opened and self.open_reader() is None:
+            return None
+        f = GifBlockReader(self._reader.buffer, frame_info.block_offset)
+        blocks = self.iter_blocks(f, lazy)
+        try:
+            return next(blocks, None)
+        finally:
+            blocks.close()
+            f.close()
+            if opened and not self.lazy:
+                self.close()
+
+    def load_cached_index(self):
+        """
+        Загрузка заголовка, дескриптора экрана, глобальной таблицы цветов и индекса кадров из кэша.
+        :return: True, если индекс найден в кэше.
+        """
+        if self.index_cache is None:
+            return False
+        try:
+            return self.index_cache.load(self)
+        except OSError as e:
+            logging.warning(f"Не удалось прочитать кэш индекса {self.filename}: {e}")
+            return False
+
+    def store_cached_index(self):
+        """
+        Сохранение индекса кадров в кэш.
+        """
+        if self.index_cache is None or self.header is None:
+            return
+        try:
+            self.index_cache.store(self)
+        except OSError as e:
+            logging.warning(f"Не удалось сохранить кэш индекса {self.filename}: {e}")
+
+    @staticmethod
+    def get_frame_info(number, block_offset, frame):
+        """
+        Построение записи индекса кадров.
+        :param number: Номер кадра.
+        :param block_offset: Смещение первого блока кадра (расширений или дескриптора изображения).
+        :param frame: Кадр.
+        :return: Запись индекса кадров.
+        """
+        descriptor = frame.image_descriptor
+        gce = frame.graphic_control_extension
+        transparent_index = gce.transparent_color_index if gce and gce.transparency_flag else None
+        return GifFrameInfo(number, block_offset, frame.data_offset, frame.data_length,
+                            descriptor.left, descriptor.top, descriptor.width, descriptor.height,
+                            descriptor.interlace_flag, descriptor.local_color_table_size,
+                            gce.delay_time if gce else 0, gce.disposal_method if gce else 0, transparent_index)
+
+    def parse_screen(self, f):
+        """
+        Парсинг заголовка, логического дескриптора экрана и глобальной таблицы цветов.
+        :param f: Читатель блоков GIF файла.
+        """
+        header_data = f.read(6)
+        self.header = self.parse_header(header_data)
+        log_desc_data = f.read(7)
+        self.logical_screen_descriptor = self.parse_logical_screen_descriptor(log_desc_data)
+        data = f.read(self.get_global_color_table_length(self.logical_screen_descriptor))
+        self.global_color_table = self.parse_global_color_table(self.logical_screen_descriptor, data)
+        profile_count("bytes_read", f.tell())
+
+    def open_reader(self):
+        """
+        Открытие источника данных: файл отображается в память, байты читаются напрямую.
+        :return: Читатель блоков или None, если файл не найден.
+        """
+        self.close()
+        if self.filename is None:
+            self._reader = GifBlockReader(self.source)
+        elif not os.path.exists(self.filename):
+            logging.error(f"Файл {self.filename} не найден.")
+            return None
+        else:
+            self._reader = GifBlockReader.from_file(self.filename)
+        return self._reader
+
+    def close(self):
+        """
+        Освобождение буфера с содержимым файла.
+        """
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
 
     @staticmethod
     def parse_header(header_data):
@@ -67,6 +244,17 @@ class GifParser:
         packed, bg_color_index, aspect = log_desc_data[4], log_desc_data[5], log_desc_data[6]
         return GifLogicalScreenDescriptor(width, height, packed, bg_color_index, aspect)
 
+    @staticmethod
+    def get_global_color_table_length(logical_screen_descriptor):
+        """
+        Размер глобальной таблицы цветов в файле.
+        :param logical_screen_descriptor: Логический дескриптор экрана.
+        :return: Количество байтов (0, если флаг глобальной таблицы цветов не установлен).
+        """
+        if logical_screen_descriptor.global_color_table_flag:
+            return logical_screen_descriptor.global_color_table_size * 3
+        return 0
+
     @staticmethod
     def parse_global_color_table(logical_screen_descriptor, data):
         """
@@ -81,33 +269,86 @@ class GifParser:
         return None
 
     def parse_blocks(self, f):
-        graphic_control_ext = plain_text_ext = application_ext = comment_ext = None
+        """
+        Парсинг блоков расширений и изображений с сохранением кадров в self.frames.
+        :param f: Читатель блоков GIF файла.
+        """
+        self.frames.extend(self.iter_blocks(f))
+
+    @staticmethod
+    def extract_lzw_streams(data):
+        """
+        Извлечение сжатых данных изображений без декодирования.
+        :param data: Содержимое GIF-файла.
+        :return: Список троек (минимальный размер кода, данные, количество пикселей).
+        """
+        f = GifBlockReader(data)
+        f.read(6)
+        logical_screen_descriptor = GifParser.parse_logical_screen_descriptor(f.read(7))
+        f.read(GifParser.get_global_color_table_length(logical_screen_descriptor))
+
+        streams = []
         while True:
             b = f.read(1)
-            if len(b) == 0:
-                break
-            block_id = b[0]
-            if block_id == 0x3B:
+            if not b or b[0] == 0x3B:
                 break
-            elif block_id == 0x21:
-                graphic_control_ext, plain_text_ext, application_ext, comment_ext = GifParser.parse_extension(f)
-            elif block_id == 0x2C:
+            if b[0] == 0x21:
+                GifParser.parse_extension(f)
+            elif b[0] == 0x2C:
                 image_descriptor = GifParser.parse_image_descriptor(f)
-                local_ct = GifParser.parse_local_color_table(f, image_descriptor)
-                indices = GifParser.parse_indices(f)
+                GifParser.parse_local_color_table(f, image_descriptor)
+                min_code_size = f.read(1)[0]
+                streams.append((min_code_size, f.read_sub_blocks(),
+                                image_descriptor.width * image_descriptor.height))
+        return streams
 
-                frame = GifFrame(image_descriptor, local_ct, graphic_control_ext,
-                                 plain_text_ext, application_ext, comment_ext, indices)
-                self.frames.append(frame)
-                graphic_control_ext = plain_text_ext = application_ext = comment_ext = None
-            else:
-                GifParser.skip_sub_blocks(f)
+    def iter_blocks(self, f, lazy=None):
+        """
+        Парсинг блоков расширений и изображений.
+        :param f: Читатель блоков GIF файла.
+        :param lazy: Не декодировать индексы кадров (по умолчанию - как задано в self.lazy).
+        :return: Генератор кадров.
+        """
+        lazy = self.lazy if lazy is None else lazy
+        graphic_control_ext = plain_text_ext = application_ext = comment_ext = None
+        while True:
+            frame = None
+            with profile_stage("read_blocks"):
+                block_offset = f.tell()
+                b = f.read(1)
+                if len(b) == 0:
+                    break
+                block_id = b[0]
+                if block_id == 0x3B:
+                    break
+                elif block_id == 0x21:
+                    graphic_control_ext, plain_text_ext, application_ext, comment_ext = GifParser.parse_extension(f)
+                elif block_id == 0x2C:
+                    image_descriptor = GifParser.parse_image_descriptor(f)
+                    local_ct = GifParser.parse_local_color_table(f, image_descriptor)
+                    data_offset = f.tell()
+                    if lazy:
+                        indices = None
+                        f.seek(1, os.SEEK_CUR)
+                        GifParser.skip_sub_blocks(f)
+                    else:
+                        indices = GifParser.parse_indices(f, image_descriptor)
+
+                    frame = GifFrame(image_descriptor, local_ct, graphic_control_ext,
+                                     plain_text_ext, application_ext, comment_ext, indices,
+                                     data_offset, f.tell() - data_offset, self.load_image_data)
+                    graphic_control_ext = plain_text_ext = application_ext = comment_ext = None
+                else:
+                    GifParser.skip_sub_blocks(f)
+                profile_count("bytes_read", f.tell() - block_offset)
+            if frame is not None:
+                yield frame
 
     @staticmethod
     def parse_extension(f):
         """
         Парсинг расширения.
-        :param f: Открытый GIF файл.
+        :param f: Читатель блоков GIF файла.
         :return: Расширения, если есть, иначе None.
         """
         graphic_control_ext = plain_text_ext = application_ext = comment_ext = None
@@ -140,7 +381,7 @@ class GifParser:
     def parse_image_descriptor(f):
         """
         Парсинг дескриптора изображения.
-        :param f: Открытый GIF файл.
+        :param f: Читатель блоков GIF файла.
         :return: Дескриптор изображения.
         """
         img_desc_data = f.read(9)
@@ -155,7 +396,7 @@ class GifParser:
     def parse_local_color_table(f, image_descriptor):
         """
         Парсинг локальной таблицы цветов.
-        :param f: Открытый GIF файл.
+        :param f: Читатель блоков GIF файла.
         :param image_descriptor: Дескриптор изображения.
         :return: Локальная таблица цветов, если есть, иначе None.
         """
@@ -168,16 +409,62 @@ class GifParser:
         return local_ct
 
     @staticmethod
-    def parse_indices(f):
+    def parse_indices(f, image_descriptor=None):
         """
         Парсинг индексов изображения.
-        :param f: Открытый GIF файл.
+        :param f: Читатель блоков GIF файла.
+        :param image_descriptor: Дескриптор изображения (задаёт размер выходного буфера).
         :return: Индексы изображения.
         """
         lzw_min_code_size = f.read(1)[0]
         img_data_blocks = GifParser.read_sub_blocks(f)
-        decompressor = LZWDecompressor(lzw_min_code_size, img_data_blocks)
-        return decompressor.decode()
+        pixel_count = image_descriptor.width * image_descriptor.height if image_descriptor else None
+        decompressor = Decompressor(lzw_min_code_size, img_data_blocks, pixel_count)
+        with profile_stage("lzw_decode"):
+            indices = decompressor.decode()
+        if image_descriptor and image_descriptor.interlace_flag:
+            with profile_stage("deinterlace"):
+                indices = GifParser.deinterlace(indices, image_descriptor.width, image_descriptor.height)
+        return indices
+
+    @staticmethod
+    def deinterlace(indices, width, height):
+        """
+        Перевод индексов изображения с чересстрочной развёрткой в построчный порядок:
+        строки переставляются за один проход копированием срезов по карте строк.
+        :param indices: Индексы в порядке хранения (проходы через 8, 8, 4 и 2 строки).
+        :param width: Ширина изображения.
+        :param height: Высота изображения.
+        :return: Индексы в построчном порядке.
+        """
+        result = bytearray(width * height)
+        for stored_row, row in enumerate(GifParser.get_interlaced_row_map(height)):
+            src = stored_row * width
+            row_data = indices[src:src + width]
+            result[row * width:row * width + len(row_data)] = row_data
+        return result
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def get_interlaced_row_map(height):
+        """
+        Карта строк чересстрочного изображения (кэшируется для каждой высоты).
+        :param height: Высота изображения.
+        :return: Кортеж: для каждой строки в порядке хранения - её номер в изображении.
+        """
+        return tuple(row for start, step in ((0, 8), (4, 8), (2, 4), (1, 2)) for row in range(start, height, step))
+
+    def load_image_data(self, frame):
+        """
+        Отложенное декодирование индексов кадра по сохранённому смещению в файле.
+        :param frame: Кадр, разобранный в ленивом режиме.
+        :return: Индексы изображения.
+        :raises FileNotFoundError: Если файл больше не существует.
+        """
+        if self._reader is None and self.open_reader() is None:
+            raise FileNotFoundError(f"Файл {self.filename} не найден.")
+        f = GifBlockReader(self._reader.buffer, frame.data_offset)
+        return GifParser.parse_indices(f, frame.image_descriptor)
 
     @staticmethod
     def parse_graphic_control_extension(gce_data):
@@ -239,30 +526,17 @@ class GifParser:
 
     @staticmethod
     def skip_sub_blocks(f):
-        while True:
-            block_size_data = f.read(1)
-            if not block_size_data:
-                break
-            size = block_size_data[0]
-            if size == 0:
-                break
-            f.read(size)
+        """
+        Пропуск блока данных без чтения его содержимого.
+        :param f: Читатель блоков GIF файла.
+        """
+        f.skip_sub_blocks()
 
     @staticmethod
     def read_sub_blocks(f):
         """
         Чтение блока данных.
-        :param f: Открытый GIF файл.
+        :param f: Читатель блоков GIF файла.
         :return: Блок данных о составляющей GIF файла.
         """
-        result = bytearray()
-        while True:
-            block_size_data = f.read(1)
-            if not block_size_data:
-                break
-            size = block_size_data[0]
-            if size == 0:
-                break
-            chunk = f.read(size)
-            result.extend(chunk)
-        return bytes(result)
+        return f.read_sub_blocks()
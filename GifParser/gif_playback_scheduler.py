@@ -0,0 +1,117 @@
+import time
+
+DEFAULT_DELAY_MS = 100
+MIN_DELAY_TIME = 2
+RESYNC_LAG = 1.0
+
+
+class GifPlaybackScheduler:
+    def __init__(self, delays, drop_frames=True, clock=time.perf_counter):
+        """
+        :param delays: Задержки кадров в миллисекундах (см. get_frame_delays).
+        :param drop_frames: Пропускать кадры, время показа которых уже прошло.
+        :param clock: Функция текущего времени в секундах.
+        """
+        if not delays:
+            raise ValueError("Нет кадров для воспроизведения")
+        self.delays = [delay / 1000 for delay in delays]
+        self.drop_frames = drop_frames
+        self.clock = clock
+        self.current_frame_idx = 0
+        self.due_time = None
+        self.start_time = None
+        self.last_shown_time = None
+        self.frames_shown = 0
+        self.dropped_frames = 0
+        self.resyncs = 0
+        self.render_time = 0.0
+        self.max_render_time = 0.0
+        self.lag = 0.0
+
+    @staticmethod
+    def get_delay_ms(graphic_control_extension):
+        """
+        Задержка кадра в миллисекундах. В GIF задержка хранится в сотых долях секунды;
+        задержки меньше MIN_DELAY_TIME заменяются на DEFAULT_DELAY_MS, как в браузерах.
+        :param graphic_control_extension: Расширение управления графикой или None.
+        :return: Задержка в миллисекундах.
+        """
+        if graphic_control_extension is None or graphic_control_extension.delay_time < MIN_DELAY_TIME:
+            return DEFAULT_DELAY_MS
+        return graphic_control_extension.delay_time * 10
+
+    @staticmethod
+    def get_frame_delays(frames):
+        """
+        Задержки всех кадров в миллисекундах.
+        :param frames: Кадры анимации.
+        :return: Список задержек.
+        """
+        return [GifPlaybackScheduler.get_delay_ms(frame.graphic_control_extension) for frame in frames]
+
+    def frame_shown(self, frame_idx, render_time):
+        """
+        Учёт показанного кадра. Если показан не тот кадр, который был выбран next_frame
+        (первый кадр или переход к произвольному кадру), шкала начинается заново с этого кадра.
+        :param frame_idx: Индекс показанного кадра.
+        :param render_time: Время отрисовки кадра в секундах (по time.perf_counter).
+        """
+        now = self.clock()
+        if self.due_time is None or frame_idx != self.current_frame_idx:
+            self.current_frame_idx = frame_idx
+            self.due_time = now - render_time
+            if self.start_time is None:
+                self.start_time = now
+        self.frames_shown += 1
+        self.last_shown_time = now
+        self.render_time += render_time
+        self.max_render_time = max(self.max_render_time, render_time)
+
+    def next_frame(self):
+        """
+        Выбор следующего кадра по абсолютной временной шкале: время показа каждого кадра
+        отсчитывается от времени показа предыдущего по шкале, а не от момента окончания отрисовки,
+        поэтому время отрисовки не накапливается. Кадры, время показа которых уже прошло, пропускаются.
+        При отставании больше RESYNC_LAG секунд шкала сдвигается на текущее время.
+        :return: Индекс следующего кадра и время ожидания до его показа в миллисекундах.
+        """
+        now = self.clock()
+        if self.due_time is None:
+            self.due_time = self.start_time = now
+        frame_count = len(self.delays)
+        frame_idx = (self.current_frame_idx + 1) % frame_count
+        due_time = self.due_time + self.delays[self.current_frame_idx]
+
+        if self.drop_frames:
+            dropped = 0
+            while dropped < frame_count - 1 and now >= due_time + self.delays[frame_idx]:
+                due_time += self.delays[frame_idx]
+                frame_idx = (frame_idx + 1) % frame_count
+                dropped += 1
+            self.dropped_frames += dropped
+
+        self.lag = max(0.0, now - due_time)
+        if self.lag > RESYNC_LAG:
+            due_time = now
+            self.resyncs += 1
+
+        self.current_frame_idx = frame_idx
+        self.due_time = due_time
+        return frame_idx, max(0, round((due_time - now) * 1000))
+
+    def get_stats(self):
+        """
+        Статистика воспроизведения.
+        :return: Словарь: показано и пропущено кадров, фактическая частота кадров,
+                 среднее и максимальное время отрисовки, текущее отставание от шкалы.
+        """
+        elapsed = (self.last_shown_time - self.start_time) if self.frames_shown > 1 else 0.0
+        return {
+            "frames_shown": self.frames_shown,
+            "dropped_frames": self.dropped_frames,
+            "resyncs": self.resyncs,
+            "fps": (self.frames_shown - 1) / elapsed if elapsed > 0 else 0.0,
+            "average_render_ms": self.render_time / self.frames_shown * 1000 if self.frames_shown else 0.0,
+            "max_render_ms": self.max_render_time * 1000,
+            "lag_ms": self.lag * 1000,
+        }
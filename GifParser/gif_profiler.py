@@ -0,0 +1,198 @@
+import threading
+import time
+
+_active_profiler = None
+
+
+class GifProfiler:
+    def __init__(self, callback=None, clock=time.perf_counter):
+        """
+        :param callback: Функция callback(stage, seconds), вызываемая после каждого этапа, или None.
+        :param clock: Функция текущего времени в секундах.
+        """
+        self.callback = callback
+        self.clock = clock
+        self.stages = {}
+        self.counters = {}
+        self.unavailable = set()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._previous = None
+
+    def __enter__(self):
+        """
+        Включение профилирования: этапы и счётчики из profile_stage и profile_count
+        записываются в этот профилировщик до выхода из блока with.
+        """
+        global _active_profiler
+        self._previous = _active_profiler
+        _active_profiler = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _active_profiler
+        _active_profiler = self._previous
+        self._previous = None
+
+    def stage(self, name):
+        """
+        Замер этапа. Вложенные этапы вычитаются из собственного времени внешнего этапа.
+        :param name: Название этапа.
+        :return: Контекстный менеджер.
+        """
+        return _ProfilerStage(self, name)
+
+    def add_time(self, name, total, own):
+        """
+        Учёт времени этапа.
+        :param name: Название этапа.
+        :param total: Время этапа вместе с вложенными этапами в секундах.
+        :param own: Собственное время этапа (без вложенных этапов) в секундах.
+        """
+        with self._lock:
+            stage = self.stages.get(name)
+            if stage is None:
+                stage = self.stages[name] = {"calls": 0, "total_seconds": 0.0, "self_seconds": 0.0}
+            stage["calls"] += 1
+            stage["total_seconds"] += total
+            stage["self_seconds"] += own
+        if self.callback is not None:
+            self.callback(name, total)
+
+    def count(self, name, value=1):
+        """
+        Увеличение счётчика.
+        :param name: Название счётчика.
+        :param value: Приращение.
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def mark_unavailable(self, name):
+        """
+        Отметка счётчика, который не удалось посчитать (например, в C-декодере LZW).
+        :param name: Название счётчика.
+        """
+        with self._lock:
+            self.unavailable.add(name)
+
+    def get_stats(self):
+        """
+        Статистика профилирования.
+        :return: Словарь: stages - для каждого этапа количество вызовов, полное и собственное время;
+                 counters - значения счётчиков; unavailable - счётчики, посчитанные не везде.
+        """
+        with self._lock:
+            return {"stages": {name: dict(stage) for name, stage in self.stages.items()},
+                    "counters": dict(self.counters), "unavailable": sorted(self.unavailable)}
+
+    def merge(self, stats):
+        """
+        Добавление статистики из get_stats другого профилировщика (например, из другого процесса).
+        :param stats: Статистика.
+        """
+        with self._lock:
+            for name, other in stats["stages"].items():
+                stage = self.stages.setdefault(name, {"calls": 0, "total_seconds": 0.0, "self_seconds": 0.0})
+                for key in stage:
+                    stage[key] += other[key]
+            for name, value in stats["counters"].items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            self.unavailable.update(stats.get("unavailable", ()))
+
+    def format_stats(self):
+        """
+        Текстовый отчёт: этапы по убыванию собственного времени с долей от суммы и счётчики.
+        :return: Отчёт.
+        """
+        stats = self.get_stats()
+        stages = sorted(stats["stages"].items(), key=lambda item: item[1]["self_seconds"], reverse=True)
+        total = sum(stage["self_seconds"] for _, stage in stages)
+        lines = ["Профиль:"]
+        for name, stage in stages:
+            share = stage["self_seconds"] / total * 100 if total else 0.0
+            lines.append(f"  {name:<20} {stage['self_seconds'] * 1000:10.2f} мс {share:6.1f}% "
+                         f"(вызовов: {stage['calls']}, с вложенными: {stage['total_seconds'] * 1000:.2f} мс)")
+        for name in sorted(set(stats["counters"]) | set(stats["unavailable"])):
+            if name not in stats["counters"]:
+                lines.append(f"  {name:<20} н/д")
+            elif name in stats["unavailable"]:
+                lines.append(f"  {name:<20} {stats['counters'][name]} (посчитан не для всех данных)")
+            else:
+                lines.append(f"  {name:<20} {stats['counters'][name]}")
+        return "\n".join(lines)
+
+
+class _ProfilerStage:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        local = self.profiler._local
+        stack = getattr(local, "stack", None)
+        if stack is None:
+            stack = local.stack = []
+        # Запись стека: [время начала, время вложенных этапов].
+        stack.append([self.profiler.clock(), 0.0])
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        stack = self.profiler._local.stack
+        start, nested = stack.pop()
+        total = self.profiler.clock() - start
+        if stack:
+            stack[-1][1] += total
+        self.profiler.add_time(self.name, total, total - nested)
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return None
+
+
+_NULL_STAGE = _NullStage()
+
+
+def get_profiler():
+    """
+    :return: Включённый профилировщик или None.
+    """
+    return _active_profiler
+
+
+def profile_stage(name):
+    """
+    Замер этапа включённым профилировщиком. Если профилирование выключено,
+    возвращается общий пустой контекстный менеджер без замера времени.
+    :param name: Название этапа.
+    :return: Контекстный менеджер.
+    """
+    profiler = _active_profiler
+    if profiler is None:
+        return _NULL_STAGE
+    return profiler.stage(name)
+
+
+def profile_unavailable(name):
+    """
+    Отметка счётчика включённого профилировщика как недоступного (без действий, если профилирование выключено).
+    :param name: Название счётчика.
+    """
+    profiler = _active_profiler
+    if profiler is not None:
+        profiler.mark_unavailable(name)
+
+
+def profile_count(name, value=1):
+    """
+    Увеличение счётчика включённого профилировщика (без действий, если профилирование выключено).
+    :param name: Название счётчика.
+    :param value: Приращение.
+    """
+    profiler = _active_profiler
+    if profiler is not None:
+        profiler.count(name, value)
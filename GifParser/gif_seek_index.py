@@ -0,0 +1,138 @@
+from collections import OrderedDict
+
+from GifParser.gif_compositor import GifCompositor
+
+
+class GifSeekIndex:
+    def __init__(self, gif_parser, interval=16, max_memory=64 * 1024 * 1024, compositor=None):
+        """
+        :param gif_parser: Парсер GIF файла.
+        :param interval: Шаг между снимками холста в кадрах.
+        :param max_memory: Максимальный суммарный размер снимков в байтах.
+        :param compositor: Компоновщик, на котором собираются кадры (например, компоновщик просмотрщика,
+                           чтобы не восстанавливать его состояние из отдельного холста). По умолчанию - новый.
+        """
+        if interval < 1:
+            raise ValueError(f"Шаг между снимками должен быть положительным: {interval}")
+        self.gif_parser = gif_parser
+        self.interval = interval
+        self.max_memory = max_memory
+        if compositor is None:
+            compositor = GifCompositor(gif_parser.logical_screen_descriptor, gif_parser.global_color_table)
+        self.compositor = compositor
+        self.snapshots = OrderedDict()
+        self.memory = 0
+        self.applied_frames = 0
+
+    @property
+    def frame_number(self):
+        """
+        Номер последнего наложенного на компоновщик кадра (0 - холст до первого кадра).
+        """
+        return self.compositor.frame_count
+
+    def seek(self, frame_number):
+        """
+        Сборка кадра целиком с учётом методов обработки предыдущих кадров. Холст восстанавливается
+        из ближайшего предыдущего снимка, продолжается с текущего кадра или собирается из минимальной
+        цепочки кадров (см. GifCompositor.get_frame_chain) - выбирается вариант с наименьшим
+        числом накладываемых кадров. По пути сохраняются снимки каждого interval-го кадра.
+        :param frame_number: Номер кадра (начиная с 1).
+        :return: Холст (bytearray RGBA размером с логический экран) или None, если кадра нет.
+                 Изменяется следующими вызовами.
+        """
+        frame_index = self.get_frame_index()
+        if not 1 <= frame_number <= len(frame_index):
+            return None
+
+        compositor = self.compositor
+        start = max((number for number in self.snapshots if number <= frame_number), default=0)
+        chain = compositor.get_frame_chain(frame_index, frame_number)
+        continue_current = start <= self.frame_number <= frame_number
+
+        if len(chain) < frame_number - (self.frame_number if continue_current else start):
+            compositor.reset()
+            for number in chain:
+                compositor.apply_frame(self.gif_parser.get_frame(number))
+                self.applied_frames += 1
+            compositor.frame_count = frame_number
+            if frame_number % self.interval == 0:
+                self.store_snapshot(frame_number)
+            return compositor.canvas
+
+        if continue_current:
+            start = self.frame_number
+        elif start:
+            compositor.restore_state(self.snapshots[start])
+            self.snapshots.move_to_end(start)
+        else:
+            compositor.reset()
+        return self.apply_frames(start, frame_number)
+
+    def apply_frames(self, start, frame_number):
+        """
+        Последовательное наложение кадров с сохранением снимков каждого interval-го кадра.
+        :param start: Номер кадра, после которого находится компоновщик.
+        :param frame_number: Номер последнего накладываемого кадра.
+        :return: Холст компоновщика.
+        """
+        compositor = self.compositor
+        for number in range(start + 1, frame_number + 1):
+            compositor.apply_frame(self.gif_parser.get_frame(number))
+            self.applied_frames += 1
+            if number % self.interval == 0:
+                self.store_snapshot(number)
+        return compositor.canvas
+
+    def get_state(self, frame_number):
+        """
+        Состояние компоновщика после наложения кадра.
+        :param frame_number: Номер кадра (0 - состояние до первого кадра).
+        :return: Состояние для GifCompositor.restore_state или None, если кадра нет.
+        """
+        if frame_number == 0:
+            return bytes(len(self.compositor.canvas)), None, None, 0
+        if self.seek(frame_number) is None:
+            return None
+        return self.compositor.save_state()
+
+    def build(self):
+        """
+        Последовательный проход по всем кадрам с сохранением снимков.
+        """
+        frame_count = len(self.get_frame_index())
+        self.compositor.reset()
+        self.apply_frames(0, frame_count)
+
+    def get_frame_index(self):
+        if not self.gif_parser.frame_index:
+            self.gif_parser.scan()
+        return self.gif_parser.frame_index
+
+    def store_snapshot(self, frame_number):
+        """
+        Сохранение снимка текущего состояния с удалением давно использованных снимков
+        при превышении max_memory.
+        :param frame_number: Номер кадра, после которого сделан снимок.
+        """
+        if frame_number in self.snapshots:
+            self.snapshots.move_to_end(frame_number)
+            return
+        state = self.compositor.save_state()
+        self.snapshots[frame_number] = state
+        self.memory += self.get_state_size(state)
+        while self.memory > self.max_memory and self.snapshots:
+            _, evicted = self.snapshots.popitem(last=False)
+            self.memory -= self.get_state_size(evicted)
+
+    def clear(self):
+        """
+        Удаление всех снимков.
+        """
+        self.snapshots.clear()
+        self.memory = 0
+
+    @staticmethod
+    def get_state_size(state):
+        canvas, _, saved_region, _ = state
+        return len(canvas) + sum(len(row) for row in saved_region or ())
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+
+from GifParser.gif_block_reader import GifBlockReader
+from GifParser.gif_parser import GifParser
+from GifStructs.gif_frame import GifFrame
+
+
+class GifStreamParser:
+    def __init__(self, reader, executor=None):
+        """
+        :param reader: Асинхронный источник байтов с методом readexactly(n), как у asyncio.StreamReader.
+        :param executor: Пул для декодирования LZW вне цикла событий (concurrent.futures) или None.
+        """
+        self.reader = reader
+        self.executor = executor
+        self.header = None
+        self.logical_screen_descriptor = None
+        self.global_color_table = None
+        self.frames = []
+        self.frame_index = []
+        self.position = 0
+        self.complete = False
+
+    async def read(self, size):
+        """
+        Чтение ровно size байтов из потока.
+        :param size: Количество байтов.
+        :return: Прочитанные байты.
+        :raises asyncio.IncompleteReadError: Если поток закончился раньше.
+        """
+        data = await self.reader.readexactly(size) if size else b''
+        self.position += size
+        return data
+
+    async def read_sub_blocks(self):
+        """
+        Чтение блока данных вместе с размерами подблоков и завершающим нулевым подблоком.
+        :return: Подблоки в исходном виде (для разбора методами GifParser).
+        """
+        chunks = []
+        while True:
+            size = await self.read(1)
+            chunks.append(size)
+            if size[0] == 0:
+                return b''.join(chunks)
+            chunks.append(await self.read(size[0]))
+
+    async def parse_screen(self):
+        """
+        Чтение заголовка, логического дескриптора экрана и глобальной таблицы цветов.
+        Повторные вызовы ничего не читают.
+        :return: True, если заголовок корректный.
+        """
+        if self.logical_screen_descriptor is None:
+            self.header = GifParser.parse_header(await self.read(6))
+            if self.header is None:
+                return False
+            self.logical_screen_descriptor = GifParser.parse_logical_screen_descriptor(await self.read(7))
+            data = await self.read(GifParser.get_global_color_table_length(self.logical_screen_descriptor))
+            self.global_color_table = GifParser.parse_global_color_table(self.logical_screen_descriptor, data)
+        return self.header is not None
+
+    async def iter_frames(self):
+        """
+        Потоковый асинхронный парсинг: каждый кадр возвращается, как только из потока прочитаны все
+        его блоки, не дожидаясь конца файла. Заголовок, дескриптор экрана и глобальная таблица цветов
+        заполняются до первого кадра. Блоки разбираются теми же методами, что и в GifParser.
+        Если поток обрывается, парсинг завершается на последнем целом кадре.
+        :return: Асинхронный генератор кадров.
+        """
+        try:
+            if not await self.parse_screen():
+                return
+            graphic_control_ext = plain_text_ext = application_ext = comment_ext = None
+            block_offset = self.position
+            while True:
+                try:
+                    block_id = (await self.read(1))[0]
+                except asyncio.IncompleteReadError:
+                    break
+                if block_id == 0x3B:
+                    self.complete = True
+                    break
+                elif block_id == 0x21:
+                    label = await self.read(1)
+                    f = GifBlockReader(label + await self.read_sub_blocks())
+                    graphic_control_ext, plain_text_ext, application_ext, comment_ext = GifParser.parse_extension(f)
+                elif block_id == 0x2C:
+                    frame = await self.read_image(graphic_control_ext, plain_text_ext, application_ext, comment_ext)
+                    self.frame_index.append(GifParser.get_frame_info(len(self.frame_index) + 1, block_offset, frame))
+                    yield frame
+                    graphic_control_ext = plain_text_ext = application_ext = comment_ext = None
+                    block_offset = self.position
+                else:
+                    await self.read_sub_blocks()
+        except asyncio.IncompleteReadError:
+            logging.warning(f"Поток GIF оборвался на байте {self.position}")
+
+    async def read_image(self, graphic_control_ext, plain_text_ext, application_ext, comment_ext):
+        """
+        Чтение дескриптора изображения, локальной таблицы цветов и сжатых данных с декодированием.
+        :return: Кадр.
+        """
+        descriptor_data = await self.read(9)
+        image_descriptor = GifParser.parse_image_descriptor(GifBlockReader(descriptor_data))
+        color_table_data = await self.read(image_descriptor.local_color_table_size * 3)
+        local_ct = GifParser.parse_local_color_table(GifBlockReader(color_table_data), image_descriptor)
+        data_offset = self.position
+        image_data = await self.read(1) + await self.read_sub_blocks()
+
+        if self.executor is None:
+            indices = self.decode_image_data(image_data, image_descriptor)
+        else:
+            loop = asyncio.get_running_loop()
+            indices = await loop.run_in_executor(self.executor, self.decode_image_data, image_data, image_descriptor)
+        return GifFrame(image_descriptor, local_ct, graphic_control_ext, plain_text_ext, application_ext,
+                        comment_ext, indices, data_offset, len(image_data))
+
+    @staticmethod
+    def decode_image_data(image_data, image_descriptor):
+        """
+        Декодирование индексов изображения (может выполняться в другом процессе).
+        :param image_data: Минимальный размер кода LZW и подблоки сжатых данных.
+        :param image_descriptor: Дескриптор изображения.
+        :return: Индексы изображения.
+        """
+        return GifParser.parse_indices(GifBlockReader(image_data), image_descriptor)
+
+    async def parse(self):
+        """
+        Парсинг всего потока с сохранением кадров в self.frames.
+        """
+        async for frame in self.iter_frames():
+            self.frames.append(frame)
+
+
+def parse_stream(reader, executor=None):
+    """
+    Асинхронный парсинг GIF из потока: async for frame in parse_stream(reader).
+    Для доступа к заголовку и дескриптору экрана используйте GifStreamParser напрямую.
+    :param reader: Асинхронный источник байтов с методом readexactly(n), например asyncio.StreamReader.
+    :param executor: Пул для декодирования LZW вне цикла событий или None.
+    :return: Асинхронный генератор кадров.
+    """
+    return GifStreamParser(reader, executor).iter_frames()
@@ -1,20 +1,43 @@
+from GifParser.gif_compositor import GifCompositor
+from GifParser.gif_frame_cache import GifFrameCache
 from GifParser.gif_parser import GifParser
+from GifParser.gif_playback_scheduler import GifPlaybackScheduler
+from GifParser.gif_profiler import profile_count, profile_stage
+from GifParser.gif_seek_index import GifSeekIndex
+import time
 import tkinter as tk
 
 
 class GifViewer:
-    def __init__(self, root, gif_parser: GifParser):
+    def __init__(self, root, gif_parser: GifParser, use_compositor=False, frame_cache_memory=64 * 1024 * 1024):
+        """
+        :param root: Окно tkinter.
+        :param gif_parser: Парсер GIF файла с разобранными кадрами.
+        :param use_compositor: Собирать кадры через GifCompositor.
+        :param frame_cache_memory: Объём памяти в байтах для готовых кадров в режиме GifCompositor
+                                   (0 - кадры не кэшируются).
+        """
         self.root = root
         self.gif_parser = gif_parser
         self.current_frame_idx = 0
+        self.use_compositor = use_compositor
+        self.compositor = GifCompositor(gif_parser.logical_screen_descriptor, gif_parser.global_color_table)
+        self.seek_index = None
+        self.frame_cache = GifFrameCache(frame_cache_memory)
+        self.scheduler = None
+        self._composited_frame_idx = -1
 
         self.width = gif_parser.logical_screen_descriptor.width
         self.height = gif_parser.logical_screen_descriptor.height
 
-        self.checkerboard = self._create_checkerboard(self.width, self.height)
+        self.checkerboard = None
+        self.base_image = None
+        if not use_compositor:
+            self.checkerboard = self._create_checkerboard(self.width, self.height)
+            self.base_image = [row.copy() for row in self.checkerboard]
+        self._checkerboard_rgb = None
         self._configure_root_window(root)
         self._create_ui_components()
-        self.base_image = [row.copy() for row in self.checkerboard]
         self.previous_images_stack = []
 
     def _configure_root_window(self, root):
@@ -61,21 +84,72 @@ class GifViewer:
 
     def animate(self):
         """
-        Анимация GIF-изображения.
+        Анимация GIF-изображения. Время показа кадров задаёт GifPlaybackScheduler: задержки
+        переводятся из сотых долей секунды в миллисекунды и отсчитываются по абсолютной шкале,
+        в режиме GifCompositor отстающие кадры пропускаются. Статистика - в self.scheduler.get_stats().
         """
         frame = self.gif_parser.frames[self.current_frame_idx]
-        delay = frame.graphic_control_extension.delay_time if frame.graphic_control_extension else 100
+        if self.scheduler is None:
+            self.scheduler = GifPlaybackScheduler(GifPlaybackScheduler.get_frame_delays(self.gif_parser.frames),
+                                                  drop_frames=self.use_compositor)
 
-        self._process_disposal()
-        self._apply_frame(frame)
-        self._update_photo()
+        start = time.perf_counter()
+        if self.use_compositor:
+            self._show_composited_frame(self.current_frame_idx)
+        else:
+            self._process_disposal()
+            self._apply_frame(frame)
+            self._update_photo()
+        self.scheduler.frame_shown(self.current_frame_idx, time.perf_counter() - start)
 
         if len(self.gif_parser.frames) > 1:
-            if self.current_frame_idx == len(self.gif_parser.frames) - 1:
+            if self.current_frame_idx == len(self.gif_parser.frames) - 1 and not self.use_compositor:
                 self._clear_image(frame.image_descriptor)
-            self.current_frame_idx = (self.current_frame_idx + 1) % len(self.gif_parser.frames)
+            self.current_frame_idx, delay = self.scheduler.next_frame()
             self.root.after(delay, self.animate)
 
+    def seek(self, frame_idx):
+        """
+        Переход к произвольному кадру: холст собирается через индекс перехода (GifSeekIndex)
+        не более чем за interval наложений кадров. Дальнейшая анимация продолжается через GifCompositor.
+        :param frame_idx: Индекс кадра (начиная с 0).
+        """
+        if not 0 <= frame_idx < len(self.gif_parser.frames):
+            return
+        self.use_compositor = True
+        self._show_composited_frame(frame_idx)
+        self.current_frame_idx = (frame_idx + 1) % len(self.gif_parser.frames)
+
+    def _show_composited_frame(self, frame_idx):
+        """
+        Показ кадра в режиме GifCompositor. Готовые кадры берутся из кэша (после первого
+        прохода анимации изображения только переключаются; если анимация не помещается в кэш,
+        в нём остаются первые кадры), остальные собираются на холсте и сохраняются в кэш. Если холст находится не на предыдущем кадре, его состояние
+        восстанавливается через индекс перехода (GifSeekIndex), который работает на том же компоновщике.
+        :param frame_idx: Индекс кадра (начиная с 0).
+        """
+        photo = self.frame_cache.get(frame_idx)
+        if photo is None:
+            region = None
+            if self._composited_frame_idx != frame_idx - 1:
+                if self.seek_index is None:
+                    self.seek_index = GifSeekIndex(self.gif_parser, compositor=self.compositor)
+                if frame_idx == 0:
+                    self.compositor.reset()
+                elif 0 <= frame_idx - 1 - self._composited_frame_idx < self.seek_index.interval:
+                    region = self._skip_composited_frames(frame_idx)
+                else:
+                    self.seek_index.seek(frame_idx)
+                    self.compositor.invalidate()
+            self._apply_composited_frame(self.gif_parser.frames[frame_idx], region)
+            self._composited_frame_idx = frame_idx
+            photo = self.photo
+            size = self.width * self.height * 4
+            if self.frame_cache.can_store(size):
+                self.frame_cache.put(frame_idx, self.photo.copy(), size)
+        with profile_stage("tk_render"):
+            self.canvas.itemconfigure(self.image_id, image=photo)
+
     def _calculate_window_size(self, screen_width, screen_height):
         """
         Вычисление размера окна tkinter.
@@ -165,9 +239,98 @@ class GifViewer:
                 color = f"#{rgb[0]:02X}{rgb[1]:02X}{rgb[2]:02X}"
                 self.base_image[top + y][left + x] = color
 
+    def _apply_composited_frame(self, frame, region=None):
+        """
+        Наложение кадра через GifCompositor и отрисовка только изменённой области холста.
+        :param frame: Кадр.
+        :param region: Область, изменённая пропущенными кадрами и ещё не отрисованная, или None.
+        """
+        canvas = self.compositor.apply_frame(frame)
+        self._render_region(canvas, GifCompositor.get_union_region(self.compositor.dirty_region, region))
+
+    def _skip_composited_frames(self, frame_idx):
+        """
+        Наложение пропущенных кадров между собранным и показываемым кадром без отрисовки.
+        :param frame_idx: Индекс показываемого кадра.
+        :return: Объединение изменённых пропущенными кадрами областей или None.
+        """
+        region = None
+        for idx in range(self._composited_frame_idx + 1, frame_idx):
+            self.compositor.apply_frame(self.gif_parser.frames[idx])
+            region = GifCompositor.get_union_region(self.compositor.dirty_region, region)
+        return region
+
+    def _render_region(self, canvas, region):
+        """
+        Перенос области холста в изображение: область передаётся в tkinter одним
+        бинарным PPM-изображением и копируется в нужное место.
+        :param canvas: Холст RGBA размером с логический экран.
+        :param region: Координаты области (x0, y0, x1, y1).
+        """
+        x0, y0, x1, y1 = region
+        if x1 <= x0 or y1 <= y0:
+            return
+        if self._checkerboard_rgb is None:
+            self._checkerboard_rgb = self.get_checkerboard_rgb(self.width, self.height)
+        with profile_stage("ppm_encode"):
+            ppm_data = self.get_ppm_data(canvas, self.width, region, self._checkerboard_rgb)
+        with profile_stage("tk_render"):
+            patch = tk.PhotoImage(master=self.root, data=ppm_data, format="PPM")
+            self.photo.tk.call(self.photo.name, "copy", patch.name, "-to", x0, y0)
+        profile_count("frames_rendered")
+
+    @staticmethod
+    def get_checkerboard_rgb(width, height):
+        """
+        Шахматка в виде пикселей RGB подряд.
+        :param width: Ширина.
+        :param height: Высота.
+        :return: Пиксели шахматки.
+        """
+        color1, color2 = b'\xC8\xC8\xC8', b'\x64\x64\x64'
+        rows = [b''.join(color1 if (x // 10 + parity) % 2 == 0 else color2 for x in range(width))
+                for parity in (0, 1)]
+        return b''.join(rows[(y // 10) % 2] for y in range(height))
+
+    @staticmethod
+    def get_ppm_data(canvas, width, region, background):
+        """
+        Построение бинарного PPM-изображения из области холста: каналы RGB копируются срезами,
+        прозрачные пиксели заменяются фоном с помощью битовой маски на всю область.
+        :param canvas: Холст RGBA.
+        :param width: Ширина холста.
+        :param region: Координаты области (x0, y0, x1, y1).
+        :param background: Фон (пиксели RGB размером с холст).
+        :return: Данные PPM (P6).
+        """
+        x0, y0, x1, y1 = region
+        rgba_row_size = (x1 - x0) * 4
+        rgb_row_size = (x1 - x0) * 3
+        rgba = b''.join(canvas[(y * width + x0) * 4:(y * width + x0) * 4 + rgba_row_size] for y in range(y0, y1))
+
+        rgb = bytearray(len(rgba) // 4 * 3)
+        for channel in range(3):
+            rgb[channel::3] = rgba[channel::4]
+        alpha = rgba[3::4]
+        if alpha.count(0):
+            back = b''.join(background[(y * width + x0) * 3:(y * width + x0) * 3 + rgb_row_size]
+                            for y in range(y0, y1))
+            mask = bytearray(len(rgb))
+            for channel in range(3):
+                mask[channel::3] = alpha
+            mask_value = int.from_bytes(mask, 'little')
+            rgb_value = ((int.from_bytes(rgb, 'little') & mask_value) |
+                         (int.from_bytes(back, 'little') & ~mask_value))
+            rgb = rgb_value.to_bytes(len(rgb), 'little')
+
+        header = f"P6\n{x1 - x0} {y1 - y0}\n255\n".encode('ascii')
+        return header + bytes(rgb)
+
     def _update_photo(self):
         """
         Обновление canvas-изображения.
         """
-        rows_str = ["{" + " ".join(row) + "}" for row in self.base_image]
-        self.photo.put("\n".join(rows_str))
+        with profile_stage("tk_render"):
+            rows_str = ["{" + " ".join(row) + "}" for row in self.base_image]
+            self.photo.put("\n".join(rows_str))
+        profile_count("frames_rendered")
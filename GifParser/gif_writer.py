@@ -0,0 +1,166 @@
+import struct
+
+from GifParser.gif_parser import GifParser
+from GifParser.lzw_compressor import LZWCompressor
+
+
+class GifWriter:
+    def __init__(self, header, logical_screen_descriptor, global_color_table=None, frames=()):
+        """
+        :param header: Заголовок GIF файла.
+        :param logical_screen_descriptor: Логический дескриптор экрана.
+        :param global_color_table: Глобальная таблица цветов или None.
+        :param frames: Кадры (GifFrame) с индексами в построчном порядке.
+        """
+        self.header = header
+        self.logical_screen_descriptor = logical_screen_descriptor
+        self.global_color_table = global_color_table
+        self.frames = list(frames)
+
+    @classmethod
+    def from_parser(cls, gif_parser):
+        """
+        Создание записи из разобранного файла.
+        :param gif_parser: Парсер с разобранными кадрами.
+        :return: Объект записи GIF файла.
+        """
+        return cls(gif_parser.header, gif_parser.logical_screen_descriptor,
+                   gif_parser.global_color_table, gif_parser.frames)
+
+    def write(self, filename):
+        """
+        Запись GIF файла.
+        :param filename: Путь к файлу.
+        """
+        with open(filename, 'wb') as f:
+            f.write(self.to_bytes())
+
+    def to_bytes(self):
+        """
+        Сериализация заголовка, дескриптора экрана, глобальной таблицы цветов и кадров.
+        :return: Содержимое GIF файла.
+        """
+        screen = self.logical_screen_descriptor
+        data = bytearray(self.get_header_data(self.header))
+        data += struct.pack('<HHBBB', screen.width, screen.height, screen.packed,
+                            screen.bg_color_index, screen.pixel_aspect_ratio)
+        if screen.global_color_table_flag:
+            data += self.get_color_table_data(self.global_color_table, screen.global_color_table_size)
+        for frame in self.frames:
+            data += self.get_frame_data(frame, self.global_color_table)
+        data.append(0x3B)
+        return bytes(data)
+
+    @staticmethod
+    def get_header_data(header):
+        return (header.signature + header.version).encode('ascii')
+
+    @staticmethod
+    def get_color_table_data(color_table, size):
+        """
+        Таблица цветов в байтовом формате, дополненная чёрными цветами до размера из дескриптора.
+        :param color_table: Таблица цветов или None.
+        :param size: Количество цветов.
+        :return: Данные таблицы цветов.
+        """
+        colors = color_table.colors[:size] if color_table else []
+        data = bytearray()
+        for r, g, b in colors:
+            data += bytes((r, g, b))
+        data += bytes((size - len(colors)) * 3)
+        return data
+
+    @staticmethod
+    def get_frame_data(frame, global_color_table=None):
+        """
+        Блоки кадра: расширения, дескриптор изображения, локальная таблица цветов и сжатые индексы.
+        :param frame: Кадр.
+        :param global_color_table: Глобальная таблица цветов (определяет минимальный размер кода LZW).
+        :return: Данные кадра.
+        """
+        data = bytearray()
+        if frame.application_ext:
+            data += GifWriter.get_application_extension_data(frame.application_ext)
+        if frame.comment_ext:
+            data += GifWriter.get_comment_extension_data(frame.comment_ext)
+        if frame.graphic_control_extension:
+            data += GifWriter.get_graphic_control_extension_data(frame.graphic_control_extension)
+        if frame.plain_text_ext:
+            data += GifWriter.get_plain_text_extension_data(frame.plain_text_ext)
+
+        descriptor = frame.image_descriptor
+        data.append(0x2C)
+        data += struct.pack('<HHHHB', descriptor.left, descriptor.top, descriptor.width, descriptor.height,
+                            descriptor.packed)
+        if descriptor.local_color_table_flag:
+            data += GifWriter.get_color_table_data(frame.local_color_table, descriptor.local_color_table_size)
+
+        color_table = frame.local_color_table or global_color_table
+        min_code_size = GifWriter.get_min_code_size(color_table, frame.image_data)
+        indices = bytes(frame.image_data[:descriptor.width * descriptor.height])
+        if descriptor.interlace_flag:
+            indices = GifWriter.interlace(indices, descriptor.width, descriptor.height)
+        data.append(min_code_size)
+        data += GifWriter.get_sub_blocks_data(LZWCompressor(min_code_size, indices).compress())
+        return data
+
+    @staticmethod
+    def get_min_code_size(color_table, indices):
+        """
+        Минимальный размер кода LZW: число бит для индексов таблицы цветов (не меньше 2).
+        :param color_table: Таблица цветов или None.
+        :param indices: Индексы цветов (используются, если таблицы нет).
+        :return: Минимальный размер кода.
+        """
+        max_index = len(color_table.colors) - 1 if color_table and color_table.colors else max(indices, default=0)
+        return max(2, max_index.bit_length())
+
+    @staticmethod
+    def interlace(indices, width, height):
+        """
+        Перестановка строк в порядок хранения изображения с чересстрочной развёрткой.
+        :param indices: Индексы в построчном порядке.
+        :param width: Ширина изображения.
+        :param height: Высота изображения.
+        :return: Индексы в порядке хранения.
+        """
+        return b''.join(indices[row * width:(row + 1) * width] for row in GifParser.get_interlaced_row_map(height))
+
+    @staticmethod
+    def get_sub_blocks_data(data):
+        """
+        Разбиение данных на подблоки по 255 байт с завершающим нулевым блоком.
+        :param data: Данные.
+        :return: Данные в формате подблоков GIF.
+        """
+        result = bytearray()
+        for i in range(0, len(data), 255):
+            chunk = data[i:i + 255]
+            result.append(len(chunk))
+            result += chunk
+        result.append(0)
+        return result
+
+    @staticmethod
+    def get_graphic_control_extension_data(gce):
+        packed = (gce.disposal_method << 2) | (gce.user_input_flag << 1) | gce.transparency_flag
+        return b'\x21\xF9\x04' + struct.pack('<BHB', packed, gce.delay_time, gce.transparent_color_index) + b'\x00'
+
+    @staticmethod
+    def get_application_extension_data(application_ext):
+        app_data = (application_ext.application_id.ljust(8)[:8] +
+                    application_ext.authentication_code.ljust(3)[:3]).encode('ascii', errors='replace')
+        return b'\x21\xFF\x0B' + app_data + GifWriter.get_sub_blocks_data(application_ext.data)
+
+    @staticmethod
+    def get_comment_extension_data(comment_ext):
+        return b'\x21\xFE' + GifWriter.get_sub_blocks_data(comment_ext.comment.encode('ascii', errors='replace'))
+
+    @staticmethod
+    def get_plain_text_extension_data(plain_text_ext):
+        # Порядок полей совпадает с порядком аргументов, переданных парсером в GifPlainTextExtension.
+        pte = plain_text_ext
+        pte_data = struct.pack('<HHHHBBBB', pte.left_pos, pte.top_pos, pte.height, pte.width, pte.cell_width,
+                               pte.cell_height, pte.foreground_color_index, pte.background_color_index)
+        text_data = pte.text_data.encode('ascii', errors='replace')
+        return b'\x21\x01\x0C' + pte_data + GifWriter.get_sub_blocks_data(text_data)
@@ -0,0 +1,88 @@
+from GifParser.lzw_decompressor import MAX_CODE_SIZE, MAX_TABLE_SIZE
+
+
+class LZWCompressor:
+    def __init__(self, min_code_size, data):
+        """
+        :param min_code_size: Минимальный размер кода LZW (от 2 до 8).
+        :param data: Индексы цветов (bytes, bytearray или список чисел).
+        """
+        self.min_code_size = min_code_size
+        self.data = data
+
+    def compress(self):
+        """
+        Сжатие индексов в поток кодов LZW (без разбиения на подблоки).
+        Таблица строк - хэш-таблица с целочисленными ключами (код префикса << 8 | индекс),
+        то есть префиксное дерево, где каждая строка задаётся кодом префикса и последним символом.
+        Когда таблица заполнена, выводится код очистки.
+        :return: Сжатые данные.
+        """
+        min_code_size = self.min_code_size
+        clear_code = 1 << min_code_size
+        end_code = clear_code + 1
+        first_code = end_code + 1
+
+        out = bytearray()
+        bit_buffer = clear_code
+        bits_in_buffer = code_size = min_code_size + 1
+        next_code = first_code
+        next_limit = 1 << code_size
+        table = {}
+
+        data = self.data
+        if not data:
+            bit_buffer |= end_code << bits_in_buffer
+            bits_in_buffer += code_size
+            return self.flush_bits(out, bit_buffer, bits_in_buffer)
+
+        indices = iter(data)
+        prefix = next(indices)
+        table_get = table.get
+        for index in indices:
+            key = (prefix << 8) | index
+            code = table_get(key)
+            if code is not None:
+                prefix = code
+                continue
+
+            bit_buffer |= prefix << bits_in_buffer
+            bits_in_buffer += code_size
+            if bits_in_buffer >= 32:
+                out += (bit_buffer & 0xFFFFFFFF).to_bytes(4, 'little')
+                bit_buffer >>= 32
+                bits_in_buffer -= 32
+
+            if next_code < MAX_TABLE_SIZE:
+                table[key] = next_code
+                next_code += 1
+                if next_code > next_limit and code_size < MAX_CODE_SIZE:
+                    code_size += 1
+                    next_limit <<= 1
+            else:
+                bit_buffer |= clear_code << bits_in_buffer
+                bits_in_buffer += code_size
+                table = {}
+                table_get = table.get
+                code_size = min_code_size + 1
+                next_limit = 1 << code_size
+                next_code = first_code
+            prefix = index
+
+        bit_buffer |= prefix << bits_in_buffer
+        bits_in_buffer += code_size
+        bit_buffer |= end_code << bits_in_buffer
+        bits_in_buffer += code_size
+        return self.flush_bits(out, bit_buffer, bits_in_buffer)
+
+    @staticmethod
+    def flush_bits(out, bit_buffer, bits_in_buffer):
+        """
+        Запись оставшихся битов буфера.
+        :param out: Сжатые данные.
+        :param bit_buffer: Буфер битов.
+        :param bits_in_buffer: Количество битов в буфере.
+        :return: Сжатые данные.
+        """
+        out += bit_buffer.to_bytes((bits_in_buffer + 7) // 8, 'little')
+        return bytes(out)
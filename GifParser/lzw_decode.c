@@ -0,0 +1,126 @@
+/*
+ * Декодер LZW для GIF, подключаемый через ctypes (см. GifParser/lzw_decompressor.py).
+ *
+ * Сборка:
+ *   Linux/macOS: cc -O2 -shared -fPIC -o GifParser/_lzw_decode.so GifParser/lzw_decode.c
+ *   Windows:     cl /O2 /LD GifParser\lzw_decode.c /Fe:GifParser\_lzw_decode.dll
+ *
+ * Алгоритм совпадает с табличным движком LZWDecompressor.decode_table:
+ * каждый код словаря хранится как смещение и длина строки в выходном буфере.
+ */
+#include <stddef.h>
+#include <string.h>
+
+#if defined(_WIN32)
+#define LZW_EXPORT __declspec(dllexport)
+#else
+#define LZW_EXPORT
+#endif
+
+#define MAX_TABLE_SIZE 4096
+#define MAX_CODE_SIZE 12
+
+/*
+ * Декодирует data в out.
+ * Возвращает число записанных байт. Если вывод не поместился в out_cap,
+ * в *truncated записывается 1 (декодирование прекращается).
+ */
+LZW_EXPORT size_t lzw_decode(const unsigned char *data, size_t data_len, int min_code_size,
+                             unsigned char *out, size_t out_cap, int *truncated)
+{
+    size_t offsets[MAX_TABLE_SIZE];
+    size_t lengths[MAX_TABLE_SIZE];
+
+    unsigned int clear_code, end_code, next_code, code_mask, code;
+    int code_size;
+    size_t pos = 0, prev_pos = 0, prev_len = 0, length, start;
+    size_t data_pos = 0;
+    unsigned long bit_buffer = 0;
+    int bits_in_buffer = 0;
+
+    *truncated = 0;
+    if (min_code_size < 1 || min_code_size > 11) {
+        return 0;
+    }
+
+    clear_code = 1u << min_code_size;
+    end_code = clear_code + 1;
+    code_size = min_code_size + 1;
+    code_mask = (1u << code_size) - 1;
+    next_code = end_code + 1;
+
+    for (;;) {
+        while (bits_in_buffer < code_size && data_pos < data_len) {
+            bit_buffer |= (unsigned long)data[data_pos++] << bits_in_buffer;
+            bits_in_buffer += 8;
+        }
+        if (bits_in_buffer < code_size) {
+            break;
+        }
+
+        code = (unsigned int)(bit_buffer & code_mask);
+        bit_buffer >>= code_size;
+        bits_in_buffer -= code_size;
+
+        if (code == clear_code) {
+            code_size = min_code_size + 1;
+            code_mask = (1u << code_size) - 1;
+            next_code = end_code + 1;
+            prev_len = 0;
+            continue;
+        }
+        if (code == end_code) {
+            break;
+        }
+
+        if (code < clear_code) {
+            length = 1;
+        } else if (code < next_code) {
+            length = lengths[code];
+        } else if (code == next_code && prev_len > 0) {
+            length = prev_len + 1;
+        } else {
+            break;
+        }
+
+        if (pos + length > out_cap) {
+            length = out_cap - pos;
+            if (code < clear_code) {
+                if (length > 0) {
+                    out[pos] = (unsigned char)code;
+                }
+            } else {
+                start = code < next_code ? offsets[code] : prev_pos;
+                memmove(out + pos, out + start, length);
+            }
+            pos = out_cap;
+            *truncated = 1;
+            break;
+        }
+
+        if (code < clear_code) {
+            out[pos] = (unsigned char)code;
+        } else if (code < next_code) {
+            memmove(out + pos, out + offsets[code], length);
+        } else {
+            memmove(out + pos, out + prev_pos, prev_len);
+            out[pos + prev_len] = out[prev_pos];
+        }
+
+        if (prev_len > 0 && next_code < MAX_TABLE_SIZE) {
+            offsets[next_code] = prev_pos;
+            lengths[next_code] = prev_len + 1;
+            next_code++;
+            if (next_code > code_mask && code_size < MAX_CODE_SIZE) {
+                code_size++;
+                code_mask = (1u << code_size) - 1;
+            }
+        }
+
+        prev_pos = pos;
+        prev_len = length;
+        pos += length;
+    }
+
+    return pos;
+}
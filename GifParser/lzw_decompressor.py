@@ -1,11 +1,211 @@
+import ctypes
+import os
+import sys
+
+from GifParser.gif_profiler import profile_count, profile_unavailable
+
+MAX_TABLE_SIZE = 4096
+MAX_CODE_SIZE = 12
+
+
+class LZWStreamDecoder:
+    def __init__(self, min_code_size, pixel_count=None, capacity=MAX_TABLE_SIZE):
+        """
+        :param min_code_size: Минимальный размер кода LZW.
+        :param pixel_count: Количество пикселей (размер выходного буфера) или None.
+        :param capacity: Начальный размер выходного буфера, если pixel_count не задан.
+        """
+        self.min_code_size = min_code_size
+        self.pixel_count = pixel_count
+        self.clear_code = 1 << min_code_size
+        self.end_code = self.clear_code + 1
+        self.offsets = [0] * MAX_TABLE_SIZE
+        self.lengths = [0] * MAX_TABLE_SIZE
+        self.out = bytearray(pixel_count if pixel_count is not None else capacity)
+        self.pos = 0
+        self.code_size = min_code_size + 1
+        self.next_code = self.end_code + 1
+        self.prev_pos = self.prev_len = -1
+        self.bit_buffer = self.bits_in_buffer = 0
+        self.done = False
+        self.resets = 0
+        self._codes = 0
+
+    def feed(self, data):
+        """
+        Декодирование очередной части сжатых данных. Состояние декодера (буфер битов, таблица
+        и позиция в выходном буфере) сохраняется между вызовами, поэтому данные можно
+        разбивать на части в любом месте, в том числе посреди кода.
+        Каждый код словаря хранится как смещение и длина уже декодированной строки
+        в выходном буфере, поэтому новая запись словаря не копируется,
+        а вывод строки - это копирование среза внутри bytearray.
+        :param data: Сжатые данные (без размеров подблоков).
+        :return: Количество декодированных пикселей.
+        """
+        if self.done:
+            return self.pos
+        data_len = len(data)
+        clear_code, end_code = self.clear_code, self.end_code
+        offsets, lengths = self.offsets, self.lengths
+
+        limit = self.pixel_count
+        out = self.out
+        capacity = len(out)
+        pos = self.pos
+
+        code_size = self.code_size
+        code_mask = (1 << code_size) - 1
+        next_code = self.next_code
+        prev_pos, prev_len = self.prev_pos, self.prev_len
+
+        bit_buffer, bits_in_buffer = self.bit_buffer, self.bits_in_buffer
+        # Коды, не добавившие запись в таблицу (остальные считаются по next_code).
+        codes = self._codes
+        data_pos = 0
+        done = False
+
+        while True:
+            while bits_in_buffer < code_size and data_pos < data_len:
+                bit_buffer |= data[data_pos] << bits_in_buffer
+                data_pos += 1
+                bits_in_buffer += 8
+            if bits_in_buffer < code_size:
+                break
+
+            code = bit_buffer & code_mask
+            bit_buffer >>= code_size
+            bits_in_buffer -= code_size
+
+            if code == clear_code:
+                codes += next_code - end_code - 1
+                self.resets += 1
+                code_size = self.min_code_size + 1
+                code_mask = (1 << code_size) - 1
+                next_code = end_code + 1
+                prev_pos = prev_len = -1
+                continue
+            if code == end_code:
+                done = True
+                break
+
+            if code < clear_code:
+                length = 1
+            elif code < next_code:
+                length = lengths[code]
+            elif code == next_code and prev_len > 0:
+                length = prev_len + 1
+            else:
+                done = True
+                break
+
+            if pos + length > capacity:
+                if limit is not None:
+                    length = capacity - pos
+                    if code < clear_code and length > 0:
+                        out[pos] = code
+                    elif length > 0:
+                        start = offsets[code] if code < next_code else prev_pos
+                        out[pos:capacity] = out[start:start + length]
+                    pos = capacity
+                    codes += 1
+                    done = True
+                    break
+                out.extend(bytes(max(capacity, length)))
+                capacity = len(out)
+
+            if code < clear_code:
+                out[pos] = code
+            elif code < next_code:
+                start = offsets[code]
+                out[pos:pos + length] = out[start:start + length]
+            else:
+                out[pos:pos + prev_len] = out[prev_pos:prev_pos + prev_len]
+                out[pos + prev_len] = out[prev_pos]
+
+            if prev_len > 0 and next_code < MAX_TABLE_SIZE:
+                offsets[next_code] = prev_pos
+                lengths[next_code] = prev_len + 1
+                next_code += 1
+                if next_code > code_mask and code_size < MAX_CODE_SIZE:
+                    code_size += 1
+                    code_mask = (1 << code_size) - 1
+            else:
+                codes += 1
+
+            prev_pos, prev_len = pos, length
+            pos += length
+
+        self.pos = pos
+        self.code_size, self.next_code = code_size, next_code
+        self.prev_pos, self.prev_len = prev_pos, prev_len
+        self.bit_buffer, self.bits_in_buffer = bit_buffer, bits_in_buffer
+        self._codes = codes
+        self.done = done
+        return pos
+
+    @property
+    def codes(self):
+        """
+        Количество декодированных кодов данных (без кодов очистки и конца данных).
+        """
+        return self._codes + self.next_code - self.end_code - 1
+
+    def finish(self):
+        """
+        Завершение декодирования.
+        :return: Декодированные индексы в виде bytearray (размером pixel_count, если он задан).
+        """
+        self.done = True
+        if self.pixel_count is None:
+            del self.out[self.pos:]
+        return self.out
+
+
 class LZWDecompressor:
-    def __init__(self, min_code_size, data):
+    ENGINES = ("table", "dict")
+
+    def __init__(self, min_code_size, data, pixel_count=None, engine="table"):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Неизвестный движок LZW: {engine}")
         self.min_code_size = min_code_size
         self.data = data
+        self.pixel_count = pixel_count
+        self.engine = engine
 
     def decode(self):
         """
         Декодирование данных из LZW.
+        :return: Декодированные индексы цветов (bytearray, по байту на пиксель).
+        """
+        if self.engine == "dict":
+            self.mark_counters_unavailable()
+            return bytearray(self.decode_dict())
+        return self.decode_table()
+
+    def decode_table(self):
+        """
+        Декодирование данных из LZW с помощью таблиц фиксированного размера (см. LZWStreamDecoder).
+        :return: Декодированные индексы в виде bytearray.
+        """
+        data = bytes(self.data)
+        decoder = LZWStreamDecoder(self.min_code_size, self.pixel_count, max(len(data) * 2, MAX_TABLE_SIZE))
+        decoder.feed(data)
+        profile_count("lzw_codes", decoder.codes)
+        profile_count("lzw_dictionary_resets", decoder.resets)
+        return decoder.finish()
+
+    @staticmethod
+    def mark_counters_unavailable():
+        """
+        Отметка счётчиков кодов LZW как недоступных для декодеров, которые их не считают.
+        """
+        profile_unavailable("lzw_codes")
+        profile_unavailable("lzw_dictionary_resets")
+
+    def decode_dict(self):
+        """
+        Декодирование данных из LZW с помощью словаря списков.
+        Исходная реализация, оставлена для сверки результатов табличного движка.
         :return: Список декодированных числовых данных.
         """
         params = self.initialize_parameters()
@@ -43,7 +243,7 @@ class LZWDecompressor:
         end_code = clear_code + 1
         code_size = self.min_code_size + 1
         next_code = end_code + 1
-        max_code_size = 12
+        max_code_size = MAX_CODE_SIZE
 
         return {
             'clear_code': clear_code,
@@ -62,7 +262,7 @@ class LZWDecompressor:
         end_code = (1 << self.min_code_size) + 1
         code_size = self.min_code_size + 1
         next_code = (1 << self.min_code_size) + 2
-        max_code_size = 12
+        max_code_size = MAX_CODE_SIZE
 
         return {
             'clear_code': clear_code,
@@ -129,3 +329,71 @@ class LZWDecompressor:
 
         old_code = current_code
         return entry, dictionary, params, old_code
+
+
+def _load_c_library(path=None):
+    """
+    Загрузка скомпилированного декодера LZW (GifParser/lzw_decode.c).
+    Переменная окружения GIF_PARSER_LZW_BACKEND=python отключает C-декодер.
+    :param path: Путь к библиотеке (по умолчанию - собранная рядом с модулем).
+    :return: Библиотека ctypes, если она собрана, иначе None.
+    """
+    if path is None:
+        if os.environ.get("GIF_PARSER_LZW_BACKEND", "").lower() == "python":
+            return None
+        library_name = "_lzw_decode.dll" if sys.platform == "win32" else "_lzw_decode.so"
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), library_name)
+    if not os.path.isfile(path):
+        return None
+
+    try:
+        library = ctypes.CDLL(path)
+    except OSError:
+        return None
+
+    library.lzw_decode.argtypes = [ctypes.c_char_p, ctypes.c_size_t, ctypes.c_int,
+                                   ctypes.c_void_p, ctypes.c_size_t, ctypes.POINTER(ctypes.c_int)]
+    library.lzw_decode.restype = ctypes.c_size_t
+    return library
+
+
+_c_library = _load_c_library()
+
+
+class CLZWDecompressor(LZWDecompressor):
+    def decode_table(self):
+        """
+        Декодирование данных из LZW скомпилированным декодером.
+        Результат совпадает с LZWDecompressor.decode_table.
+        :return: Декодированные индексы в виде bytearray.
+        """
+        if not 1 <= self.min_code_size < MAX_CODE_SIZE:
+            return super().decode_table()
+
+        self.mark_counters_unavailable()
+        data = bytes(self.data)
+        limit = self.pixel_count
+        capacity = limit if limit is not None else max(len(data) * 2, MAX_TABLE_SIZE)
+        truncated = ctypes.c_int(0)
+
+        while True:
+            out = bytearray(capacity)
+            out_buffer = (ctypes.c_char * capacity).from_buffer(out) if capacity else None
+            written = _c_library.lzw_decode(data, len(data), self.min_code_size,
+                                            out_buffer, capacity, ctypes.byref(truncated))
+            del out_buffer
+            if limit is not None or not truncated.value:
+                break
+            capacity *= 2
+
+        if limit is None:
+            del out[written:]
+        return out
+
+
+BACKENDS = {"python": LZWDecompressor}
+if _c_library is not None:
+    BACKENDS["c"] = CLZWDecompressor
+
+DEFAULT_BACKEND = "c" if "c" in BACKENDS else "python"
+Decompressor = BACKENDS[DEFAULT_BACKEND]
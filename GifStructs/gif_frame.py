@@ -1,13 +1,35 @@
 class GifFrame:
     def __init__(self, image_descriptor, local_color_table, graphic_control_ext, plain_text_ext,
-                 application_ext, comment_ext, image_data):
+                 application_ext, comment_ext, image_data, data_offset=None, data_length=None,
+                 image_data_loader=None):
         self.image_descriptor = image_descriptor
         self.local_color_table = local_color_table
         self.graphic_control_extension = graphic_control_ext
         self.plain_text_ext = plain_text_ext
         self.application_ext = application_ext
         self.comment_ext = comment_ext
-        self.image_data = image_data
+        self.data_offset = data_offset
+        self.data_length = data_length
+        self._image_data = bytearray(image_data) if isinstance(image_data, list) else image_data
+        self._image_data_loader = image_data_loader
+
+    @property
+    def image_data(self):
+        if self._image_data is None and self._image_data_loader is not None:
+            self._image_data = self._image_data_loader(self)
+        return self._image_data
+
+    @image_data.setter
+    def image_data(self, value):
+        self._image_data = bytearray(value) if isinstance(value, list) else value
+
+    @property
+    def indices_list(self):
+        return list(self.image_data) if self.image_data is not None else None
+
+    @property
+    def is_decoded(self):
+        return self._image_data is not None
 
     def __str__(self):
         return (f"{self.image_descriptor}\n"
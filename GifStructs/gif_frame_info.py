@@ -0,0 +1,36 @@
+class GifFrameInfo:
+    def __init__(self, number, block_offset, data_offset, data_length, left, top, width, height,
+                 interlaced, local_color_table_size, delay_time, disposal_method, transparent_color_index):
+        self.number = number
+        self.block_offset = block_offset
+        self.data_offset = data_offset
+        self.data_length = data_length
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+        self.interlaced = interlaced
+        self.local_color_table_size = local_color_table_size
+        self.delay_time = delay_time
+        self.disposal_method = disposal_method
+        self.transparent_color_index = transparent_color_index
+
+    def __str__(self):
+        return (f"Кадр {self.number}: ({self.left}, {self.top}) {self.width}x{self.height} px, "
+                f"данные: {self.data_length} байт со смещения {self.data_offset}, "
+                f"задержка: {self.delay_time * 10} мс, метод обработки: {self.disposal_method}")
+
+    def __eq__(self, other):
+        return (self.number == other.number and
+                self.block_offset == other.block_offset and
+                self.data_offset == other.data_offset and
+                self.data_length == other.data_length and
+                self.left == other.left and
+                self.top == other.top and
+                self.width == other.width and
+                self.height == other.height and
+                self.interlaced == other.interlaced and
+                self.local_color_table_size == other.local_color_table_size and
+                self.delay_time == other.delay_time and
+                self.disposal_method == other.disposal_method and
+                self.transparent_color_index == other.transparent_color_index)
@@ -0,0 +1,33 @@
+import random
+import unittest
+
+from Benchmarks.gif_benchmark import run_benchmarks
+from Benchmarks.synthetic_gifs import make_frame_indices, make_gif
+from GifParser.gif_parser import GifParser
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_synthetic_gif(self):
+        data = make_gif(40, 30, frame_count=3, colors=16, seed=5)
+        gif_parser = GifParser(data)
+        gif_parser.parse()
+
+        rng = random.Random(5)
+        self.assertEqual(3, len(gif_parser.frames))
+        self.assertEqual(16, len(gif_parser.global_color_table.colors))
+        for frame_number, frame in enumerate(gif_parser.frames):
+            self.assertEqual(make_frame_indices(40, 30, 16, frame_number, rng), frame.image_data)
+
+    def test_run_benchmarks(self):
+        cases = [("tiny", make_gif(8, 8, frame_count=2, colors=4))]
+        results = run_benchmarks(cases, stages=("parse", "lzw"), repeat=1)
+
+        self.assertEqual(["parse", "lzw"], [result["stage"] for result in results])
+        for result in results:
+            self.assertEqual(2, result["frames"])
+            self.assertGreater(result["seconds"], 0)
+            self.assertGreater(result["peak_memory_bytes"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
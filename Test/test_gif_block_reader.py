@@ -0,0 +1,36 @@
+import unittest
+
+from GifParser.gif_block_reader import GifBlockReader
+
+
+class TestGifBlockReader(unittest.TestCase):
+    def test_read(self):
+        reader = GifBlockReader(b"GIF89a")
+        self.assertEqual(b"GIF", reader.read(3))
+        self.assertEqual(3, reader.tell())
+        self.assertEqual(b"89a", reader.read(10))
+        self.assertEqual(b"", reader.read(1))
+
+    def test_read_sub_blocks(self):
+        reader = GifBlockReader(b"\x02ab\x03cde\x00\x3B")
+        self.assertEqual(b"abcde", reader.read_sub_blocks())
+        self.assertEqual(b"\x3B", reader.read(1))
+
+    def test_skip_sub_blocks(self):
+        reader = GifBlockReader(b"\x02ab\x03cde\x00\x3B")
+        reader.skip_sub_blocks()
+        self.assertEqual(8, reader.tell())
+
+    def test_truncated_sub_blocks(self):
+        reader = GifBlockReader(b"\x05ab")
+        self.assertEqual(b"ab", reader.read_sub_blocks())
+        self.assertEqual(3, reader.tell())
+
+    def test_from_file(self):
+        reader = GifBlockReader.from_file("Images/small.gif")
+        self.assertEqual(b"GIF89a", reader.read(6))
+        reader.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
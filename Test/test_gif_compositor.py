@@ -0,0 +1,134 @@
+import unittest
+
+from GifParser.gif_compositor import GifCompositor
+from GifParser.gif_parser import GifParser
+from GifStructs.GifExtensions.graphic_control_extension import GifGraphicControlExtension
+from GifStructs.gif_frame import GifFrame
+from GifStructs.gif_frame_info import GifFrameInfo
+from GifStructs.global_color_table import GifGlobalColorTable
+from GifStructs.image_descriptor import GifImageDescriptor
+from GifStructs.local_color_table import GifLocalColorTable
+from GifStructs.logical_screen_descriptor import GifLogicalScreenDescriptor
+
+RED = b'\xff\x00\x00\xff'
+GREEN = b'\x00\xff\x00\xff'
+BLUE = b'\x00\x00\xff\xff'
+CLEAR = b'\x00\x00\x00\x00'
+
+
+def make_frame(left, top, width, height, indices, disposal=0, transparent_index=None, local_colors=None):
+    gce = GifGraphicControlExtension(disposal, 0, int(transparent_index is not None), 10, transparent_index or 0)
+    local_color_table = GifLocalColorTable(local_colors) if local_colors else None
+    packed = 0x80 | ((len(local_colors) - 1).bit_length() - 1) if local_colors else 0
+    descriptor = GifImageDescriptor(left, top, width, height, packed)
+    return GifFrame(descriptor, local_color_table, gce, None, None, None, indices)
+
+
+class TestGifCompositor(unittest.TestCase):
+    def setUp(self):
+        screen = GifLogicalScreenDescriptor(2, 2, 0x80, 0, 0)
+        colors = GifGlobalColorTable([(255, 0, 0), (0, 255, 0), (0, 0, 255), (0, 0, 0)])
+        self.compositor = GifCompositor(screen, colors)
+
+    def test_apply_opaque_frame(self):
+        canvas = self.compositor.apply_frame(make_frame(0, 0, 2, 2, [0, 1, 2, 0]))
+        self.assertEqual(RED + GREEN + BLUE + RED, canvas)
+        self.assertEqual(1, self.compositor.frame_count)
+
+    def test_apply_sub_rectangle(self):
+        canvas = self.compositor.apply_frame(make_frame(1, 1, 1, 1, [2]))
+        self.assertEqual(CLEAR * 3 + BLUE, canvas)
+
+    def test_transparency_keeps_previous_pixels(self):
+        self.compositor.apply_frame(make_frame(0, 0, 2, 2, [0, 0, 0, 0]))
+        canvas = self.compositor.apply_frame(make_frame(0, 0, 2, 2, [3, 1, 3, 2], transparent_index=3))
+        self.assertEqual(RED + GREEN + RED + BLUE, canvas)
+
+    def test_disposal_method_2(self):
+        self.compositor.apply_frame(make_frame(0, 0, 2, 2, [0, 0, 0, 0]))
+        self.compositor.apply_frame(make_frame(0, 0, 1, 2, [1, 1], disposal=2))
+        canvas = self.compositor.apply_frame(make_frame(1, 1, 1, 1, [2]))
+        self.assertEqual(CLEAR + RED + CLEAR + BLUE, canvas)
+
+    def test_disposal_method_3(self):
+        self.compositor.apply_frame(make_frame(0, 0, 2, 2, [0, 0, 0, 0]))
+        self.compositor.apply_frame(make_frame(0, 0, 2, 1, [1, 1], disposal=3))
+        canvas = self.compositor.apply_frame(make_frame(1, 1, 1, 1, [2]))
+        self.assertEqual(RED * 3 + BLUE, canvas)
+
+    def test_frame_clipped_to_screen(self):
+        canvas = self.compositor.apply_frame(make_frame(1, 0, 2, 1, [1, 2]))
+        self.assertEqual(CLEAR + GREEN + CLEAR * 2, canvas)
+
+    def test_reset(self):
+        self.compositor.apply_frame(make_frame(0, 0, 2, 2, [0, 1, 2, 0]))
+        self.compositor.reset()
+        self.assertEqual(CLEAR * 4, self.compositor.canvas)
+        self.assertEqual(0, self.compositor.frame_count)
+
+    def test_dirty_region(self):
+        self.compositor.apply_frame(make_frame(1, 1, 1, 1, [0], disposal=2))
+        self.assertEqual((0, 0, 2, 2), self.compositor.dirty_region)
+        self.compositor.apply_frame(make_frame(0, 0, 1, 1, [1]))
+        self.assertEqual((0, 0, 2, 2), self.compositor.dirty_region)
+        self.compositor.apply_frame(make_frame(1, 0, 1, 1, [1]))
+        self.assertEqual((1, 0, 2, 1), self.compositor.dirty_region)
+        self.compositor.reset()
+        self.compositor.apply_frame(make_frame(1, 0, 1, 1, [1]))
+        self.assertEqual((0, 0, 2, 2), self.compositor.dirty_region)
+
+    def test_get_frame_chain(self):
+        def info(number, left, top, width, height, disposal=0, transparent_index=None):
+            return GifFrameInfo(number, 0, 0, 0, left, top, width, height, 0, 0, 10, disposal, transparent_index)
+
+        frame_index = [
+            info(1, 0, 0, 2, 2),
+            info(2, 0, 0, 2, 2, disposal=1),
+            info(3, 0, 0, 1, 1, disposal=1),
+            info(4, 0, 0, 2, 2, disposal=3),
+            info(5, 1, 1, 1, 1, disposal=2),
+            info(6, 0, 0, 2, 2, transparent_index=0),
+            info(7, 0, 0, 2, 2, disposal=2),
+            info(8, 1, 0, 1, 1),
+        ]
+        self.assertEqual([1], self.compositor.get_frame_chain(frame_index, 1))
+        self.assertEqual([2, 3, 5, 6], self.compositor.get_frame_chain(frame_index, 6))
+        self.assertEqual([2, 3, 5, 6, 7], self.compositor.get_frame_chain(frame_index, 7))
+        self.assertEqual([8], self.compositor.get_frame_chain(frame_index, 8))
+
+    def test_iter_frames(self):
+        gif_parser = GifParser("Images/transparent.gif")
+        gif_parser.parse()
+        compositor = GifCompositor(gif_parser.logical_screen_descriptor, gif_parser.global_color_table)
+        canvases = list(compositor.iter_frames(gif_parser.frames))
+
+        self.assertEqual(2, len(canvases))
+        colors = gif_parser.global_color_table.colors
+        first, second = gif_parser.frames
+        for i in range(0, 300 * 300, 997):
+            if second.image_data[i] != 1:
+                expected = bytes(colors[second.image_data[i]]) + b'\xff'
+            elif first.image_data[i] != 0:
+                expected = bytes(colors[first.image_data[i]]) + b'\xff'
+            else:
+                expected = CLEAR
+            self.assertEqual(expected, canvases[1][i * 4:i * 4 + 4])
+
+
+    def test_indices_to_rgba(self):
+        color_table = GifGlobalColorTable([(1, 2, 3), (4, 5, 6)])
+        rgba_table = GifCompositor.get_rgba_table(color_table, transparent_index=1)
+
+        rgba = GifCompositor.indices_to_rgba(b'\x00\x01\x00', 3, rgba_table)
+        self.assertEqual(b'\x01\x02\x03\xff\x04\x05\x06\x00\x01\x02\x03\xff', rgba)
+
+    def test_cached_rgba_table(self):
+        color_table = GifGlobalColorTable([(1, 2, 3)])
+        compositor = GifCompositor(GifLogicalScreenDescriptor(1, 1, 0, 0, 0))
+        rgba_table = compositor.get_cached_rgba_table(color_table, 0)
+
+        self.assertIs(rgba_table, compositor.get_cached_rgba_table(color_table, 0))
+        self.assertIsNot(rgba_table, compositor.get_cached_rgba_table(color_table))
+
+if __name__ == '__main__':
+    unittest.main()
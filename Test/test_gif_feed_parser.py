@@ -0,0 +1,115 @@
+import random
+import unittest
+
+from Benchmarks.synthetic_gifs import make_gif
+from GifParser.gif_feed_parser import GifFeedParser
+from GifParser.lzw_compressor import LZWCompressor
+from GifParser.lzw_decompressor import LZWDecompressor, LZWStreamDecoder
+from GifStructs.gif_frame import GifFrame
+from GifStructs.gif_header import GifHeader
+from GifStructs.logical_screen_descriptor import GifLogicalScreenDescriptor
+from test_gif_stream_parser import parse_file
+
+
+def feed_chunks(data, chunk_sizes):
+    feed_parser = GifFeedParser()
+    blocks = []
+    pos = 0
+    for size in chunk_sizes:
+        blocks.extend(feed_parser.feed(data[pos:pos + size]))
+        pos += size
+    blocks.extend(feed_parser.feed(data[pos:]))
+    return feed_parser, blocks
+
+
+def get_frames(blocks):
+    return [block for block in blocks if isinstance(block, GifFrame)]
+
+
+class TestLZWStreamDecoder(unittest.TestCase):
+    def test_feed_by_bytes(self):
+        rng = random.Random(1)
+        data = bytes(rng.randrange(16) for _ in range(5000))
+        compressed = LZWCompressor(4, data).compress()
+        for pixel_count in (None, len(data)):
+            decoder = LZWStreamDecoder(4, pixel_count)
+            for i in range(len(compressed)):
+                decoder.feed(compressed[i:i + 1])
+            self.assertEqual(data, bytes(decoder.finish()))
+
+    def test_same_as_decompressor(self):
+        rng = random.Random(2)
+        data = bytes(rng.randrange(256) for _ in range(20000))
+        compressed = LZWCompressor(8, data).compress()
+        decoder = LZWStreamDecoder(8, 10000)
+        decoder.feed(compressed[:1000])
+        decoder.feed(compressed[1000:])
+        self.assertEqual(LZWDecompressor(8, compressed, 10000).decode(), decoder.finish())
+        self.assertTrue(decoder.done)
+
+
+class TestGifFeedParser(unittest.TestCase):
+    def test_feed_whole_file(self):
+        for name in ("small.gif", "transparent.gif", "image.gif", "disp_method_3.gif"):
+            with self.subTest(name=name):
+                with open(f"Images/{name}", 'rb') as f:
+                    data = f.read()
+                expected = parse_file(data)
+                feed_parser, blocks = feed_chunks(data, [])
+
+                self.assertEqual(expected.frames, get_frames(blocks))
+                self.assertEqual(expected.frame_index, feed_parser.frame_index)
+                self.assertEqual(expected.header, feed_parser.header)
+                self.assertTrue(feed_parser.complete)
+
+    def test_feed_by_bytes(self):
+        data = make_gif(20, 13, frame_count=3, colors=16, interlaced=True)
+        expected = parse_file(data)
+        feed_parser, blocks = feed_chunks(data, [1] * len(data))
+
+        self.assertEqual(expected.frames, get_frames(blocks))
+        self.assertEqual(expected.frame_index, feed_parser.frame_index)
+        self.assertTrue(feed_parser.complete)
+
+    def test_random_chunks(self):
+        with open("Images/transparent.gif", 'rb') as f:
+            data = f.read()
+        expected = parse_file(data)
+        rng = random.Random(3)
+        for _ in range(5):
+            feed_parser, blocks = feed_chunks(data, [rng.randrange(1, 300) for _ in range(10)])
+            self.assertEqual(expected.frames, get_frames(blocks))
+            self.assertEqual(expected.frame_index, feed_parser.frame_index)
+
+    def test_blocks_order(self):
+        data = make_gif(8, 8, frame_count=2, colors=4)
+        _, blocks = feed_chunks(data, [])
+
+        self.assertIsInstance(blocks[0], GifHeader)
+        self.assertIsInstance(blocks[1], GifLogicalScreenDescriptor)
+        self.assertEqual(["GifGlobalColorTable", "GifApplicationExtension", "GifGraphicControlExtension",
+                          "GifFrame", "GifGraphicControlExtension", "GifFrame"],
+                         [type(block).__name__ for block in blocks[2:]])
+
+    def test_frame_completed_by_last_byte(self):
+        data = make_gif(16, 16, frame_count=2, colors=4)
+        frame_end = parse_file(data).frame_index[1].block_offset
+        feed_parser = GifFeedParser()
+
+        self.assertEqual([], get_frames(feed_parser.feed(data[:frame_end - 1])))
+        self.assertEqual(1, len(get_frames(feed_parser.feed(data[frame_end - 1:frame_end]))))
+        self.assertFalse(feed_parser.complete)
+        self.assertEqual(1, len(get_frames(feed_parser.feed(data[frame_end:]))))
+        self.assertTrue(feed_parser.complete)
+        self.assertEqual([], feed_parser.feed(b'\x00'))
+
+    def test_invalid_header(self):
+        feed_parser = GifFeedParser()
+        with self.assertLogs(level='ERROR'):
+            self.assertEqual([], feed_parser.feed(b"not a gif at all"))
+        self.assertIsNone(feed_parser.header)
+        self.assertEqual([], feed_parser.feed(b"GIF89a"))
+
+
+if __name__ == '__main__':
+    unittest.main()
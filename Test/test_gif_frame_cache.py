@@ -0,0 +1,77 @@
+import unittest
+
+from GifParser.gif_frame_cache import GifFrameCache
+
+
+class TestGifFrameCache(unittest.TestCase):
+    def test_get_and_put(self):
+        cache = GifFrameCache(max_memory=100)
+        self.assertIsNone(cache.get(0))
+        cache.put(0, b'frame', 10)
+
+        self.assertEqual(b'frame', cache.get(0))
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+        self.assertEqual(10, cache.memory)
+        self.assertIn(0, cache)
+
+    def test_lru_eviction(self):
+        cache = GifFrameCache(max_memory=30, policy="lru")
+        for i in range(3):
+            cache.put(i, i, 10)
+        cache.get(0)
+        cache.put(3, 3, 10)
+
+        self.assertEqual(3, len(cache))
+        self.assertNotIn(1, cache)
+        self.assertEqual(1, cache.evictions)
+        self.assertEqual(30, cache.memory)
+
+    def test_keep_when_full(self):
+        cache = GifFrameCache(max_memory=30)
+        for i in range(4):
+            cache.put(i, i, 10)
+
+        self.assertEqual(3, len(cache))
+        self.assertNotIn(3, cache)
+        self.assertEqual(0, cache.evictions)
+
+    def test_can_store(self):
+        cache = GifFrameCache(max_memory=30)
+        cache.put(0, 0, 20)
+        self.assertTrue(cache.can_store(10))
+        self.assertFalse(cache.can_store(11))
+        self.assertTrue(GifFrameCache(max_memory=30, policy="lru").can_store(30))
+        self.assertFalse(GifFrameCache(max_memory=30, policy="lru").can_store(31))
+
+    def test_cyclic_playback_smaller_than_animation(self):
+        hits = {}
+        for policy in GifFrameCache.POLICIES:
+            cache = GifFrameCache(max_memory=30, policy=policy)
+            for _ in range(3):
+                for i in range(5):
+                    if cache.get(i) is None:
+                        cache.put(i, i, 10)
+            hits[policy] = cache.hits
+
+        self.assertEqual({"keep": 6, "lru": 0}, hits)
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            GifFrameCache(policy="unknown")
+
+    def test_replace_and_oversized(self):
+        cache = GifFrameCache(max_memory=30)
+        cache.put(0, 'a', 10)
+        cache.put(0, 'b', 20)
+        self.assertEqual(('b', 20), (cache.get(0), cache.memory))
+
+        cache.put(1, 'c', 31)
+        self.assertNotIn(1, cache)
+        self.assertEqual(20, cache.memory)
+
+        cache.clear()
+        self.assertEqual((0, 0), (len(cache), cache.memory))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,22 @@
 import os
+import struct
 import unittest
+import zlib
 from unittest.mock import patch
 
 from GifParser.gif_frames_exporter import GifFramesExporter
 from GifParser.gif_parser import GifParser
+from GifStructs.global_color_table import GifGlobalColorTable
+
+
+def read_png_chunks(png_data):
+    chunks = {}
+    position = 8
+    while position < len(png_data):
+        length, chunk_type = struct.unpack(">I4s", png_data[position:position + 8])
+        chunks[chunk_type] = png_data[position + 8:position + 8 + length]
+        position += length + 12
+    return chunks
 
 
 class TestFramesExporter(unittest.TestCase):
@@ -31,6 +44,19 @@ class TestFramesExporter(unittest.TestCase):
         pixels = exporter.transform_pixels(frame, width, height, indices, color_table, transparency)
         self.assertEqual([b'\x00\xb8\x00\x00\xff'], pixels)
 
+    def test_transform_pixels_transparency(self):
+        gif_parser = GifParser("Images/small.gif")
+        gif_parser.parse()
+
+        frame = gif_parser.frames[0]
+        frame.graphic_control_extension.transparency_flag = 1
+        frame.graphic_control_extension.transparent_color_index = 0
+        color_table = gif_parser.global_color_table
+        transparency = color_table.colors[0]
+
+        pixels = GifFramesExporter.transform_pixels(frame, 1, 1, frame.image_data, color_table, transparency)
+        self.assertEqual([b'\x00\xb8\x00\x00\x00'], pixels)
+
     def test_get_png_data(self):
         gif_parser = GifParser("Images/small.gif")
         gif_parser.parse()
@@ -47,6 +73,73 @@ class TestFramesExporter(unittest.TestCase):
             b'\x1f\x00\x03\xe4\x01\xb8m>\x16\xcc\x00\x00\x00\x00IEND\xaeB`\x82',
             png_data)
 
+    def test_get_palette_png_data(self):
+        gif_parser = GifParser("Images/small.gif")
+        gif_parser.parse()
+        exporter = GifFramesExporter(gif_parser, mode="palette")
+        frame = gif_parser.frames[0]
+
+        png_data = exporter.get_palette_png_data(frame.image_data, 1, 1, gif_parser.global_color_table, 0)
+        chunks = read_png_chunks(png_data)
+
+        self.assertEqual(b'\x89PNG\r\n\x1a\n', png_data[:8])
+        self.assertEqual(3, chunks[b'IHDR'][9])
+        self.assertEqual(b''.join(bytes(color) for color in gif_parser.global_color_table.colors), chunks[b'PLTE'])
+        self.assertEqual(b'\x00', chunks[b'tRNS'])
+        self.assertEqual(b'\x00\x00', zlib.decompress(chunks[b'IDAT']))
+
+    def test_palette_png_without_transparency(self):
+        gif_parser = GifParser("Images/small.gif")
+        gif_parser.parse()
+        exporter = GifFramesExporter(gif_parser, mode="palette")
+
+        png_data = exporter.get_palette_png_data(b'\x01\x00', 2, 1, GifGlobalColorTable([(1, 2, 3), (4, 5, 6)]))
+        chunks = read_png_chunks(png_data)
+
+        self.assertNotIn(b'tRNS', chunks)
+        self.assertEqual(b'\x01\x02\x03\x04\x05\x06', chunks[b'PLTE'])
+        self.assertEqual(b'\x00\x01\x00', zlib.decompress(chunks[b'IDAT']))
+
+    def test_palette_png_without_color_table(self):
+        png_data = GifFramesExporter.get_palette_png_data(b'\x01\x00', 2, 1, None)
+        chunks = read_png_chunks(png_data)
+
+        self.assertEqual(b'\x00' * 6, chunks[b'PLTE'])
+        self.assertEqual(b'\x00\x01\x00', zlib.decompress(chunks[b'IDAT']))
+
+    def test_export_composited_frames(self):
+        gif_parser = GifParser("Images/small.gif")
+        gif_parser.parse()
+        exporter = GifFramesExporter(gif_parser, mode="composited")
+        exporter.export_selected_frames([2])
+
+        with open(os.path.join(exporter.output_dir, "2.png"), 'rb') as f:
+            chunks = read_png_chunks(f.read())
+        self.assertEqual(b'\x00\xff\xff\xff\xff', zlib.decompress(chunks[b'IDAT']))
+        self.assertEqual(2, exporter.compositor.frame_count)
+
+    def test_export_selected_composited_frames_without_parse(self):
+        gif_parser = GifParser("Images/transparent.gif")
+        gif_parser.parse()
+        sequential = GifFramesExporter(gif_parser, mode="composited")
+        sequential.export_all_frames()
+
+        lazy_parser = GifParser("Images/transparent.gif", lazy=True)
+        exporter = GifFramesExporter(lazy_parser, mode="composited", output_dir=sequential.output_dir + "_selected")
+        exporter.export_selected_frames([2, 1])
+        self.assertEqual([], lazy_parser.frames)
+        for frame_number in (1, 2):
+            with open(os.path.join(sequential.output_dir, f"{frame_number}.png"), 'rb') as f:
+                expected = f.read()
+            with open(os.path.join(exporter.output_dir, f"{frame_number}.png"), 'rb') as f:
+                self.assertEqual(expected, f.read())
+        lazy_parser.close()
+
+    def test_unknown_mode(self):
+        gif_parser = GifParser("Images/small.gif")
+        with self.assertRaises(ValueError):
+            GifFramesExporter(gif_parser, mode="unknown")
+
     def test_export_frame(self):
         gif_parser = GifParser("Images/small.gif")
         gif_parser.parse()
@@ -62,6 +155,36 @@ class TestFramesExporter(unittest.TestCase):
         exporter.export_all_frames()
         self.assertEqual(2, mock_export_frame.call_count)
 
+    @patch.object(GifFramesExporter, "export_frame")
+    def test_export_all_frames_from_iterator(self, mock_export_frame):
+        gif_parser = GifParser("Images/small.gif")
+        exporter = GifFramesExporter(gif_parser)
+        exporter.export_all_frames(gif_parser.iter_frames())
+        self.assertEqual(2, mock_export_frame.call_count)
+        self.assertEqual([1, 2], [call.args[1] for call in mock_export_frame.call_args_list])
+        self.assertEqual([], gif_parser.frames)
+
+    def test_export_all_frames_parallel(self):
+        gif_parser = GifParser("Images/transparent.gif")
+        gif_parser.parse()
+        exporter = GifFramesExporter(gif_parser)
+        base_dir = exporter.output_dir
+
+        for executor in ("sequential",) + tuple(GifFramesExporter.EXECUTORS):
+            exporter.output_dir = os.path.join(base_dir, executor)
+            os.makedirs(exporter.output_dir)
+            if executor == "sequential":
+                exporter.export_all_frames()
+            else:
+                exporter.export_all_frames(workers=2, executor=executor)
+
+        for executor in GifFramesExporter.EXECUTORS:
+            for frame_number in (1, 2):
+                with open(os.path.join(base_dir, "sequential", f"{frame_number}.png"), 'rb') as f:
+                    expected = f.read()
+                with open(os.path.join(base_dir, executor, f"{frame_number}.png"), 'rb') as f:
+                    self.assertEqual(expected, f.read())
+
     @patch.object(GifFramesExporter, "export_frame")
     @patch('logging.warning')
     def test_export_selected_frames(self, mock_logging_warning, mock_export_frame):
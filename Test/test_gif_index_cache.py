@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from GifParser.gif_index_cache import GifIndexCache
+from GifParser.gif_parser import GifParser
+
+
+class TestGifIndexCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.cache = GifIndexCache(self.cache_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_scan_uses_cache(self):
+        expected = GifParser("Images/transparent.gif").scan()
+        first = GifParser("Images/transparent.gif", index_cache=self.cache)
+        self.assertEqual(expected, first.scan())
+        self.assertEqual(1, len(os.listdir(self.cache_dir)))
+
+        second = GifParser("Images/transparent.gif", index_cache=self.cache)
+        with patch.object(GifParser, 'iter_blocks', side_effect=AssertionError) as mock_iter_blocks:
+            frame_index = second.scan()
+        mock_iter_blocks.assert_not_called()
+        self.assertEqual(expected, frame_index)
+        self.assertEqual(first.header, second.header)
+        self.assertEqual(first.logical_screen_descriptor, second.logical_screen_descriptor)
+        self.assertEqual(first.global_color_table, second.global_color_table)
+
+    def test_parse_from_cache(self):
+        expected = GifParser("Images/transparent.gif")
+        expected.parse()
+        GifParser("Images/transparent.gif", index_cache=self.cache).scan()
+
+        cached = GifParser("Images/transparent.gif", index_cache=self.cache)
+        with patch.object(GifParser, 'parse_screen', side_effect=AssertionError):
+            cached.parse()
+        self.assertEqual(expected.frames, cached.frames)
+        self.assertEqual(expected.frame_index, cached.frame_index)
+
+    def test_read_frame(self):
+        expected = GifParser("Images/transparent.gif")
+        expected.parse()
+        gif_parser = GifParser("Images/transparent.gif", index_cache=self.cache)
+        gif_parser.scan()
+
+        frame = gif_parser.read_frame(gif_parser.frame_index[1])
+        self.assertEqual(expected.frames[1], frame)
+
+    def test_modified_file_invalidates_entry(self):
+        path = os.path.join(self.cache_dir, "copy.gif")
+        shutil.copy("Images/small.gif", path)
+        GifParser(path, index_cache=self.cache).scan()
+        key = self.cache.get_key(path)
+
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertNotEqual(key, self.cache.get_key(path))
+
+    def test_content_hash(self):
+        cache = GifIndexCache(self.cache_dir, use_content_hash=True)
+        path = os.path.join(self.cache_dir, "copy.gif")
+        shutil.copy("Images/small.gif", path)
+        self.assertEqual(cache.get_key("Images/small.gif"), cache.get_key(path))
+
+    def test_corrupted_entry(self):
+        gif_parser = GifParser("Images/small.gif", index_cache=self.cache)
+        gif_parser.scan()
+        with open(self.cache.get_path(self.cache.get_key("Images/small.gif")), 'w') as f:
+            f.write("{")
+
+        expected = gif_parser.frame_index
+        self.assertEqual(expected, GifParser("Images/small.gif", index_cache=self.cache).scan())
+
+    def test_evict(self):
+        GifParser("Images/small.gif", index_cache=self.cache).scan()
+        small_path = self.cache.get_path(self.cache.get_key("Images/small.gif"))
+        os.utime(small_path, ns=(0, 0))
+        GifParser("Images/transparent.gif", index_cache=self.cache).scan()
+        transparent_path = self.cache.get_path(self.cache.get_key("Images/transparent.gif"))
+
+        self.cache.max_size = os.path.getsize(transparent_path)
+        self.cache.evict()
+        self.assertFalse(os.path.exists(small_path))
+        self.assertTrue(os.path.exists(transparent_path))
+
+        self.cache.max_size = 0
+        self.cache.evict()
+        self.assertEqual([], os.listdir(self.cache_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
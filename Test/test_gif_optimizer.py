@@ -0,0 +1,141 @@
+import os
+import unittest
+
+from Benchmarks.synthetic_gifs import make_gif
+from GifParser.gif_compositor import GifCompositor
+from GifParser.gif_optimizer import GifOptimizer
+from GifParser.gif_parser import GifParser
+from GifParser.gif_writer import GifWriter
+from GifStructs.gif_header import GifHeader
+from GifStructs.global_color_table import GifGlobalColorTable
+from GifStructs.logical_screen_descriptor import GifLogicalScreenDescriptor
+from test_gif_compositor import make_frame
+
+COLORS = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (0, 0, 0)]
+
+
+def make_parser(width, height, frames):
+    screen = GifLogicalScreenDescriptor(width, height, 0x81, 0, 0)
+    data = GifWriter(GifHeader("GIF", "89a"), screen, GifGlobalColorTable(COLORS), frames).to_bytes()
+    gif_parser = GifParser(data)
+    gif_parser.parse()
+    return gif_parser
+
+
+def composite(gif_parser, frames):
+    compositor = GifCompositor(gif_parser.logical_screen_descriptor, gif_parser.global_color_table)
+    return list(compositor.iter_frames(frames))
+
+
+def get_region(frame):
+    descriptor = frame.image_descriptor
+    return descriptor.left, descriptor.top, descriptor.width, descriptor.height
+
+
+class TestGifOptimizer(unittest.TestCase):
+    def assert_optimized(self, gif_parser):
+        optimizer = GifOptimizer(gif_parser)
+        optimized_parser = GifParser(optimizer.to_bytes())
+        optimized_parser.parse()
+        self.assertEqual(composite(gif_parser, gif_parser.frames), composite(optimized_parser, optimized_parser.frames))
+        return optimizer
+
+    def test_images(self):
+        for name in ("small.gif", "transparent.gif", "image.gif", "disp_method_2.gif", "disp_method_3.gif"):
+            with self.subTest(name=name):
+                gif_parser = GifParser(os.path.join("Images", name))
+                gif_parser.parse()
+                self.assertTrue(self.assert_optimized(gif_parser).optimized)
+
+    def test_synthetic(self):
+        gif_parser = GifParser(make_gif(24, 16, frame_count=4, colors=16, seed=3))
+        gif_parser.parse()
+        self.assert_optimized(gif_parser)
+
+    def test_crop_changed_region(self):
+        first = [0] * 16
+        second = list(first)
+        second[3 * 4 + 2] = 2
+        gif_parser = make_parser(4, 4, [make_frame(0, 0, 4, 4, first), make_frame(0, 0, 4, 4, second),
+                                        make_frame(0, 0, 4, 4, second)])
+        frames = self.assert_optimized(gif_parser).frames
+
+        self.assertEqual((0, 0, 4, 4), get_region(frames[0]))
+        self.assertEqual((2, 3, 1, 1), get_region(frames[1]))
+        self.assertEqual(b'\x02', bytes(frames[1].image_data))
+        self.assertEqual((0, 0, 1, 1), get_region(frames[2]))
+        self.assertTrue(frames[2].graphic_control_extension.transparency_flag)
+
+    def test_unchanged_pixels_transparent(self):
+        first = [0] * 9
+        second = [1, 0, 0, 0, 0, 0, 0, 0, 1]
+        gif_parser = make_parser(3, 3, [make_frame(0, 0, 3, 3, first), make_frame(0, 0, 3, 3, second)])
+        frame = self.assert_optimized(gif_parser).frames[1]
+
+        gce = frame.graphic_control_extension
+        self.assertEqual((0, 0, 3, 3), get_region(frame))
+        self.assertEqual((1, 0), (gce.transparency_flag, gce.transparent_color_index))
+        self.assertEqual(bytes([1, 0, 0, 0, 0, 0, 0, 0, 1]), bytes(frame.image_data))
+
+    def test_clear_disposal(self):
+        first = [3] * 16
+        first[0] = 0
+        second = [3] * 16
+        second[15] = 1
+        gif_parser = make_parser(4, 4, [make_frame(0, 0, 4, 4, first, disposal=2, transparent_index=3),
+                                        make_frame(0, 0, 4, 4, second, disposal=2, transparent_index=3)])
+        frames = self.assert_optimized(gif_parser).frames
+
+        self.assertEqual(2, frames[0].graphic_control_extension.disposal_method)
+        self.assertEqual((0, 0, 1, 1), get_region(frames[0]))
+        self.assertEqual((3, 3, 1, 1), get_region(frames[1]))
+
+    def test_expand_cleared_region(self):
+        first = [3] * 16
+        first[0] = 0
+        second = list(first)
+        second[15] = 1
+        third = [3] * 16
+        gif_parser = make_parser(4, 4, [make_frame(0, 0, 4, 4, first, transparent_index=3),
+                                        make_frame(0, 0, 4, 4, second, disposal=2, transparent_index=3),
+                                        make_frame(0, 0, 4, 4, third, transparent_index=3)])
+        frames = self.assert_optimized(gif_parser).frames
+
+        self.assertEqual(2, frames[1].graphic_control_extension.disposal_method)
+        self.assertEqual((0, 0, 4, 4), get_region(frames[1]))
+
+    def test_keep_original_frames(self):
+        blue = [(0, 0, 255), (0, 255, 0)]
+        green = [(0, 255, 0), (0, 0, 0)]
+        frames = [make_frame(0, 0, 2, 2, [0] * 4),
+                  make_frame(0, 0, 1, 1, [0], disposal=3, local_colors=blue),
+                  make_frame(1, 1, 1, 1, [0], local_colors=green)]
+        gif_parser = make_parser(2, 2, frames)
+        optimizer = self.assert_optimized(gif_parser)
+
+        self.assertFalse(optimizer.optimized)
+        self.assertEqual(gif_parser.frames, optimizer.frames)
+
+    def test_get_common_prefix_length(self):
+        old = memoryview(bytes(range(8))).cast('I')
+        self.assertEqual(2, GifOptimizer.get_common_prefix_length(old, memoryview(bytes(range(8))).cast('I')))
+        changed = bytearray(range(8))
+        changed[5] = 0
+        self.assertEqual(1, GifOptimizer.get_common_prefix_length(old, memoryview(changed).cast('I')))
+
+    def test_get_report(self):
+        with open("Images/transparent.gif", 'rb') as f:
+            data = f.read()
+        gif_parser = GifParser(data)
+        gif_parser.parse()
+        optimized = GifOptimizer(gif_parser).to_bytes()
+        report = GifOptimizer.get_report(data, optimized, repeat=1)
+
+        self.assertEqual(len(data), report["original_bytes"])
+        self.assertEqual(len(optimized), report["optimized_bytes"])
+        self.assertGreater(report["size_saving_percent"], 0)
+        self.assertGreater(report["original_decode_ms"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
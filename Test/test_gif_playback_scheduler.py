@@ -0,0 +1,96 @@
+import unittest
+
+from GifParser.gif_playback_scheduler import GifPlaybackScheduler
+from GifStructs.GifExtensions.graphic_control_extension import GifGraphicControlExtension
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestGifPlaybackScheduler(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_get_delay_ms(self):
+        self.assertEqual(40, GifPlaybackScheduler.get_delay_ms(GifGraphicControlExtension(0, 0, 0, 4, 0)))
+        self.assertEqual(100, GifPlaybackScheduler.get_delay_ms(GifGraphicControlExtension(0, 0, 0, 0, 0)))
+        self.assertEqual(100, GifPlaybackScheduler.get_delay_ms(None))
+
+    def test_render_time_does_not_drift(self):
+        scheduler = GifPlaybackScheduler([100, 100, 100], clock=self.clock)
+        frame_idx, delays = 0, []
+        for _ in range(6):
+            self.clock.now += 0.03
+            scheduler.frame_shown(frame_idx, 0.03)
+            frame_idx, delay = scheduler.next_frame()
+            delays.append(delay)
+            self.clock.now += delay / 1000
+
+        self.assertEqual([70] * 6, delays)
+        self.assertAlmostEqual(0.6, self.clock.now)
+        self.assertEqual(0, scheduler.dropped_frames)
+
+    def test_drop_frames_when_behind(self):
+        scheduler = GifPlaybackScheduler([100, 100, 100, 100], clock=self.clock)
+        scheduler.frame_shown(0, 0.0)
+        self.clock.now = 0.25
+
+        self.assertEqual((2, 0), scheduler.next_frame())
+        self.assertEqual(1, scheduler.dropped_frames)
+
+        self.clock.now = 0.3
+        scheduler.frame_shown(2, 0.05)
+        self.assertEqual((3, 0), scheduler.next_frame())
+
+    def test_no_drop_without_dropping(self):
+        scheduler = GifPlaybackScheduler([100, 100, 100], drop_frames=False, clock=self.clock)
+        scheduler.frame_shown(0, 0.0)
+        self.clock.now = 0.25
+
+        self.assertEqual((1, 0), scheduler.next_frame())
+        self.assertEqual(0, scheduler.dropped_frames)
+        self.assertAlmostEqual(150, scheduler.get_stats()["lag_ms"])
+
+    def test_resync_after_stall(self):
+        scheduler = GifPlaybackScheduler([100, 100], drop_frames=False, clock=self.clock)
+        scheduler.frame_shown(0, 0.0)
+        self.clock.now = 5.0
+
+        self.assertEqual((1, 0), scheduler.next_frame())
+        self.assertEqual(1, scheduler.resyncs)
+        scheduler.frame_shown(1, 0.0)
+        self.assertEqual((0, 100), scheduler.next_frame())
+
+    def test_seek_restarts_timeline(self):
+        scheduler = GifPlaybackScheduler([100, 100, 100], clock=self.clock)
+        scheduler.frame_shown(0, 0.0)
+        scheduler.next_frame()
+        self.clock.now = 0.5
+        scheduler.frame_shown(2, 0.0)
+
+        self.assertEqual((0, 100), scheduler.next_frame())
+
+    def test_stats(self):
+        scheduler = GifPlaybackScheduler([100, 100], clock=self.clock)
+        for frame_idx in (0, 1, 0):
+            scheduler.frame_shown(frame_idx, 0.01)
+            scheduler.next_frame()
+            self.clock.now += 0.1
+
+        stats = scheduler.get_stats()
+        self.assertEqual(3, stats["frames_shown"])
+        self.assertAlmostEqual(10.0, stats["fps"])
+        self.assertAlmostEqual(10.0, stats["average_render_ms"])
+
+    def test_no_frames(self):
+        with self.assertRaises(ValueError):
+            GifPlaybackScheduler([])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+from unittest.mock import patch
+
+from GifParser.gif_compositor import GifCompositor
+from GifParser.gif_parser import GifParser
+from GifParser.gif_profiler import GifProfiler, get_profiler, profile_count, profile_stage
+from GifParser.lzw_compressor import LZWCompressor
+from GifParser.lzw_decompressor import LZWDecompressor
+from test_gif_playback_scheduler import FakeClock
+
+
+class TestGifProfiler(unittest.TestCase):
+    def test_nested_stages(self):
+        clock = FakeClock()
+        profiler = GifProfiler(clock=clock)
+        with profiler.stage("outer"):
+            clock.now += 1.0
+            with profiler.stage("inner"):
+                clock.now += 2.0
+            clock.now += 0.5
+        stages = profiler.get_stats()["stages"]
+
+        self.assertEqual({"calls": 1, "total_seconds": 3.5, "self_seconds": 1.5}, stages["outer"])
+        self.assertEqual({"calls": 1, "total_seconds": 2.0, "self_seconds": 2.0}, stages["inner"])
+
+    def test_counters_and_merge(self):
+        profiler = GifProfiler(clock=FakeClock())
+        profiler.count("frames")
+        profiler.count("frames", 2)
+        with profiler.stage("decode"):
+            pass
+        other = GifProfiler()
+        other.merge(profiler.get_stats())
+        other.merge(profiler.get_stats())
+        stats = other.get_stats()
+
+        self.assertEqual({"frames": 6}, stats["counters"])
+        self.assertEqual(2, stats["stages"]["decode"]["calls"])
+        self.assertIn("decode", other.format_stats())
+
+    def test_callback(self):
+        calls = []
+        clock = FakeClock()
+        with GifProfiler(callback=lambda name, seconds: calls.append((name, seconds)), clock=clock):
+            with profile_stage("decode"):
+                clock.now += 0.25
+        self.assertEqual([("decode", 0.25)], calls)
+
+    def test_disabled(self):
+        profiler = GifProfiler()
+        self.assertIsNone(get_profiler())
+        with profile_stage("decode"):
+            profile_count("frames")
+        gif_parser = GifParser("Images/small.gif")
+        gif_parser.parse()
+
+        self.assertIsNone(get_profiler())
+        self.assertEqual({"stages": {}, "counters": {}, "unavailable": []}, profiler.get_stats())
+
+    @patch('GifParser.gif_parser.Decompressor', LZWDecompressor)
+    def test_parse(self):
+        with GifProfiler() as profiler:
+            self.assertIs(profiler, get_profiler())
+            gif_parser = GifParser("Images/image.gif")
+            gif_parser.parse()
+            compositor = GifCompositor(gif_parser.logical_screen_descriptor, gif_parser.global_color_table)
+            list(compositor.iter_frames(gif_parser.frames))
+        self.assertIsNone(get_profiler())
+        stats = profiler.get_stats()
+
+        for stage in ("read_blocks", "lzw_decode", "composite"):
+            self.assertIn(stage, stats["stages"])
+        self.assertEqual(len(gif_parser.frames), stats["stages"]["lzw_decode"]["calls"])
+        counters = stats["counters"]
+        self.assertGreater(counters["bytes_read"], 0)
+        self.assertGreater(counters["lzw_codes"], 0)
+        self.assertGreaterEqual(counters["lzw_dictionary_resets"], len(gif_parser.frames))
+        self.assertEqual(len(gif_parser.frames), counters["frames_composited"])
+        self.assertEqual([], stats["unavailable"])
+
+    def test_lzw_counters(self):
+        repeated = bytes([1, 2, 3]) * 100
+        with GifProfiler() as profiler:
+            LZWDecompressor(8, LZWCompressor(8, bytes(range(256))).compress()).decode()
+            LZWDecompressor(2, LZWCompressor(2, repeated).compress()).decode()
+        counters = profiler.get_stats()["counters"]
+
+        self.assertLess(counters["lzw_codes"] - 256, len(repeated))
+        self.assertGreater(counters["lzw_codes"], 256)
+        self.assertEqual(2, counters["lzw_dictionary_resets"])
+
+    def test_lzw_counters_unavailable(self):
+        with GifProfiler() as profiler:
+            LZWDecompressor(2, b'D\x01', engine="dict").decode()
+        stats = profiler.get_stats()
+
+        self.assertEqual({}, stats["counters"])
+        self.assertEqual(["lzw_codes", "lzw_dictionary_resets"], stats["unavailable"])
+        self.assertIn("н/д", profiler.format_stats())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+
+from GifParser.gif_compositor import GifCompositor
+from GifParser.gif_parser import GifParser
+from GifParser.gif_seek_index import GifSeekIndex
+from GifStructs.global_color_table import GifGlobalColorTable
+from GifStructs.logical_screen_descriptor import GifLogicalScreenDescriptor
+from test_gif_compositor import make_frame
+
+
+def make_parser(frame_count):
+    gif_parser = GifParser(b'')
+    gif_parser.logical_screen_descriptor = GifLogicalScreenDescriptor(4, 4, 0x80, 0, 0)
+    gif_parser.global_color_table = GifGlobalColorTable([(255, 0, 0), (0, 255, 0), (0, 0, 255), (0, 0, 0)])
+    for i in range(frame_count):
+        x, y = i % 4, (i // 4) % 4
+        disposal = (1, 1, 3, 2)[i % 4]
+        gif_parser.frames.append(make_frame(x, y, 1, 1, [i % 3], disposal=disposal))
+    gif_parser.frame_index = [GifParser.get_frame_info(i, 0, frame)
+                              for i, frame in enumerate(gif_parser.frames, start=1)]
+    return gif_parser
+
+
+class TestGifSeekIndex(unittest.TestCase):
+    def setUp(self):
+        self.gif_parser = make_parser(40)
+        compositor = GifCompositor(self.gif_parser.logical_screen_descriptor, self.gif_parser.global_color_table)
+        self.expected = list(compositor.iter_frames(self.gif_parser.frames))
+
+    def test_seek_matches_sequential(self):
+        seek_index = GifSeekIndex(self.gif_parser, interval=8)
+        for frame_number in (25, 3, 40, 1, 17, 17, 18, 9):
+            self.assertEqual(self.expected[frame_number - 1], seek_index.seek(frame_number))
+        self.assertIsNone(seek_index.seek(41))
+
+    def test_seek_cost_bounded_by_interval(self):
+        seek_index = GifSeekIndex(self.gif_parser, interval=8)
+        seek_index.build()
+        self.assertEqual([8, 16, 24, 32, 40], list(seek_index.snapshots))
+
+        for frame_number in (39, 2, 30, 15, 23):
+            applied_frames = seek_index.applied_frames
+            self.assertEqual(self.expected[frame_number - 1], seek_index.seek(frame_number))
+            self.assertLessEqual(seek_index.applied_frames - applied_frames, 8)
+
+    def test_memory_limit(self):
+        snapshot_size = 4 * 4 * 4
+        seek_index = GifSeekIndex(self.gif_parser, interval=4, max_memory=snapshot_size * 3)
+        seek_index.build()
+        self.assertEqual([32, 36, 40], list(seek_index.snapshots))
+        self.assertLessEqual(seek_index.memory, snapshot_size * 3)
+        self.assertEqual(self.expected[5], seek_index.seek(6))
+
+    def test_get_state(self):
+        seek_index = GifSeekIndex(self.gif_parser, interval=8)
+        compositor = GifCompositor(self.gif_parser.logical_screen_descriptor, self.gif_parser.global_color_table)
+        compositor.restore_state(seek_index.get_state(10))
+        self.assertEqual(self.expected[10], bytes(compositor.apply_frame(self.gif_parser.frames[10])))
+
+        compositor.restore_state(seek_index.get_state(0))
+        self.assertEqual(self.expected[0], bytes(compositor.apply_frame(self.gif_parser.frames[0])))
+
+    def test_frame_count_after_chain(self):
+        self.gif_parser.frames[4] = make_frame(0, 0, 4, 4, [0] * 16, disposal=1)
+        self.gif_parser.frame_index[4] = GifParser.get_frame_info(5, 0, self.gif_parser.frames[4])
+        seek_index = GifSeekIndex(self.gif_parser, interval=8)
+        state = seek_index.get_state(7)
+
+        self.assertEqual(3, seek_index.applied_frames)
+        self.assertEqual(7, state[3])
+
+    def test_shared_compositor(self):
+        compositor = GifCompositor(self.gif_parser.logical_screen_descriptor, self.gif_parser.global_color_table)
+        list(compositor.iter_frames(self.gif_parser.frames[:5]))
+        seek_index = GifSeekIndex(self.gif_parser, interval=8, compositor=compositor)
+
+        self.assertEqual(5, seek_index.frame_number)
+        self.assertEqual(self.expected[6], seek_index.seek(7))
+        self.assertEqual(2, seek_index.applied_frames)
+        self.assertEqual(7, compositor.frame_count)
+
+    def test_invalid_interval(self):
+        with self.assertRaises(ValueError):
+            GifSeekIndex(self.gif_parser, interval=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
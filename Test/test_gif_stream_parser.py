@@ -0,0 +1,92 @@
+import asyncio
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from Benchmarks.synthetic_gifs import make_gif
+from GifParser.gif_parser import GifParser
+from GifParser.gif_stream_parser import GifStreamParser, parse_stream
+
+
+def make_reader(data, chunk_size=None):
+    reader = asyncio.StreamReader()
+    chunk_size = chunk_size or len(data) or 1
+    for i in range(0, len(data), chunk_size):
+        reader.feed_data(data[i:i + chunk_size])
+    reader.feed_eof()
+    return reader
+
+
+def parse_file(source):
+    gif_parser = GifParser(source)
+    gif_parser.parse()
+    gif_parser.scan()
+    return gif_parser
+
+
+class TestGifStreamParser(unittest.IsolatedAsyncioTestCase):
+    async def test_parse_stream(self):
+        for name in ("small.gif", "transparent.gif", "image.gif", "disp_method_3.gif"):
+            with self.subTest(name=name):
+                with open(f"Images/{name}", 'rb') as f:
+                    data = f.read()
+                expected = parse_file(data)
+
+                frames = [frame async for frame in parse_stream(make_reader(data, chunk_size=7))]
+                self.assertEqual(expected.frames, frames)
+
+    async def test_screen_and_index(self):
+        data = make_gif(20, 13, frame_count=3, colors=16, interlaced=True)
+        expected = parse_file(data)
+        stream_parser = GifStreamParser(make_reader(data, chunk_size=100))
+
+        self.assertTrue(await stream_parser.parse_screen())
+        self.assertEqual(expected.header, stream_parser.header)
+        self.assertEqual(expected.logical_screen_descriptor, stream_parser.logical_screen_descriptor)
+        self.assertEqual(expected.global_color_table, stream_parser.global_color_table)
+
+        await stream_parser.parse()
+        self.assertEqual(expected.frames, stream_parser.frames)
+        self.assertEqual(expected.frame_index, stream_parser.frame_index)
+        self.assertTrue(stream_parser.complete)
+
+    async def test_frames_before_end_of_stream(self):
+        data = make_gif(16, 16, frame_count=2, colors=4)
+        first_frame_end = parse_file(data).frame_index[1].block_offset
+        reader = asyncio.StreamReader()
+        reader.feed_data(data[:first_frame_end + 1])
+        frames = parse_stream(reader)
+
+        frame = await asyncio.wait_for(frames.__anext__(), timeout=1)
+        self.assertEqual(16, frame.image_descriptor.width)
+
+        reader.feed_data(data[first_frame_end + 1:])
+        reader.feed_eof()
+        self.assertEqual(1, len([frame async for frame in frames]))
+
+    async def test_truncated_stream(self):
+        data = make_gif(16, 16, frame_count=3, colors=4)
+        expected = parse_file(data)
+        stream_parser = GifStreamParser(make_reader(data[:expected.frame_index[2].data_offset + 5]))
+
+        with self.assertLogs(level='WARNING'):
+            await stream_parser.parse()
+        self.assertEqual(expected.frames[:2], stream_parser.frames)
+        self.assertFalse(stream_parser.complete)
+
+    async def test_invalid_header(self):
+        stream_parser = GifStreamParser(make_reader(b"not a gif at all"))
+        with self.assertLogs(level='ERROR'):
+            await stream_parser.parse()
+        self.assertIsNone(stream_parser.header)
+        self.assertEqual([], stream_parser.frames)
+
+    async def test_executor(self):
+        with open("Images/transparent.gif", 'rb') as f:
+            data = f.read()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            frames = [frame async for frame in parse_stream(make_reader(data), executor)]
+        self.assertEqual(parse_file(data).frames, frames)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from Benchmarks.synthetic_gifs import make_gif
+from GifParser.gif_feed_parser import GifFeedParser
+from GifParser.gif_parser import GifParser
+from GifParser.gif_stream_parser import GifStreamParser
+from GifParser.gif_writer import GifWriter
+from GifStructs.global_color_table import GifGlobalColorTable
+from GifStructs.gif_frame import GifFrame
+from GifStructs.image_descriptor import GifImageDescriptor
+from GifStructs.local_color_table import GifLocalColorTable
+from GifStructs.logical_screen_descriptor import GifLogicalScreenDescriptor
+from test_gif_stream_parser import make_reader
+
+
+class TestGifWriter(unittest.TestCase):
+    def assert_frames_equal(self, expected_parser, gif_parser):
+        self.assertEqual(expected_parser.header, gif_parser.header)
+        self.assertEqual(expected_parser.logical_screen_descriptor, gif_parser.logical_screen_descriptor)
+        self.assertEqual(len(expected_parser.frames), len(gif_parser.frames))
+        for expected, frame in zip(expected_parser.frames, gif_parser.frames):
+            self.assertEqual(vars(expected.image_descriptor), vars(frame.image_descriptor))
+            self.assertEqual(expected.image_data, frame.image_data)
+            self.assertEqual(expected.local_color_table, frame.local_color_table)
+            if expected.graphic_control_extension:
+                self.assertEqual(vars(expected.graphic_control_extension), vars(frame.graphic_control_extension))
+
+    def test_round_trip(self):
+        for name in ("small.gif", "transparent.gif", "image.gif", "disp_method_3.gif"):
+            with self.subTest(name=name):
+                gif_parser = GifParser(os.path.join("Images", name))
+                gif_parser.parse()
+                data = GifWriter.from_parser(gif_parser).to_bytes()
+
+                written_parser = GifParser(data)
+                written_parser.parse()
+                self.assert_frames_equal(gif_parser, written_parser)
+                self.assertEqual(data, GifWriter.from_parser(written_parser).to_bytes())
+
+    def test_round_trip_interlaced(self):
+        gif_parser = GifParser(make_gif(20, 13, frame_count=2, colors=16, seed=1, interlaced=True))
+        gif_parser.parse()
+        written_parser = GifParser(GifWriter.from_parser(gif_parser).to_bytes())
+        written_parser.parse()
+        self.assert_frames_equal(gif_parser, written_parser)
+
+    def test_round_trip_without_global_color_table(self):
+        gif_parser = GifParser(make_gif(16, 12, frame_count=3, colors=16, seed=2))
+        gif_parser.parse()
+        screen = gif_parser.logical_screen_descriptor
+        # Флаг глобальной таблицы снят, а биты её размера оставлены: парсер не должен читать таблицу.
+        gif_parser.logical_screen_descriptor = GifLogicalScreenDescriptor(screen.width, screen.height,
+                                                                          screen.packed & 0x7F, 0, 0)
+        colors = GifLocalColorTable(gif_parser.global_color_table.colors)
+        for frame in gif_parser.frames:
+            descriptor = frame.image_descriptor
+            frame.image_descriptor = GifImageDescriptor(descriptor.left, descriptor.top, descriptor.width,
+                                                        descriptor.height, descriptor.packed | 0x80 | 0x03)
+            frame.local_color_table = colors
+        gif_parser.global_color_table = None
+        data = GifWriter.from_parser(gif_parser).to_bytes()
+
+        written_parser = GifParser(data)
+        written_parser.parse()
+        self.assertIsNone(written_parser.global_color_table)
+        self.assert_frames_equal(gif_parser, written_parser)
+
+        async def parse_stream():
+            stream_parser = GifStreamParser(make_reader(data))
+            await stream_parser.parse()
+            return stream_parser.frames
+
+        feed_frames = [block for block in GifFeedParser().feed(data) if isinstance(block, GifFrame)]
+        for frames in (feed_frames, asyncio.run(parse_stream())):
+            self.assertEqual([frame.image_data for frame in gif_parser.frames],
+                             [frame.image_data for frame in frames])
+
+    def test_write(self):
+        gif_parser = GifParser("Images/transparent.gif")
+        gif_parser.parse()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "copy.gif")
+            GifWriter.from_parser(gif_parser).write(path)
+            written_parser = GifParser(path)
+            written_parser.parse()
+        self.assert_frames_equal(gif_parser, written_parser)
+
+    def test_get_min_code_size(self):
+        self.assertEqual(2, GifWriter.get_min_code_size(GifGlobalColorTable([(0, 0, 0)] * 2), b''))
+        self.assertEqual(8, GifWriter.get_min_code_size(GifGlobalColorTable([(0, 0, 0)] * 256), b''))
+        self.assertEqual(5, GifWriter.get_min_code_size(None, b'\x00\x1F'))
+
+    def test_color_table_padding(self):
+        data = GifWriter.get_color_table_data(GifGlobalColorTable([(1, 2, 3)]), 2)
+        self.assertEqual(b'\x01\x02\x03\x00\x00\x00', data)
+
+
+if __name__ == '__main__':
+    unittest.main()
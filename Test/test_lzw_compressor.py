@@ -0,0 +1,29 @@
+import random
+import unittest
+
+from GifParser.lzw_compressor import LZWCompressor
+from GifParser.lzw_decompressor import LZWDecompressor
+
+
+class TestLZWCompressor(unittest.TestCase):
+    def assert_round_trip(self, min_code_size, data):
+        compressed = LZWCompressor(min_code_size, data).compress()
+        self.assertEqual(bytes(data), bytes(LZWDecompressor(min_code_size, compressed).decode()))
+
+    def test_round_trip(self):
+        self.assert_round_trip(2, bytes([0, 1, 2, 3, 0, 1, 2, 3, 3, 3, 3, 3, 1]))
+        self.assert_round_trip(8, b'abababababababab')
+
+    def test_empty(self):
+        compressed = LZWCompressor(2, b'').compress()
+        self.assertEqual(b'\x2C', compressed)
+        self.assertEqual(b'', bytes(LZWDecompressor(2, compressed).decode()))
+
+    def test_full_table(self):
+        rnd = random.Random(0)
+        self.assert_round_trip(8, bytes(rnd.randrange(256) for _ in range(50000)))
+        self.assert_round_trip(2, bytes(rnd.randrange(4) for _ in range(50000)))
+
+
+if __name__ == '__main__':
+    unittest.main()
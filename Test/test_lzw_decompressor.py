@@ -1,27 +1,124 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
 import unittest
+from unittest.mock import patch
+
+from GifParser import lzw_decompressor
+from GifParser.gif_parser import GifParser
+from GifParser.lzw_decompressor import CLZWDecompressor, LZWDecompressor
+
+C_SOURCE = os.path.join(os.path.dirname(os.path.abspath(lzw_decompressor.__file__)), "lzw_decode.c")
 
-from GifParser.lzw_decompressor import LZWDecompressor
 
 class TestLZWDecompressor(unittest.TestCase):
     def test_empty_data(self):
-        expected = []
+        expected = b''
         decompressor = LZWDecompressor(2, [])
         result = decompressor.decode()
         self.assertEqual(expected, result)
 
     def test_only_clear_and_end_codes(self):
-        expected = [0]
+        expected = b'\x00'
         data = b'D\x01'
         decompressor = LZWDecompressor(2, data)
         result = decompressor.decode()
         self.assertEqual(expected, result)
 
     def test_big_data(self):
-        expected = [0]
+        expected = b'\x00'
         data = b'D\x01' * 1000
         decompressor = LZWDecompressor(2, data)
         result = decompressor.decode()
         self.assertEqual(expected, result)
 
+    def test_repeated_code(self):
+        expected = b'\x00\x00\x00'
+        data = b'\x84\x0b'
+        for engine in LZWDecompressor.ENGINES:
+            decompressor = LZWDecompressor(2, data, engine=engine)
+            result = decompressor.decode()
+            self.assertEqual(expected, result)
+
+    def test_pixel_count_pads_output(self):
+        expected = b'\x00' * 5
+        decompressor = LZWDecompressor(2, b'\x84\x0b', pixel_count=5)
+        result = decompressor.decode()
+        self.assertEqual(expected, result)
+
+    def test_pixel_count_truncates_output(self):
+        expected = b'\x00\x00'
+        decompressor = LZWDecompressor(2, b'\x84\x0b', pixel_count=2)
+        result = decompressor.decode()
+        self.assertEqual(expected, result)
+
+    def test_engines_match(self):
+        data = b'D\x01' * 1000
+        table_result = LZWDecompressor(2, data, engine="table").decode()
+        dict_result = LZWDecompressor(2, data, engine="dict").decode()
+        self.assertEqual(dict_result, table_result)
+
+    def test_decode_returns_bytearray(self):
+        for engine in LZWDecompressor.ENGINES:
+            result = LZWDecompressor(2, b'D\x01', engine=engine).decode()
+            self.assertIsInstance(result, bytearray)
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            LZWDecompressor(2, b'', engine="unknown")
+
+
+def build_c_library(output_dir):
+    """
+    Сборка C-декодера LZW из исходников, если доступен компилятор C.
+    :param output_dir: Папка для библиотеки.
+    :return: Путь к библиотеке или None.
+    """
+    compiler = shutil.which(os.environ.get("CC", "cc")) or shutil.which("gcc") or shutil.which("clang")
+    if compiler is None or sys.platform == "win32":
+        return None
+    path = os.path.join(output_dir, "_lzw_decode.so")
+    result = subprocess.run([compiler, "-O2", "-Wall", "-Wextra", "-Werror", "-shared", "-fPIC",
+                             "-o", path, C_SOURCE], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise AssertionError(f"Не удалось собрать {C_SOURCE}:\n{result.stderr}")
+    return path
+
+
+class TestCLZWDecompressor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.build_dir = tempfile.TemporaryDirectory()
+        path = build_c_library(cls.build_dir.name)
+        library = lzw_decompressor._load_c_library(path) if path else lzw_decompressor._c_library
+        if library is None:
+            cls.build_dir.cleanup()
+            raise unittest.SkipTest("нет компилятора C и собранного C-декодера LZW")
+        cls.library_patch = patch.object(lzw_decompressor, "_c_library", library)
+        cls.library_patch.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.library_patch.stop()
+        cls.build_dir.cleanup()
+
+    def test_small_data(self):
+        for data in (b'', b'D\x01', b'D\x01' * 1000, b'\x84\x0b'):
+            expected = LZWDecompressor(2, data).decode()
+            result = CLZWDecompressor(2, data).decode()
+            self.assertEqual(expected, result)
+
+    def test_parity_with_python_backend(self):
+        for name in sorted(os.listdir("Images")):
+            with open(os.path.join("Images", name), 'rb') as f:
+                streams = GifParser.extract_lzw_streams(f.read())
+            for min_code_size, data, pixel_count in streams:
+                with self.subTest(image=name):
+                    expected = LZWDecompressor(min_code_size, data, pixel_count).decode_table()
+                    result = CLZWDecompressor(min_code_size, data, pixel_count).decode_table()
+                    self.assertEqual(expected, result)
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,8 +1,14 @@
 import argparse
+import io
+import json
+import os
+import tempfile
 import unittest
 from unittest.mock import patch
 
+from Benchmarks.synthetic_gifs import make_gif
 from GifParser.gif_parser import GifParser
+from GifParser.lzw_decompressor import Decompressor
 from GifStructs.GifExtensions.application_extension import GifApplicationExtension
 from GifStructs.GifExtensions.comment_extension import GifCommentExtension
 from GifStructs.GifExtensions.graphic_control_extension import GifGraphicControlExtension
@@ -10,7 +16,7 @@ from GifStructs.GifExtensions.plain_text_extension import GifPlainTextExtension
 from GifStructs.gif_header import GifHeader
 from GifStructs.global_color_table import GifGlobalColorTable
 from GifStructs.logical_screen_descriptor import GifLogicalScreenDescriptor
-from gif_parser_interface import main
+from gif_parser_interface import collect_input_paths, main, make_file_result, process_file
 
 
 class TestGifParser(unittest.TestCase):
@@ -54,6 +60,159 @@ class TestGifParser(unittest.TestCase):
             b"\x00\x00\x00\x00\x2c\x01\x2c\x01\x0a\x0a\x2a\x18", b"\x74\x65\x73\x74")
         self.assertEqual(expected, plain_text_ext)
 
+    @patch('GifParser.gif_parser.Decompressor')
+    def test_lazy_parse_skips_decoding(self, mock_decompressor):
+        gif_parser = GifParser("Images/small.gif", lazy=True)
+        gif_parser.parse()
+
+        self.assertEqual(2, len(gif_parser.frames))
+        self.assertFalse(any(frame.is_decoded for frame in gif_parser.frames))
+        mock_decompressor.assert_not_called()
+
+    def test_lazy_parse_decodes_on_access(self):
+        eager_parser = GifParser("Images/transparent.gif")
+        eager_parser.parse()
+        lazy_parser = GifParser("Images/transparent.gif", lazy=True)
+        lazy_parser.parse()
+
+        for eager_frame, lazy_frame in zip(eager_parser.frames, lazy_parser.frames):
+            self.assertEqual(eager_frame.image_data, lazy_frame.image_data)
+            self.assertTrue(lazy_frame.is_decoded)
+
+    def test_lazy_frame_missing_file(self):
+        lazy_parser = GifParser("Images/transparent.gif", lazy=True)
+        lazy_parser.parse()
+        lazy_parser.close()
+        lazy_parser.filename = "Images/missing.gif"
+        with self.assertRaises(FileNotFoundError):
+            lazy_parser.frames[0].image_data
+
+    def test_parse_bytes(self):
+        with open("Images/transparent.gif", 'rb') as f:
+            data = f.read()
+        file_parser = GifParser("Images/transparent.gif")
+        file_parser.parse()
+
+        for source in (data, bytearray(data), memoryview(data)):
+            bytes_parser = GifParser(source)
+            bytes_parser.parse()
+            self.assertEqual(file_parser.header, bytes_parser.header)
+            self.assertEqual(file_parser.logical_screen_descriptor, bytes_parser.logical_screen_descriptor)
+            self.assertEqual(file_parser.frames, bytes_parser.frames)
+
+    def test_image_data_storage(self):
+        gif_parser = GifParser("Images/small.gif")
+        gif_parser.parse()
+        frame = gif_parser.frames[0]
+
+        self.assertIsInstance(frame.image_data, bytearray)
+        self.assertEqual([0], frame.indices_list)
+        self.assertEqual(0, frame.image_data[0])
+
+    @patch('GifParser.gif_parser.Decompressor')
+    def test_scan(self, mock_decompressor):
+        gif_parser = GifParser("Images/transparent.gif")
+        frame_index = gif_parser.scan()
+
+        self.assertEqual(2, len(frame_index))
+        self.assertEqual([], gif_parser.frames)
+        self.assertEqual(300, gif_parser.logical_screen_descriptor.width)
+        mock_decompressor.assert_not_called()
+
+        first, second = frame_index
+        self.assertEqual((1, 300, 300, 10, 0, 0), (first.number, first.width, first.height,
+                                                   first.delay_time, first.disposal_method,
+                                                   first.transparent_color_index))
+        self.assertEqual(first.data_offset + first.data_length, second.block_offset)
+        with open("Images/transparent.gif", 'rb') as f:
+            data = f.read()
+        self.assertEqual(0x2C, data[second.data_offset - 10])
+        self.assertEqual(len(data) - 1, second.data_offset + second.data_length)
+
+    def test_get_frame(self):
+        full_parser = GifParser("Images/transparent.gif")
+        full_parser.parse()
+        gif_parser = GifParser("Images/transparent.gif")
+
+        with patch('GifParser.gif_parser.Decompressor', wraps=Decompressor) as mock_decompressor:
+            frame = gif_parser.get_frame(2)
+        self.assertEqual(1, mock_decompressor.call_count)
+        self.assertEqual(full_parser.frames[1], frame)
+        self.assertEqual([], gif_parser.frames)
+        self.assertIsNone(gif_parser.get_frame(3))
+        self.assertIs(full_parser.frames[0], full_parser.get_frame(1))
+        self.assertIsNone(gif_parser._reader)
+
+    def test_get_frame_missing_file(self):
+        gif_parser = GifParser("Images/transparent.gif")
+        gif_parser.scan()
+        gif_parser.filename = "Images/missing.gif"
+        self.assertIsNone(gif_parser.get_frame(1))
+
+    def test_get_interlaced_row_map(self):
+        self.assertEqual((0, 8, 4, 2, 6, 10, 1, 3, 5, 7, 9), GifParser.get_interlaced_row_map(11))
+        self.assertEqual((0,), GifParser.get_interlaced_row_map(1))
+
+    def test_deinterlace(self):
+        rows = [bytes([y] * 3) for y in range(11)]
+        interlaced = b''.join(rows[y] for y in GifParser.get_interlaced_row_map(11))
+        self.assertEqual(b''.join(rows), GifParser.deinterlace(interlaced, 3, 11))
+
+    def test_parse_interlaced(self):
+        for height in (1, 5, 8, 13, 30):
+            with self.subTest(height=height):
+                progressive = GifParser(make_gif(20, height, frame_count=2, colors=16, seed=3))
+                progressive.parse()
+                interlaced = GifParser(make_gif(20, height, frame_count=2, colors=16, seed=3, interlaced=True))
+                interlaced.parse()
+                self.assertTrue(interlaced.frames[0].image_descriptor.interlace_flag)
+                for expected, frame in zip(progressive.frames, interlaced.frames):
+                    self.assertEqual(expected.image_data, frame.image_data)
+
+    @patch('argparse.ArgumentParser.parse_args')
+    @patch('logging.info')
+    def test_index(self, mock_logging_info, mock_parse_args):
+        mock_parse_args.return_value = argparse.Namespace(
+            input='Images/small.gif',
+            descriptor=False,
+            headers=False,
+            index=True,
+            animate=False,
+            export=None,
+            export_mode='rgba',
+            workers=1,
+            executor='process',
+            batch=None,
+            report=None,
+            cache_dir=None,
+            optimize=None,
+            profile=False
+        )
+
+        with patch.object(GifParser, 'close', autospec=True, side_effect=GifParser.close) as mock_close:
+            main()
+        self.assertIsNone(mock_close.call_args[0][0]._reader)
+        output = mock_logging_info.call_args[0][0]
+        self.assertIn("Индекс кадров:", output)
+        self.assertEqual(2, output.count("задержка: 40 мс"))
+        self.assertTrue("Кадр 1:" in output and "Кадр 2:" in output)
+
+    def test_iter_frames(self):
+        full_parser = GifParser("Images/transparent.gif")
+        full_parser.parse()
+        stream_parser = GifParser("Images/transparent.gif")
+
+        frames = stream_parser.iter_frames()
+        first_frame = next(frames)
+        self.assertEqual(full_parser.header, stream_parser.header)
+        self.assertEqual(full_parser.frames, [first_frame] + list(frames))
+        self.assertEqual([], stream_parser.frames)
+
+    def test_extract_lzw_streams(self):
+        streams = GifParser.extract_lzw_streams(make_gif(8, 8, frame_count=2, colors=4))
+        self.assertEqual(2, len(streams))
+        self.assertEqual((2, 64), (streams[0][0], streams[0][2]))
+
     @patch('argparse.ArgumentParser.parse_args')
     @patch('logging.info')
     def test_descriptor(self, mock_logging_info, mock_parse_args):
@@ -61,8 +220,17 @@ class TestGifParser(unittest.TestCase):
             input='Images/small.gif',
             descriptor=True,
             headers=False,
+            index=False,
             animate=False,
-            export=None
+            export=None,
+            export_mode='rgba',
+            workers=1,
+            executor='process',
+            batch=None,
+            report=None,
+            cache_dir=None,
+            optimize=None,
+            profile=False
         )
 
         main()
@@ -89,8 +257,17 @@ class TestGifParser(unittest.TestCase):
             input='Images/small.gif',
             descriptor=False,
             headers=True,
+            index=False,
             animate=False,
-            export=None
+            export=None,
+            export_mode='rgba',
+            workers=1,
+            executor='process',
+            batch=None,
+            report=None,
+            cache_dir=None,
+            optimize=None,
+            profile=False
         )
 
         main()
@@ -117,8 +294,17 @@ class TestGifParser(unittest.TestCase):
             input='Images/image.gif',
             descriptor=False,
             headers=True,
+            index=False,
             animate=False,
-            export=None
+            export=None,
+            export_mode='rgba',
+            workers=1,
+            executor='process',
+            batch=None,
+            report=None,
+            cache_dir=None,
+            optimize=None,
+            profile=False
         )
 
         main()
@@ -137,5 +323,132 @@ class TestGifParser(unittest.TestCase):
         self.assertEqual(1, output.count("Есть расширение комментария"))
 
 
+class TestBatchMode(unittest.TestCase):
+    def test_collect_input_paths(self):
+        stdin = io.StringIO(f"{os.path.join('Images', 'small.gif')}\n\nother.gif\n")
+        paths = collect_input_paths(["Images", os.path.join("Images", "s*.gif"), "-"], stdin)
+
+        expected = sorted(os.path.join("Images", name) for name in os.listdir("Images"))
+        self.assertEqual(expected + ["other.gif"], paths)
+
+    def test_process_file(self):
+        options = {"descriptor": True, "headers": False, "index": False, "export": None,
+                   "export_mode": "rgba", "output_dir": None}
+        result = process_file("Images/small.gif", options)
+
+        self.assertTrue(result["ok"])
+        self.assertEqual(2, result["frames"])
+        self.assertIn("Заголовок: GIF89a", result["output"])
+
+    def test_process_file_optimize(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            output_path = os.path.join(output_dir, "optimized.gif")
+            options = {"descriptor": False, "headers": False, "index": False, "export": None,
+                       "export_mode": "rgba", "output_dir": None, "optimize_output": output_path}
+            result = process_file("Images/transparent.gif", options)
+            optimized_size = os.path.getsize(output_path)
+
+        self.assertTrue(result["ok"])
+        report = result["optimization"]
+        self.assertEqual(os.path.getsize("Images/transparent.gif"), report["original_bytes"])
+        self.assertEqual(optimized_size, report["optimized_bytes"])
+        self.assertLess(report["optimized_bytes"], report["original_bytes"])
+
+    @patch.object(GifParser, 'parse')
+    def test_process_file_export_streams_frames(self, mock_parse):
+        with tempfile.TemporaryDirectory() as output_dir:
+            options = {"descriptor": False, "headers": False, "index": False, "export": [],
+                       "export_mode": "rgba", "output_dir": output_dir}
+            result = process_file("Images/transparent.gif", options)
+            exported = sorted(os.listdir(output_dir))
+
+        self.assertTrue(result["ok"])
+        self.assertEqual(["1.png", "2.png"], exported)
+        mock_parse.assert_not_called()
+
+    def test_process_file_profile(self):
+        options = {"descriptor": False, "headers": True, "index": False, "export": None,
+                   "export_mode": "rgba", "output_dir": None, "profile": True}
+        result = process_file("Images/small.gif", options)
+
+        self.assertTrue(result["ok"])
+        self.assertIn("read_blocks", result["profile"]["stages"])
+        self.assertGreater(result["profile"]["counters"]["bytes_read"], 0)
+
+    def test_process_file_errors(self):
+        options = {"descriptor": True, "headers": True, "index": True, "export": None,
+                   "export_mode": "rgba", "output_dir": None}
+        with tempfile.NamedTemporaryFile(suffix=".gif", delete=False) as f:
+            f.write(b"not a gif at all")
+        try:
+            for path in ("Images/missing.gif", f.name):
+                result = process_file(path, options)
+                self.assertFalse(result["ok"])
+                self.assertTrue(result["error"])
+        finally:
+            os.remove(f.name)
+
+    @patch('argparse.ArgumentParser.parse_args')
+    @patch('logging.error')
+    @patch('logging.info')
+    def test_batch(self, mock_logging_info, mock_logging_error, mock_parse_args):
+        with tempfile.TemporaryDirectory() as report_dir:
+            report_path = os.path.join(report_dir, "report.json")
+            mock_parse_args.return_value = argparse.Namespace(
+                input=None,
+                descriptor=True,
+                headers=False,
+                index=False,
+                animate=False,
+                export=None,
+                export_mode='rgba',
+                workers=2,
+                executor='process',
+                batch=['Images/small.gif', 'Images/missing.gif', 'Images/image.gif'],
+                report=report_path,
+                cache_dir=None,
+                optimize=None,
+                profile=False
+            )
+
+            main()
+            with open(report_path, encoding='utf-8') as f:
+                report = json.load(f)
+
+        self.assertEqual({"files": 3, "succeeded": 2, "failed": 1, "frames": 3},
+                         {key: report["summary"][key] for key in ("files", "succeeded", "failed", "frames")})
+        self.assertEqual(['Images/small.gif', 'Images/missing.gif', 'Images/image.gif'],
+                         [result["path"] for result in report["files"]])
+        mock_logging_error.assert_called_once()
+        self.assertEqual(3, mock_logging_info.call_count)
+
+    def test_file_result_shape(self):
+        options = {"descriptor": True, "headers": False, "index": False, "export": None,
+                   "export_mode": "rgba", "output_dir": None}
+        for path in ("Images/small.gif", "Images/missing.gif"):
+            self.assertEqual(set(make_file_result(path)), set(process_file(path, options)))
+
+    @patch('argparse.ArgumentParser.parse_args')
+    def test_batch_rejects_animate(self, mock_parse_args):
+        mock_parse_args.return_value = argparse.Namespace(
+            input=None,
+            descriptor=False,
+            headers=False,
+            index=False,
+            animate=True,
+            export=None,
+            export_mode='rgba',
+            workers=1,
+            executor='process',
+            batch=['Images/small.gif'],
+            report=None,
+            cache_dir=None,
+            optimize=None,
+            profile=False
+        )
+        with patch('sys.stderr', new_callable=io.StringIO), self.assertRaises(SystemExit):
+            main()
+
+
 if __name__ == '__main__':
     unittest.main()
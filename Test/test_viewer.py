@@ -1,9 +1,11 @@
 import unittest
 import tkinter as tk
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
+from GifParser.gif_compositor import GifCompositor
 from GifParser.gif_viewer import GifViewer
 from GifParser.gif_parser import GifParser
+from test_gif_seek_index import make_parser
 
 
 class TestGifViewer(unittest.TestCase):
@@ -110,5 +112,68 @@ class TestGifViewer(unittest.TestCase):
         mock_update_photo.assert_called_once()
         mock_clear_image.assert_not_called()
 
+
+class TestCompositedFrames(unittest.TestCase):
+    @patch.object(GifViewer, '_create_ui_components')
+    @patch.object(GifViewer, '_configure_root_window')
+    def make_viewer(self, parser, frame_cache_memory, mock_configure_root_window, mock_create_ui_components):
+        viewer = GifViewer(None, parser, use_compositor=True, frame_cache_memory=frame_cache_memory)
+        viewer.canvas = Mock()
+        viewer.photo = Mock()
+        viewer.image_id = 1
+        viewer._render_region = Mock()
+        return viewer
+
+    def test_no_copy_when_cache_is_full(self):
+        parser = GifParser("Images/transparent.gif")
+        parser.parse()
+        viewer = self.make_viewer(parser, parser.logical_screen_descriptor.width
+                                  * parser.logical_screen_descriptor.height * 4)
+        viewer._show_composited_frame(0)
+        viewer._show_composited_frame(1)
+
+        viewer.photo.copy.assert_called_once()
+        self.assertEqual(1, len(viewer.frame_cache))
+
+
+    def test_dropped_frames(self):
+        parser = make_parser(40)
+        compositor = GifCompositor(parser.logical_screen_descriptor, parser.global_color_table)
+        expected = list(compositor.iter_frames(parser.frames))
+        viewer = self.make_viewer(parser, 0)
+
+        viewer._show_composited_frame(0)
+        viewer._show_composited_frame(3)
+        self.assertEqual(expected[3], bytes(viewer.compositor.canvas))
+        self.assertIs(viewer.compositor, viewer.seek_index.compositor)
+        self.assertEqual(0, viewer.seek_index.applied_frames)
+        self.assertEqual((1, 0, 4, 1), viewer._render_region.call_args[0][1])
+
+        viewer._show_composited_frame(30)
+        self.assertEqual(expected[30], bytes(viewer.compositor.canvas))
+        self.assertEqual((0, 0, 4, 4), viewer._render_region.call_args[0][1])
+
+        viewer._show_composited_frame(2)
+        self.assertEqual(expected[2], bytes(viewer.compositor.canvas))
+
+class TestPpmRendering(unittest.TestCase):
+    def test_get_checkerboard_rgb(self):
+        checkerboard = GifViewer.get_checkerboard_rgb(12, 11)
+        self.assertEqual(12 * 11 * 3, len(checkerboard))
+        self.assertEqual(b'\xC8\xC8\xC8', checkerboard[0:3])
+        self.assertEqual(b'\x64\x64\x64', checkerboard[10 * 3:11 * 3])
+        self.assertEqual(b'\x64\x64\x64', checkerboard[10 * 12 * 3:10 * 12 * 3 + 3])
+
+    def test_get_ppm_data(self):
+        red, clear, blue = b'\xff\x00\x00\xff', b'\x00' * 4, b'\x00\x00\xff\xff'
+        canvas = red + clear + blue + clear + red + blue
+        background = bytes(range(18))
+
+        ppm_data = GifViewer.get_ppm_data(canvas, 3, (1, 0, 3, 2), background)
+        self.assertEqual(b'P6\n2 2\n255\n' + bytes([3, 4, 5, 0, 0, 255, 255, 0, 0, 0, 0, 255]), ppm_data)
+
+        ppm_data = GifViewer.get_ppm_data(canvas, 3, (0, 0, 1, 1), background)
+        self.assertEqual(b'P6\n1 1\n255\n\xff\x00\x00', ppm_data)
+
 if __name__ == '__main__':
     unittest.main()
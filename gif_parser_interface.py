@@ -1,10 +1,21 @@
 import argparse
+import contextlib
+import glob
+import json
 import logging
+import os
+import sys
+import time
 import tkinter as tk
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 
 from GifParser.gif_viewer import GifViewer
 from GifParser.gif_parser import GifParser
 from GifParser.gif_frames_exporter import GifFramesExporter
+from GifParser.gif_index_cache import GifIndexCache
+from GifParser.gif_optimizer import GifOptimizer
+from GifParser.gif_profiler import GifProfiler
 
 
 def get_descriptor(parser):
@@ -30,39 +41,331 @@ def print_all_frames_headers(parser):
     return result
 
 
+def get_frame_index(parser):
+    result = f"{get_descriptor(parser)}\nИндекс кадров:\n"
+    for frame_info in parser.frame_index:
+        result += f"{frame_info}\n"
+    return result
+
+
+def get_export_frames(parser):
+    """
+    Кадры для экспорта всех кадров: уже разобранные кадры парсера или, если файл был
+    только просканирован, потоковый разбор без сохранения кадров в памяти.
+    :param parser: Парсер GIF файла.
+    :return: Список или генератор кадров.
+    """
+    return parser.frames if parser.frames else parser.iter_frames()
+
+
+def optimize_file(gif_parser, path, output_path):
+    """
+    Оптимизация GIF-файла и запись результата. Если оптимизированный файл не меньше исходного,
+    записывается исходный файл.
+    :param gif_parser: Парсер с разобранными кадрами.
+    :param path: Путь к исходному файлу.
+    :param output_path: Путь к оптимизированному файлу.
+    :return: Отчёт GifOptimizer.get_report.
+    """
+    with open(path, 'rb') as f:
+        original_data = f.read()
+    optimized_data = GifOptimizer(gif_parser).to_bytes()
+    if len(optimized_data) >= len(original_data):
+        optimized_data = original_data
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(output_path, 'wb') as f:
+        f.write(optimized_data)
+    return GifOptimizer.get_report(original_data, optimized_data)
+
+
+def format_optimization_report(report):
+    return (f"размер: {report['original_bytes']} -> {report['optimized_bytes']} байт "
+            f"({report['size_saving_percent']:.1f}% экономии), "
+            f"декодирование: {report['original_decode_ms']:.1f} -> {report['optimized_decode_ms']:.1f} мс "
+            f"({report['decode_saving_percent']:.1f}% экономии)")
+
+
+def collect_input_paths(patterns, stdin=None):
+    """
+    Сбор путей к GIF-файлам для пакетной обработки.
+    :param patterns: Пути к файлам, папкам (обходятся рекурсивно) или шаблоны glob; "-" - список путей из stdin.
+    :param stdin: Поток со списком путей (по умолчанию sys.stdin).
+    :return: Список путей без повторов в порядке появления.
+    """
+    paths = []
+    for pattern in patterns:
+        if pattern == "-":
+            lines = (stdin or sys.stdin).read().splitlines()
+            paths.extend(line.strip() for line in lines if line.strip())
+        elif os.path.isdir(pattern):
+            for root, dirs, files in os.walk(pattern):
+                dirs.sort()
+                paths.extend(os.path.join(root, name) for name in sorted(files) if name.lower().endswith(".gif"))
+        elif glob.has_magic(pattern):
+            paths.extend(sorted(glob.glob(pattern, recursive=True)))
+        else:
+            paths.append(pattern)
+    return list(dict.fromkeys(paths))
+
+
+def process_file(path, options):
+    """
+    Обработка одного файла в пакетном режиме. Ошибки не пробрасываются, а возвращаются в результате.
+    :param path: Путь к GIF-файлу.
+    :param options: Параметры обработки (descriptor, headers, index, export, export_mode, output_dir, cache_dir,
+                    optimize_output, profile).
+    :return: Словарь с результатом обработки файла.
+    """
+    start = time.perf_counter()
+    result = make_file_result(path)
+    profiler = GifProfiler() if options.get("profile") else None
+    gif_parser = None
+    with profiler if profiler is not None else contextlib.nullcontext():
+        try:
+            if not os.path.isfile(path):
+                raise FileNotFoundError(f"Файл {path} не найден.")
+            needs_frames = options["headers"] or options.get("optimize_output")
+            index_cache = GifIndexCache(options["cache_dir"]) if options.get("cache_dir") else None
+            gif_parser = GifParser(path, lazy=options["export"] != [], index_cache=index_cache)
+            if needs_frames:
+                gif_parser.parse()
+            else:
+                gif_parser.scan()
+            if gif_parser.header is None:
+                raise ValueError("Неверный формат файла!")
+
+            output = []
+            if options["descriptor"]:
+                output.append(get_descriptor(gif_parser))
+            if options["index"]:
+                output.append(get_frame_index(gif_parser))
+            if options["headers"]:
+                output.append(print_all_frames_headers(gif_parser))
+            if options["export"] is not None and gif_parser.frame_index:
+                exporter = GifFramesExporter(gif_parser, options["export_mode"], options["output_dir"])
+                if len(options["export"]) == 0:
+                    exporter.export_all_frames(get_export_frames(gif_parser))
+                else:
+                    exporter.export_selected_frames(options["export"])
+                result["export_dir"] = exporter.output_dir
+            if options.get("optimize_output") and gif_parser.frames:
+                result["optimization"] = optimize_file(gif_parser, path, options["optimize_output"])
+
+            result.update(ok=True, frames=len(gif_parser.frame_index), output="\n".join(output))
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        finally:
+            if gif_parser is not None:
+                gif_parser.close()
+    if profiler is not None:
+        result["profile"] = profiler.get_stats()
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def make_file_result(path, error=None):
+    """
+    Результат обработки файла в пакетном режиме со значениями по умолчанию.
+    :param path: Путь к GIF-файлу.
+    :param error: Текст ошибки или None.
+    :return: Словарь с результатом обработки файла.
+    """
+    return {"path": path, "ok": False, "frames": 0, "output": "", "error": error, "export_dir": None,
+            "optimization": None, "profile": None, "seconds": 0.0}
+
+
+def run_batch(args):
+    """
+    Пакетная обработка нескольких GIF-файлов в пуле процессов.
+    :param args: Аргументы командной строки.
+    :return: Список результатов по файлам.
+    """
+    paths = collect_input_paths(args.batch)
+    export_root = None
+    if args.export is not None:
+        export_root = os.path.join("Frames", datetime.now().strftime("%d-%m-%Y %H-%M-%S"))
+
+    jobs = []
+    for i, path in enumerate(paths, start=1):
+        output_dir = optimize_output = None
+        name = os.path.splitext(os.path.basename(path))[0]
+        if export_root is not None:
+            output_dir = os.path.join(export_root, f"{i}_{name}")
+        if args.optimize:
+            optimize_output = os.path.join(args.optimize, f"{i}_{name}.gif")
+        jobs.append((path, {
+            "descriptor": args.descriptor,
+            "headers": args.headers,
+            "index": args.index,
+            "export": args.export,
+            "export_mode": args.export_mode,
+            "output_dir": output_dir,
+            "cache_dir": args.cache_dir,
+            "optimize_output": optimize_output,
+            "profile": args.profile,
+        }))
+
+    start = time.perf_counter()
+    if args.workers > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = [pool.submit(process_file, path, options) for path, options in jobs]
+            results = []
+            for (path, options), future in zip(jobs, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append(make_file_result(path, f"{type(e).__name__}: {e}"))
+    else:
+        results = [process_file(path, options) for path, options in jobs]
+    elapsed = time.perf_counter() - start
+
+    for result in results:
+        if result["ok"]:
+            message = f"{result['path']}: {result['frames']} кадр(ов), {result['seconds'] * 1000:.1f} мс"
+            if result["export_dir"]:
+                message += f", кадры экспортированы в {result['export_dir']}"
+            if result["optimization"]:
+                message += f"\nОптимизация: {format_optimization_report(result['optimization'])}"
+            if result["output"]:
+                message += f"\n{result['output']}"
+            logging.info(message)
+        else:
+            logging.error(f"{result['path']}: {result['error']}")
+
+    summary = get_batch_summary(results, elapsed)
+    logging.info(f"Обработано файлов: {summary['files']}, успешно: {summary['succeeded']}, "
+                 f"с ошибками: {summary['failed']}, кадров: {summary['frames']}, "
+                 f"время: {summary['seconds']:.2f} с")
+    if args.profile:
+        profiler = GifProfiler()
+        for result in results:
+            if result["profile"]:
+                profiler.merge(result["profile"])
+        logging.info(profiler.format_stats())
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({"summary": summary, "files": results}, f, ensure_ascii=False, indent=2)
+    return results
+
+
+def get_batch_summary(results, elapsed):
+    """
+    Сводка по результатам пакетной обработки.
+    :param results: Результаты по файлам.
+    :param elapsed: Общее время обработки в секундах.
+    :return: Словарь со сводкой.
+    """
+    succeeded = sum(1 for result in results if result["ok"])
+    return {
+        "files": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "frames": sum(result["frames"] for result in results),
+        "seconds": elapsed,
+    }
+
+
 def main():
     logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s:\n%(message)s")
     parser = argparse.ArgumentParser()
-    parser.add_argument("input", help="Путь к GIF-файлу")
+    parser.add_argument("input", nargs="?", help="Путь к GIF-файлу")
     parser.add_argument("--descriptor", "-d", action="store_true", help="Показать дескриптор экрана")
     parser.add_argument("--headers", "-H", action="store_true", help="Показать заголовки для каждого кадра")
+    parser.add_argument("--index", "-i", action="store_true",
+                        help="Показать индекс кадров (смещения, размеры данных, задержки, методы обработки) "
+                             "без декодирования изображений")
     parser.add_argument("--animate", "-a", action="store_true", help="Показать изображение/анимацию")
     parser.add_argument("--export", "-e", nargs='*', type=int,
                         help="Экспортировать кадры (все или отдельные, например: -e 1 2 5)")
+    parser.add_argument("--export-mode", choices=GifFramesExporter.MODES, default="rgba",
+                        help="Формат PNG при экспорте: rgba (по умолчанию), palette (PNG с палитрой) "
+                             "или composited (кадры целиком с учётом прозрачности и методов обработки)")
+    parser.add_argument("--workers", "-w", type=int, default=1,
+                        help="Количество параллельных обработчиков при экспорте или пакетной обработке "
+                             "(по умолчанию 1)")
+    parser.add_argument("--executor", choices=tuple(GifFramesExporter.EXECUTORS), default="process",
+                        help="Тип пула обработчиков при экспорте: process (по умолчанию) или thread; "
+                             "при --batch не используется - файлы всегда обрабатываются в пуле процессов")
+    parser.add_argument("--batch", "-b", nargs="+", metavar="PATH",
+                        help="Пакетная обработка: файлы, папки или шаблоны glob; '-' - список путей из stdin")
+    parser.add_argument("--report", help="Путь к JSON-отчёту пакетной обработки")
+    parser.add_argument("--cache-dir", help="Папка кэша индексов кадров: повторный разбор файла "
+                                            "не сканирует его заново")
+    parser.add_argument("--optimize", "-o", metavar="PATH",
+                        help="Оптимизировать GIF (обрезка кадров до изменившейся области, прозрачность "
+                             "для неизменившихся пикселей) и записать в PATH; при --batch PATH - папка")
+    parser.add_argument("--profile", "-p", action="store_true",
+                        help="Вывести время по этапам (чтение блоков, LZW, наложение кадров, PNG, отрисовка) "
+                             "и счётчики")
     args = parser.parse_args()
-    filepath = args.input
 
-    gif_parser = GifParser(filepath)
-    gif_parser.parse()
+    if args.batch:
+        if args.animate:
+            parser.error("--animate нельзя использовать с --batch")
+        run_batch(args)
+        return
+    if args.input is None:
+        parser.error("нужно указать путь к GIF-файлу или --batch")
 
-    if args.descriptor and gif_parser.header:
-        logging.info(get_descriptor(gif_parser))
+    if args.profile:
+        with GifProfiler() as profiler:
+            process_input(args)
+        logging.info(profiler.format_stats())
+    else:
+        process_input(args)
 
-    if args.headers and gif_parser.header:
-        logging.info(print_all_frames_headers(gif_parser))
 
-    if args.export is not None and gif_parser.frames:
-        exporter = GifFramesExporter(gif_parser)
-        if len(args.export) == 0:
-            exporter.export_all_frames()
+def process_input(args):
+    """
+    Обработка одного GIF-файла по аргументам командной строки.
+    :param args: Аргументы командной строки.
+    """
+    filepath = args.input
+
+    needs_frames = args.headers or args.animate or args.optimize
+    index_cache = GifIndexCache(args.cache_dir) if args.cache_dir else None
+    gif_parser = GifParser(filepath, lazy=args.export != [] and not args.animate, index_cache=index_cache)
+    try:
+        if needs_frames:
+            gif_parser.parse()
         else:
-            exporter.export_selected_frames(args.export)
+            gif_parser.scan()
+
+        if args.descriptor and gif_parser.header:
+            logging.info(get_descriptor(gif_parser))
+
+        if args.index and gif_parser.header:
+            logging.info(get_frame_index(gif_parser))
+
+        if args.headers and gif_parser.header:
+            logging.info(print_all_frames_headers(gif_parser))
+
+        if args.export is not None and gif_parser.frame_index:
+            exporter = GifFramesExporter(gif_parser, args.export_mode)
+            if len(args.export) == 0:
+                exporter.export_all_frames(get_export_frames(gif_parser), workers=args.workers,
+                                           executor=args.executor)
+            else:
+                exporter.export_selected_frames(args.export, workers=args.workers, executor=args.executor)
+
+        if args.optimize and gif_parser.frames:
+            report = optimize_file(gif_parser, filepath, args.optimize)
+            logging.info(f"Оптимизированный файл записан в {args.optimize}\n{format_optimization_report(report)}")
 
-    if args.animate and gif_parser.frames:
-        root = tk.Tk()
-        viewer = GifViewer(root, gif_parser)
-        viewer.animate()
-        root.mainloop()
+        if args.animate and gif_parser.frames:
+            root = tk.Tk()
+            viewer = GifViewer(root, gif_parser, use_compositor=True)
+            viewer.animate()
+            root.mainloop()
+            stats = viewer.scheduler.get_stats()
+            logging.info(f"Показано кадров: {stats['frames_shown']}, пропущено: {stats['dropped_frames']}, "
+                         f"частота: {stats['fps']:.1f} кадр/с, "
+                         f"среднее время отрисовки: {stats['average_render_ms']:.1f} мс")
+    finally:
+        gif_parser.close()
 
 
 if __name__ == "__main__":